@@ -0,0 +1,621 @@
+import re
+import operator
+
+# Nós da AST: expressões, comandos, funções e declarações de variáveis.
+#
+# Números são guardados como int/float e identificadores como str, sem nó próprio;
+# os demais casos usam classes com __slots__ (sem dict por instância). Só o esqueleto
+# do programa (programa/implementacao/execucao) continua em dicts, um por programa.
+# O formato JSON antigo, de dicts aninhados, continua disponível: cada nó tem
+# para_json() e as funções *_de_json() fazem o caminho inverso.
+
+# Operadores suportados ("/" é divisão inteira, como sempre foi em Zin)
+OPERADORES = {
+    "+": operator.add,
+    "-": operator.sub,
+    "*": operator.mul,
+    "/": operator.floordiv,
+    "==": operator.eq,
+    "!=": operator.ne,
+    ">": operator.gt,
+    "<": operator.lt,
+    ">=": operator.ge,
+    "<=": operator.le,
+}
+COMPARACOES = {"==", "!=", ">", "<", ">=", "<="}
+
+# Precedência dos operadores binários (maior liga mais forte); todos associam à esquerda
+PRECEDENCIA = {
+    "==": 1, "!=": 1, ">": 1, "<": 1, ">=": 1, "<=": 1,
+    "+": 2, "-": 2,
+    "*": 3, "/": 3,
+}
+
+
+class No:
+    """Base dos nós da AST."""
+    __slots__ = ()
+    # Chave do nó no formato JSON (ex.: "chamada_modulo"), usada por contem_chave
+    chave = None
+
+    def filhos(self):
+        """Nós contidos neste (subexpressões e comandos dos blocos)."""
+        return ()
+
+    def para_json(self):
+        raise NotImplementedError
+
+    def __reduce__(self):
+        # Mais barato que o padrão para __slots__ (copyreg), e com menos níveis de
+        # recursão ao gravar expressões longas no cache
+        return (type(self), tuple(getattr(self, nome) for nome in self.__slots__))
+
+    def __repr__(self):
+        campos = ", ".join(f"{nome}={getattr(self, nome)!r}" for nome in self.__slots__)
+        return f"{type(self).__name__}({campos})"
+
+
+class Texto(No):
+    __slots__ = ("valor",)
+    chave = "texto"
+
+    def __init__(self, valor):
+        self.valor = valor
+
+    def para_json(self):
+        return {"texto": self.valor}
+
+
+class Binaria(No):
+    __slots__ = ("operador", "esquerda", "direita")
+
+    def __init__(self, operador, esquerda, direita):
+        self.operador = operador
+        self.esquerda = esquerda
+        self.direita = direita
+
+    def filhos(self):
+        return (self.esquerda, self.direita)
+
+    def para_json(self):
+        return {"left": expressao_para_json(self.esquerda), "operator": self.operador,
+                "right": expressao_para_json(self.direita)}
+
+
+class ChamadaModulo(No):
+    __slots__ = ("modulo", "funcao", "argumentos")
+    chave = "chamada_modulo"
+
+    def __init__(self, modulo, funcao, argumentos):
+        self.modulo = modulo
+        self.funcao = funcao
+        self.argumentos = tuple(argumentos)
+
+    def filhos(self):
+        return self.argumentos
+
+    def para_json(self):
+        return {"chamada_modulo": {"modulo": self.modulo, "funcao": self.funcao,
+                                   "argumentos": [expressao_para_json(a) for a in self.argumentos]}}
+
+
+class AcessoModulo(No):
+    __slots__ = ("modulo", "nome")
+    chave = "acesso_modulo"
+
+    def __init__(self, modulo, nome):
+        self.modulo = modulo
+        self.nome = nome
+
+    def para_json(self):
+        return {"acesso_modulo": {"modulo": self.modulo, "nome": self.nome}}
+
+
+class ChamadaFuncao(No):
+    __slots__ = ("nome", "argumentos")
+    chave = "func_call"
+
+    def __init__(self, nome, argumentos):
+        self.nome = nome
+        self.argumentos = tuple(argumentos)
+
+    def filhos(self):
+        return self.argumentos
+
+    def para_json(self):
+        return {"func_call": {"nome": self.nome, "args": [expressao_para_json(a) for a in self.argumentos]}}
+
+
+class AcessoLista(No):
+    __slots__ = ("nome", "indice")
+    chave = "acesso_lista"
+
+    def __init__(self, nome, indice):
+        self.nome = nome
+        self.indice = indice
+
+    def filhos(self):
+        return (self.indice,)
+
+    def para_json(self):
+        return {"acesso_lista": {"nome": self.nome, "indice": expressao_para_json(self.indice)}}
+
+
+class AcessoGrupo(No):
+    __slots__ = ("nome", "indice", "campo")
+    chave = "acesso_grupo"
+
+    def __init__(self, nome, indice, campo):
+        self.nome = nome
+        self.indice = indice
+        self.campo = campo
+
+    def filhos(self):
+        return (self.indice,)
+
+    def para_json(self):
+        return {"acesso_grupo": {"nome": self.nome, "indice": expressao_para_json(self.indice),
+                                 "campo": self.campo}}
+
+
+def binaria(operador, esquerda, direita):
+    """Cria o nó da operação, já calculando o resultado quando os dois lados são números."""
+    funcao = OPERADORES.get(operador)
+    if (funcao is not None and isinstance(esquerda, (int, float)) and isinstance(direita, (int, float))
+            # A divisão por zero fica para a execução, onde o erro aparece no lugar certo
+            and not (operador == "/" and direita == 0)):
+        return funcao(esquerda, direita)
+    return Binaria(operador, esquerda, direita)
+
+
+def expressao_para_json(expr):
+    """Converte a expressão para o formato de dicts aninhados."""
+    return expr.para_json() if isinstance(expr, No) else expr
+
+
+def expressao_de_json(dados):
+    """Converte uma expressão no formato de dicts aninhados para nós."""
+    if not isinstance(dados, dict):
+        return dados
+    if "texto" in dados:
+        return Texto(dados["texto"])
+    if "operator" in dados:
+        return Binaria(dados["operator"], expressao_de_json(dados["left"]), expressao_de_json(dados["right"]))
+    if "chamada_modulo" in dados:
+        info = dados["chamada_modulo"]
+        return ChamadaModulo(info["modulo"], info["funcao"], [expressao_de_json(a) for a in info["argumentos"]])
+    if "acesso_modulo" in dados:
+        info = dados["acesso_modulo"]
+        return AcessoModulo(info["modulo"], info["nome"])
+    if "func_call" in dados:
+        info = dados["func_call"]
+        return ChamadaFuncao(info["nome"], [expressao_de_json(a) for a in info["args"]])
+    if "acesso_lista" in dados:
+        info = dados["acesso_lista"]
+        return AcessoLista(info["nome"], expressao_de_json(info["indice"]))
+    if "acesso_grupo" in dados:
+        info = dados["acesso_grupo"]
+        return AcessoGrupo(info["nome"], expressao_de_json(info["indice"]), info["campo"])
+    raise ValueError(f"Expressão inválida: {dados}")
+
+
+# Placeholders do texto do escreva: {nome}, {lista[i]}, {grupo[i].CAMPO}
+PADRAO_PLACEHOLDER = re.compile(r"\{([^{}]+)\}")
+
+
+def placeholder_para_no(expressao_str):
+    """Converte 'lista[i]', 'grupo[i].CAMPO' ou 'grupo.CAMPO' em um nó de acesso."""
+    if "." not in expressao_str and "[" not in expressao_str:
+        return expressao_str
+    if "." in expressao_str:
+        parte_lista, campo = expressao_str.split(".", 1)
+    else:
+        parte_lista, campo = expressao_str, None
+    if "[" not in parte_lista or "]" not in parte_lista:
+        nome, indice_str = parte_lista, "0"
+    else:
+        nome, resto = parte_lista.split("[", 1)
+        indice_str = resto.split("]", 1)[0]
+    indice = int(indice_str) if indice_str.isdigit() else indice_str
+    if campo is None:
+        return AcessoLista(nome, indice)
+    return AcessoGrupo(nome, indice, campo)
+
+
+# ---------------------------------------------------------
+#  COMANDOS
+# ---------------------------------------------------------
+# Todo comando termina com o slot "linha" (linha de origem, ou None), que também é
+# o último argumento do construtor.
+
+class Comando(No):
+    """Base dos comandos."""
+    __slots__ = ()
+
+    @property
+    def rotulo(self):
+        """Nome curto do comando para relatórios (atribuir, escreva, SE, PARA...)."""
+        return self.chave
+
+    def _com_linha(self, dados):
+        if self.linha is not None:
+            dados["linha"] = self.linha
+        return dados
+
+
+class Atribuir(Comando):
+    __slots__ = ("variavel", "valor", "linha")
+    chave = "atribuir"
+
+    def __init__(self, variavel, valor, linha=None):
+        self.variavel = variavel
+        self.valor = valor
+        self.linha = linha
+
+    def filhos(self):
+        return (self.valor,)
+
+    def para_json(self):
+        return self._com_linha({"atribuir": {"variavel": self.variavel, "valor": expressao_para_json(self.valor)}})
+
+
+class Escreva(Comando):
+    __slots__ = ("texto", "linha")
+    chave = "escreva"
+
+    def __init__(self, texto, linha=None):
+        self.texto = texto
+        self.linha = linha
+
+    def para_json(self):
+        return self._com_linha({"escreva": self.texto})
+
+
+class Pergunte(Comando):
+    __slots__ = ("texto", "variavel", "linha")
+    chave = "pergunte"
+
+    def __init__(self, texto, variavel, linha=None):
+        self.texto = texto
+        self.variavel = variavel
+        self.linha = linha
+
+    def para_json(self):
+        return self._com_linha({"pergunte": {"texto": self.texto, "variavel": self.variavel}})
+
+
+class Se(Comando):
+    __slots__ = ("condicao", "bloco_se", "bloco_senao", "linha")
+    rotulo = "SE"
+
+    def __init__(self, condicao, bloco_se, bloco_senao=None, linha=None):
+        self.condicao = condicao
+        self.bloco_se = bloco_se
+        self.bloco_senao = bloco_senao
+        self.linha = linha
+
+    def filhos(self):
+        return (self.condicao, *self.bloco_se, *(self.bloco_senao or ()))
+
+    def para_json(self):
+        senao = None if self.bloco_senao is None else bloco_para_json(self.bloco_senao)
+        return self._com_linha({"tipo": "SE", "condicao": expressao_para_json(self.condicao),
+                                "bloco_se": bloco_para_json(self.bloco_se), "bloco_senao": senao})
+
+
+class Enquanto(Comando):
+    __slots__ = ("condicao", "bloco", "linha")
+    rotulo = "ENQUANTO"
+
+    def __init__(self, condicao, bloco, linha=None):
+        self.condicao = condicao
+        self.bloco = bloco
+        self.linha = linha
+
+    def filhos(self):
+        return (self.condicao, *self.bloco)
+
+    def para_json(self):
+        return self._com_linha({"tipo": "ENQUANTO", "condicao": expressao_para_json(self.condicao),
+                                "bloco": bloco_para_json(self.bloco)})
+
+
+class Para(Comando):
+    __slots__ = ("variavel", "inicio", "fim", "passo", "bloco", "linha")
+    rotulo = "PARA"
+
+    def __init__(self, variavel, inicio, fim, passo, bloco, linha=None):
+        self.variavel = variavel
+        self.inicio = inicio
+        self.fim = fim
+        self.passo = passo
+        self.bloco = bloco
+        self.linha = linha
+
+    def filhos(self):
+        return (self.inicio, self.fim, self.passo, *self.bloco)
+
+    def para_json(self):
+        return self._com_linha({"tipo": "PARA", "var": self.variavel, "start": expressao_para_json(self.inicio),
+                                "end": expressao_para_json(self.fim), "step": expressao_para_json(self.passo),
+                                "bloco": bloco_para_json(self.bloco)})
+
+
+class Repita(Comando):
+    __slots__ = ("bloco", "condicao", "linha")
+    rotulo = "REPITA"
+
+    def __init__(self, bloco, condicao, linha=None):
+        self.bloco = bloco
+        self.condicao = condicao
+        self.linha = linha
+
+    def filhos(self):
+        return (*self.bloco, self.condicao)
+
+    def para_json(self):
+        return self._com_linha({"tipo": "REPITA", "bloco": bloco_para_json(self.bloco),
+                                "condicao": expressao_para_json(self.condicao)})
+
+
+class ExecutarModulo(Comando):
+    __slots__ = ("nome", "linha")
+    chave = "executar_modulo"
+
+    def __init__(self, nome, linha=None):
+        self.nome = nome
+        self.linha = linha
+
+    def para_json(self):
+        return self._com_linha({"executar_modulo": self.nome})
+
+
+class Executar(Comando):
+    __slots__ = ("nome", "linha")
+    chave = "executar"
+
+    def __init__(self, nome, linha=None):
+        self.nome = nome
+        self.linha = linha
+
+    def para_json(self):
+        return self._com_linha({"executar": self.nome})
+
+
+class Importe(Comando):
+    __slots__ = ("nome", "linha")
+    chave = "importe"
+
+    def __init__(self, nome, linha=None):
+        self.nome = nome
+        self.linha = linha
+
+    def para_json(self):
+        return self._com_linha({"importe": self.nome})
+
+
+class ComandoChamada(Comando):
+    """Chamada de lib usada como comando; o valor retornado é descartado."""
+    __slots__ = ("chamada", "linha")
+    chave = "chamada_modulo"
+
+    def __init__(self, chamada, linha=None):
+        self.chamada = chamada
+        self.linha = linha
+
+    def filhos(self):
+        return (self.chamada,)
+
+    def para_json(self):
+        return self._com_linha(self.chamada.para_json())
+
+
+class EscrevaAcesso(Comando):
+    """Acesso a lista/grupo usado como comando (formato antigo): escreve o valor."""
+    __slots__ = ("acesso", "linha")
+
+    def __init__(self, acesso, linha=None):
+        self.acesso = acesso
+        self.linha = linha
+
+    @property
+    def rotulo(self):
+        return self.acesso.chave
+
+    def filhos(self):
+        return (self.acesso,)
+
+    def para_json(self):
+        return self._com_linha(self.acesso.para_json())
+
+
+class ArquivoInicio(Comando):
+    __slots__ = ("nome", "extensao", "linha")
+    chave = "arquivo_inicio"
+
+    def __init__(self, nome, extensao, linha=None):
+        self.nome = nome
+        self.extensao = extensao
+        self.linha = linha
+
+    def para_json(self):
+        return self._com_linha({"arquivo_inicio": {"nome": self.nome, "extensao": self.extensao}})
+
+
+class ArquivoEscreva(Comando):
+    __slots__ = ("conteudo", "nome", "linha")
+    chave = "arquivo_escreva"
+
+    def __init__(self, conteudo, nome, linha=None):
+        self.conteudo = conteudo
+        self.nome = nome
+        self.linha = linha
+
+    def para_json(self):
+        return self._com_linha({"arquivo_escreva": {"conteudo": self.conteudo, "nome": self.nome}})
+
+
+class ArquivoLeia(Comando):
+    __slots__ = ("nome", "linha")
+    chave = "arquivo_leia"
+
+    def __init__(self, nome, linha=None):
+        self.nome = nome
+        self.linha = linha
+
+    def para_json(self):
+        return self._com_linha({"arquivo_leia": {"nome": self.nome}})
+
+
+# ---------------------------------------------------------
+#  FUNÇÕES E DECLARAÇÕES
+# ---------------------------------------------------------
+class Funcao(No):
+    __slots__ = ("nome", "parametros", "corpo", "retorno", "linha")
+
+    def __init__(self, nome, parametros, corpo, retorno, linha=None):
+        self.nome = nome
+        self.parametros = tuple(parametros)
+        self.corpo = corpo
+        self.retorno = retorno
+        self.linha = linha
+
+    def filhos(self):
+        return (*self.corpo, self.retorno)
+
+    def para_json(self):
+        dados = {"nome": self.nome, "parametros": list(self.parametros), "corpo": bloco_para_json(self.corpo),
+                 "retorno": expressao_para_json(self.retorno)}
+        if self.linha is not None:
+            dados["linha"] = self.linha
+        return dados
+
+
+class Declaracao(No):
+    """Declaração "variavel nome tipo ..."; valores só existe para lista e grupo."""
+    __slots__ = ("nome", "tipo", "valores")
+
+    def __init__(self, nome, tipo, valores=None):
+        self.nome = nome
+        self.tipo = tipo
+        self.valores = valores
+
+    def para_json(self):
+        dados = {"nome": self.nome, "tipo": self.tipo}
+        if self.valores is not None:
+            dados["valores"] = self.valores
+        return dados
+
+
+def percorrer(no):
+    """Gera o nó e todos os nós contidos nele (aceita também listas e dicts de nós)."""
+    pendentes = [no]
+    while pendentes:
+        atual = pendentes.pop()
+        if isinstance(atual, No):
+            yield atual
+            pendentes.extend(atual.filhos())
+        elif isinstance(atual, dict):
+            pendentes.extend(atual.values())
+        elif isinstance(atual, list):
+            pendentes.extend(atual)
+
+
+# ---------------------------------------------------------
+#  CONVERSÃO DE/PARA O FORMATO JSON
+# ---------------------------------------------------------
+def bloco_para_json(comandos):
+    return [comando.para_json() for comando in comandos]
+
+
+def bloco_de_json(comandos):
+    return [comando_de_json(comando) for comando in comandos]
+
+
+def comando_de_json(dados):
+    """Converte um comando no formato de dicts para o nó correspondente."""
+    linha = dados.get("linha")
+    tipo = dados.get("tipo")
+    if tipo == "SE":
+        senao = dados.get("bloco_senao")
+        return Se(expressao_de_json(dados["condicao"]), bloco_de_json(dados["bloco_se"]),
+                  None if senao is None else bloco_de_json(senao), linha)
+    if tipo == "ENQUANTO":
+        return Enquanto(expressao_de_json(dados["condicao"]), bloco_de_json(dados["bloco"]), linha)
+    if tipo == "PARA":
+        return Para(dados["var"], expressao_de_json(dados["start"]), expressao_de_json(dados["end"]),
+                    expressao_de_json(dados["step"]), bloco_de_json(dados["bloco"]), linha)
+    if tipo == "REPITA":
+        return Repita(bloco_de_json(dados["bloco"]), expressao_de_json(dados["condicao"]), linha)
+    if "atribuir" in dados:
+        info = dados["atribuir"]
+        return Atribuir(info["variavel"], expressao_de_json(info["valor"]), linha)
+    if "escreva" in dados:
+        return Escreva(dados["escreva"], linha)
+    if "pergunte" in dados:
+        info = dados["pergunte"]
+        return Pergunte(info["texto"], info["variavel"], linha)
+    if "executar_modulo" in dados:
+        return ExecutarModulo(dados["executar_modulo"], linha)
+    if "executar" in dados:
+        return Executar(dados["executar"], linha)
+    if "importe" in dados:
+        return Importe(dados["importe"], linha)
+    if "chamada_modulo" in dados:
+        return ComandoChamada(expressao_de_json(dados), linha)
+    if "acesso_lista" in dados or "acesso_grupo" in dados:
+        return EscrevaAcesso(expressao_de_json(dados), linha)
+    if "arquivo_inicio" in dados:
+        info = dados["arquivo_inicio"]
+        return ArquivoInicio(info["nome"], info["extensao"], linha)
+    if "arquivo_escreva" in dados:
+        info = dados["arquivo_escreva"]
+        return ArquivoEscreva(info["conteudo"], info["nome"], linha)
+    if "arquivo_leia" in dados:
+        return ArquivoLeia(dados["arquivo_leia"]["nome"], linha)
+    raise ValueError(f"Comando inválido: {dados}")
+
+
+def funcao_de_json(dados):
+    return Funcao(dados["nome"], dados["parametros"], bloco_de_json(dados["corpo"]),
+                  expressao_de_json(dados["retorno"]), dados.get("linha"))
+
+
+def ast_para_json(ast):
+    """Converte a AST do parser para o formato de dicts aninhados (serializável com json)."""
+    programa = ast["programa"]
+    implementacao = programa.get("implementacao", {})
+    implementacao_json = {}
+    for nome_bloco in ("principal", "execucoes_apos_principal"):
+        if nome_bloco in implementacao:
+            implementacao_json[nome_bloco] = bloco_para_json(implementacao[nome_bloco])
+    if "modulos" in implementacao:
+        implementacao_json["modulos"] = {nome: [f.para_json() for f in funcoes]
+                                         for nome, funcoes in implementacao["modulos"].items()}
+    programa_json = {"nome": programa["nome"]}
+    if "importes" in programa:
+        programa_json["importes"] = bloco_para_json(programa["importes"])
+    programa_json["variaveis"] = [v.para_json() for v in programa["variaveis"]]
+    programa_json["implementacao"] = implementacao_json
+    programa_json["execucao"] = {"modulos": list(programa["execucao"]["modulos"])}
+    return {"programa": programa_json}
+
+
+def ast_de_json(dados):
+    """Converte uma AST no formato de dicts aninhados para nós."""
+    programa = dados["programa"]
+    implementacao = programa.get("implementacao", {})
+    implementacao_nos = {}
+    for nome_bloco in ("principal", "execucoes_apos_principal"):
+        if nome_bloco in implementacao:
+            implementacao_nos[nome_bloco] = bloco_de_json(implementacao[nome_bloco])
+    if "modulos" in implementacao:
+        implementacao_nos["modulos"] = {nome: [funcao_de_json(f) for f in funcoes]
+                                        for nome, funcoes in implementacao["modulos"].items()}
+    programa_nos = {"nome": programa["nome"]}
+    if "importes" in programa:
+        programa_nos["importes"] = bloco_de_json(programa["importes"])
+    programa_nos["variaveis"] = [Declaracao(v["nome"], v["tipo"], v.get("valores")) for v in programa["variaveis"]]
+    programa_nos["implementacao"] = implementacao_nos
+    programa_nos["execucao"] = {"modulos": list(programa.get("execucao", {}).get("modulos", []))}
+    return {"programa": programa_nos}
@@ -0,0 +1,245 @@
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from lexer_gerador import Lexer
+from parser_gerador import Parser
+from cache_ast import CacheAST
+from saida import Saida, DESCARGA_BUFFER
+from interpretador import Interpretador
+
+# Etapas medidas em cada carga de trabalho
+ETAPAS = ("tokenizar", "parse", "cache", "executar")
+
+
+# ---------------------------------------------------------
+#  CARGAS DE TRABALHO GERADAS
+# ---------------------------------------------------------
+# Cada gerador retorna (código-fonte, número de operações da execução);
+# "escala" multiplica o tamanho da carga.
+
+def _programa(nome, variaveis, principal, modulos="", importes=""):
+    return (f"INICIO PROGAMA {nome}.\n{importes}{variaveis}\n"
+            f"IMPLEMENTACAO PROGAMA {nome}.\nPRINCIPAL.\n{principal}\nFIM PRINCIPAL.\n{modulos}\n"
+            f"EXECUCAO PROGAMA {nome}.\nEXECUTAR PRINCIPAL.\nFIM PROGAMA {nome}.\n")
+
+
+def carga_grupo(escala):
+    linhas = 5000 * escala
+    dados = ",\n".join(f'    ["produto {i}", {i % 97}.5, {i}]' for i in range(linhas))
+    variaveis = f'variavel produtos tipo grupo = GRUPO(["NOME", "PRECO", "ESTOQUE"],\n{dados})\n'
+    return _programa("GRUPO_GRANDE", variaveis, '    escreva("{produtos[0].NOME}").'), linhas
+
+
+def carga_expressao(escala):
+    # A AST de uma soma é aninhada à esquerda: o tamanho fica abaixo do limite de recursão.
+    # Começa por "i" para que o parser não reduza a soma inteira a uma constante.
+    termos = 300 * escala
+    expressao = "i + " + " + ".join(str(i % 10 + 1) for i in range(termos))
+    principal = f"    PARA i = 1 ATE 100 FACA.\n        x = {expressao}.\n    FIM PARA."
+    return _programa("EXPRESSAO", "variavel x tipo inteiro\n", principal), 100 * termos
+
+
+def carga_para(escala):
+    n = 200000 * escala
+    principal = f"    s = 0.\n    PARA i = 1 ATE {n} FACA.\n        s = (s + i).\n    FIM PARA."
+    return _programa("LACO_PARA", "variavel s tipo inteiro\n", principal), n
+
+
+def carga_enquanto(escala):
+    n = 100000 * escala
+    principal = f"    i = 0.\n    ENQUANTO i < {n} FACA.\n        i = (i + 1).\n    FIM ENQUANTO."
+    return _programa("LACO_ENQUANTO", "variavel i tipo inteiro\n", principal), n
+
+
+def carga_escreva(escala):
+    n = 20000 * escala
+    variaveis = "variavel nome tipo texto\nvariavel nums tipo lista = [1, 2, 3]\n"
+    principal = (f'    nome = "zin".\n    PARA i = 1 ATE {n} FACA.\n'
+                 '        escreva("linha {i}: {nome} {nums[1]} {i} fim").\n    FIM PARA.')
+    return _programa("ESCREVA", variaveis, principal), n
+
+
+def carga_funcoes(escala):
+    n = 50000 * escala
+    modulos = "MODULO CALCULO.\nfuncao dobro(v)\n    r = (v * 2).\nretorne (r).\nFIM MODULO.\n"
+    principal = f"    v = 21.\n    PARA i = 1 ATE {n} FACA.\n        EXECUTAR MODULO CALCULO.\n    FIM PARA."
+    return _programa("FUNCOES", "variavel v tipo inteiro\n", principal, modulos), n
+
+
+def carga_zin_math(escala):
+    n = 100000 * escala
+    principal = f"    PARA i = 1 ATE {n} FACA.\n        r = zin_math.raiz_quadrada(i).\n    FIM PARA."
+    return _programa("ZIN_MATH", "variavel r tipo decimal\n", principal, importes="importe zin_math.\n"), n
+
+
+def carga_comandos(escala):
+    # Programa grande (muitos comandos e blocos): o pico de memória do parse mostra o custo da AST
+    n = 2000 * escala
+    corpo = "".join(f"    SE x > {i} ENTAO.\n        x = x - 1.\n    SENAO.\n        x = x + {i % 7}.\n    FIM SE.\n"
+                    for i in range(n))
+    return _programa("COMANDOS", "variavel x tipo inteiro\n", "    x = 0.\n" + corpo), n
+
+
+CARGAS = {
+    "grupo": carga_grupo,
+    "expressao": carga_expressao,
+    "para": carga_para,
+    "enquanto": carga_enquanto,
+    "escreva": carga_escreva,
+    "funcoes": carga_funcoes,
+    "zin_math": carga_zin_math,
+    "comandos": carga_comandos,
+}
+
+
+# ---------------------------------------------------------
+#  MEDIÇÃO
+# ---------------------------------------------------------
+def _tokenizar(codigo):
+    lexer = Lexer()
+    lexer.build()
+    return list(lexer.gerar_tokens(codigo))
+
+
+def _etapas(codigo, cache):
+    """Retorna as funções de cada etapa, já preparadas para medir só a etapa."""
+    tokens = _tokenizar(codigo)
+    ast = Parser(tokens).parse()
+    codigo_bytes = codigo.encode("utf-8")
+    cache.salvar(codigo_bytes, ast)
+
+    def executar():
+        interpretador = Interpretador("<benchmark>", cache=False,
+                                      saida=Saida(lambda texto: None, descarga=DESCARGA_BUFFER))
+        interpretador.ast = ast
+        interpretador.executar()
+
+    return {
+        "tokenizar": (lambda: _tokenizar(codigo), len(tokens)),
+        "parse": (lambda: Parser(tokens).parse(), len(tokens)),
+        "cache": (lambda: cache.carregar(codigo_bytes), 1),
+        "executar": (executar, None),
+    }
+
+
+# Duração mínima de cada amostra; etapas muito curtas são repetidas até alcançá-la
+AMOSTRA_MINIMA = 0.02
+
+
+def _melhor_tempo(funcao, repeticoes):
+    """Melhor tempo por chamada entre as repetições (como o timeit, agrupando chamadas curtas)."""
+    inicio = time.perf_counter()
+    funcao()
+    primeira = time.perf_counter() - inicio
+    chamadas = max(1, int(AMOSTRA_MINIMA / primeira) + 1) if primeira < AMOSTRA_MINIMA else 1
+    melhor = primeira
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        for _ in range(chamadas):
+            funcao()
+        melhor = min(melhor, (time.perf_counter() - inicio) / chamadas)
+    return melhor
+
+
+def _pico_memoria(funcao):
+    # Medido em uma rodada separada: o tracemalloc deixa tudo mais lento
+    tracemalloc.start()
+    try:
+        funcao()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def medir(nomes=None, escala=1, repeticoes=5, memoria=True):
+    """Roda as cargas escolhidas e retorna {carga: {etapa: {segundos, ops_por_s, pico_kb}}}."""
+    resultados = {}
+    with tempfile.TemporaryDirectory() as diretorio:
+        cache = CacheAST(diretorio)
+        for nome in nomes or CARGAS:
+            codigo, operacoes = CARGAS[nome](escala)
+            etapas = _etapas(codigo, cache)
+            resultados[nome] = {}
+            for etapa in ETAPAS:
+                funcao, unidades = etapas[etapa]
+                unidades = operacoes if unidades is None else unidades
+                segundos = _melhor_tempo(funcao, repeticoes)
+                resultados[nome][etapa] = {
+                    "segundos": segundos,
+                    "ops_por_s": unidades / segundos if segundos > 0 else 0.0,
+                    "pico_kb": _pico_memoria(funcao) / 1024 if memoria else None,
+                }
+    return resultados
+
+
+# ---------------------------------------------------------
+#  RELATÓRIOS
+# ---------------------------------------------------------
+def formatar(resultados):
+    linhas = [f"{'carga':<10} {'etapa':<10} {'tempo (ms)':>11} {'ops/s':>14} {'pico (KB)':>10}"]
+    for nome, etapas in resultados.items():
+        for etapa, r in etapas.items():
+            pico = "-" if r["pico_kb"] is None else f"{r['pico_kb']:.0f}"
+            linhas.append(f"{nome:<10} {etapa:<10} {r['segundos'] * 1000:>11.2f} {r['ops_por_s']:>14,.0f} {pico:>10}")
+    return "\n".join(linhas)
+
+
+def comparar(resultados, base, tolerancia):
+    """Compara ops/s com uma base salva; retorna (texto, houve_regressao)."""
+    linhas = [f"{'carga':<10} {'etapa':<10} {'base ops/s':>14} {'atual ops/s':>14} {'variação':>9}"]
+    regressao = False
+    for nome, etapas in resultados.items():
+        for etapa, r in etapas.items():
+            anterior = base.get(nome, {}).get(etapa)
+            if not anterior or not anterior.get("ops_por_s"):
+                continue
+            variacao = r["ops_por_s"] / anterior["ops_por_s"] - 1
+            marca = ""
+            if variacao < -tolerancia:
+                marca = "  REGRESSÃO"
+                regressao = True
+            linhas.append(f"{nome:<10} {etapa:<10} {anterior['ops_por_s']:>14,.0f} {r['ops_por_s']:>14,.0f} "
+                          f"{variacao:>+8.1%}{marca}")
+    return "\n".join(linhas), regressao
+
+
+def main(argv=None):
+    parser_args = argparse.ArgumentParser(prog="zin -bench", description="Benchmarks do lexer, parser e interpretador Zin.")
+    parser_args.add_argument("cargas", nargs="*", metavar="carga",
+                             help="cargas a medir (padrão: todas): " + ", ".join(CARGAS))
+    parser_args.add_argument("-n", "--repeticoes", type=int, default=5, help="repetições por etapa (vale o melhor tempo)")
+    parser_args.add_argument("--escala", type=int, default=1, help="multiplica o tamanho das cargas")
+    parser_args.add_argument("--rapido", action="store_true", help="uma repetição e sem medir memória")
+    parser_args.add_argument("--salvar", metavar="ARQUIVO", help="grava os resultados em JSON (para usar como base)")
+    parser_args.add_argument("--comparar", metavar="ARQUIVO", help="compara com uma base salva por --salvar")
+    parser_args.add_argument("--tolerancia", type=float, default=0.10,
+                             help="queda de ops/s aceita antes de acusar regressão (padrão: 0.10)")
+    args = parser_args.parse_args(argv)
+    desconhecidas = [nome for nome in args.cargas if nome not in CARGAS]
+    if desconhecidas:
+        parser_args.error(f"carga inválida: {', '.join(desconhecidas)} (escolha entre {', '.join(CARGAS)})")
+    repeticoes = 1 if args.rapido else args.repeticoes
+    resultados = medir(args.cargas or None, escala=args.escala, repeticoes=repeticoes, memoria=not args.rapido)
+    print(formatar(resultados))
+    if args.salvar:
+        with open(args.salvar, "w", encoding="utf-8") as arquivo:
+            json.dump(resultados, arquivo, indent=2)
+        print(f"\nResultados salvos em {args.salvar}")
+    if args.comparar:
+        with open(args.comparar, "r", encoding="utf-8") as arquivo:
+            base = json.load(arquivo)
+        texto, regressao = comparar(resultados, base, args.tolerancia)
+        print("\n" + texto)
+        return 1 if regressao else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+
+logger = logging.getLogger("zin.cache")
+
+# Versão do interpretador; faz parte da chave do cache junto com a gramática
+VERSAO_INTERPRETADOR = "0.0.1"
+
+# Arquivos cujo conteúdo define a gramática e os nós (mudou algum deles, muda a chave)
+_ARQUIVOS_GRAMATICA = ("lexer_gerador.py", "parser_gerador.py", "ast_nos.py")
+_versao_gramatica = None
+
+
+def diretorio_cache_padrao():
+    """Retorna o diretório de cache (ZIN_CACHE_DIR ou ~/.cache/zin)."""
+    diretorio = os.environ.get("ZIN_CACHE_DIR")
+    if diretorio:
+        return diretorio
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "zin")
+
+
+def versao_gramatica():
+    """Hash do código do lexer e do parser, calculado uma vez por processo."""
+    global _versao_gramatica
+    if _versao_gramatica is None:
+        h = hashlib.sha256()
+        pasta = os.path.dirname(os.path.abspath(__file__))
+        for nome in _ARQUIVOS_GRAMATICA:
+            with open(os.path.join(pasta, nome), "rb") as arquivo:
+                h.update(arquivo.read())
+        _versao_gramatica = h.hexdigest()[:16]
+    return _versao_gramatica
+
+
+# Classe CacheAST que guarda a AST já gerada, endereçada pelo conteúdo do código-fonte
+class CacheAST:
+    def __init__(self, diretorio=None):
+        self.diretorio = diretorio or diretorio_cache_padrao()
+
+    def chave(self, codigo):
+        """Chave do cache: hash do código-fonte + versão do interpretador e da gramática."""
+        h = hashlib.sha256()
+        h.update(VERSAO_INTERPRETADOR.encode("utf-8"))
+        h.update(versao_gramatica().encode("utf-8"))
+        h.update(codigo)
+        return h.hexdigest()
+
+    def _caminho(self, chave):
+        return os.path.join(self.diretorio, chave[:2], chave + ".ast")
+
+    def carregar(self, codigo):
+        """Retorna a AST salva para este código ou None se não houver entrada válida."""
+        caminho = self._caminho(self.chave(codigo))
+        try:
+            with open(caminho, "rb") as arquivo:
+                ast = pickle.load(arquivo)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            # Entrada corrompida ou de outra versão do Python: descarta e gera de novo
+            logger.warning("Cache inválido em '%s', descartando: %s", caminho, e)
+            return None
+        if not isinstance(ast, dict) or "programa" not in ast:
+            return None
+        return ast
+
+    def salvar(self, codigo, ast):
+        """Grava a AST de forma atômica (arquivo temporário + os.replace)."""
+        caminho = self._caminho(self.chave(codigo))
+        pasta = os.path.dirname(caminho)
+        try:
+            os.makedirs(pasta, exist_ok=True)
+            fd, temporario = tempfile.mkstemp(dir=pasta, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as arquivo:
+                    pickle.dump(ast, arquivo, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(temporario, caminho)
+            except BaseException:
+                os.unlink(temporario)
+                raise
+        except (OSError, RecursionError, pickle.PicklingError) as e:
+            # Falhar ao gravar o cache (disco, AST profunda demais...) não impede a execução
+            logger.warning("Não foi possível gravar o cache em '%s': %s", caminho, e)
+            return None
+        return caminho
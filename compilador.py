@@ -0,0 +1,708 @@
+import logging
+
+from grupo import Grupo
+from semantica import tipo_numerico
+from ast_nos import (No, Texto, Binaria, ChamadaModulo, AcessoLista, AcessoGrupo, OPERADORES,
+                     Atribuir, Escreva, Pergunte, Se, Enquanto, Para, Repita, ExecutarModulo, Importe,
+                     ComandoChamada, EscrevaAcesso, ArquivoInicio, ArquivoEscreva, ArquivoLeia,
+                     PADRAO_PLACEHOLDER, placeholder_para_no)
+
+logger = logging.getLogger("zin.compilador")
+
+# Valor de um slot cujo nome ainda não foi definido (o identificador vale o próprio nome)
+INDEFINIDO = object()
+
+
+# Classe Compilador que transforma a AST (nós de ast_nos) em uma árvore de closures.
+# Cada comando e cada expressão são resolvidos uma única vez: o tipo do nó,
+# o operador e os índices constantes são decididos aqui, e a execução passa
+# a ser apenas a chamada das funções geradas, sem consultar a AST.
+#
+# Variáveis são resolvidas para slots: cada nome recebe um índice fixo em
+# interp.globais durante a compilação, e o acesso em tempo de execução é g[i].
+class Compilador:
+    def __init__(self, interpretador):
+        # Guarda o interpretador (dono dos valores) e um cache de nós já compilados
+        self.interp = interpretador
+        self._cache = {}
+        # Tabela de nomes -> slot e nomes que sempre têm valor (declarados/importados)
+        self.nomes = {}
+        self.definidas = set()
+        # Tabela de símbolos do programa (semantica.TabelaSimbolos), quando o interpretador a fornece
+        self.tabela = None
+        self._tipos_expressao = {}
+        # Laço PARA em compilação: (nomes escritos no corpo, se há chamadas a libs, células memorizadas)
+        self._laco = None
+
+    def slot(self, nome):
+        """Retorna o índice do nome em interp.globais, reservando um slot novo se preciso."""
+        indice = self.nomes.get(nome)
+        if indice is None:
+            indice = len(self.interp.globais)
+            self.interp.globais.append(INDEFINIDO)
+            self.nomes[nome] = indice
+        return indice
+
+    def marcar_definida(self, nome):
+        """Informa que o nome sempre terá valor, dispensando a checagem de INDEFINIDO na leitura."""
+        self.definidas.add(nome)
+
+    def _escritos(self, no, corpo):
+        """Nomes escritos no corpo do nó: vêm da tabela de símbolos, ou do próprio corpo se faltar."""
+        escritos = self.tabela.escritos(no) if self.tabela is not None else None
+        return escritos if escritos is not None else nomes_escritos(corpo)
+
+    def _chama_libs(self, no, corpo):
+        libs = self.tabela.chama_libs(no) if self.tabela is not None else None
+        return libs if libs is not None else contem_chamada_modulo(corpo)
+
+    @property
+    def tipos(self):
+        """Tipos numéricos provados pela inferência da tabela de símbolos (vazio sem tabela)."""
+        return self.tabela.tipos if self.tabela is not None else {}
+
+    def _memo(self, no, gerar, *args):
+        # O cache é indexado por id() e guarda o próprio nó para que o id não seja reutilizado
+        chave = id(no)
+        item = self._cache.get(chave)
+        if item is None or item[0] is not no:
+            item = (no, gerar(no, *args))
+            self._cache[chave] = item
+        return item[1]
+
+    # ---------------------------------------------------------
+    #  BLOCOS, FUNÇÕES E MÓDULOS
+    # ---------------------------------------------------------
+    def compilar_bloco(self, comandos):
+        """Compila uma lista de comandos em uma única função sem argumentos."""
+        return self._memo(comandos, self._gerar_bloco)
+
+    def _gerar_bloco(self, comandos):
+        passos = tuple(f for f in (self.compilar_comando(c) for c in (comandos or [])) if f is not None)
+        if not passos:
+            return _nada
+        if len(passos) == 1:
+            return passos[0]
+        if len(passos) == 2:
+            primeiro, segundo = passos
+
+            def bloco_duplo():
+                primeiro()
+                segundo()
+            return bloco_duplo
+
+        def bloco():
+            for passo in passos:
+                passo()
+        return bloco
+
+    def compilar_funcao(self, funcao):
+        """Compila uma função Zin; o que ela escreve é desfeito ao retornar."""
+        return self._memo(funcao, self._gerar_funcao)
+
+    def _gerar_funcao(self, funcao):
+        # Uma função enxerga as variáveis de quem a chamou, mas suas escritas são locais.
+        # Os slots que ela pode escrever (parâmetros + alvos de atribuição) são conhecidos
+        # agora; na chamada o frame guarda só esses valores e os restaura no retorno.
+        g = self.interp.globais
+        nome_funcao = funcao.nome
+        parametros = tuple(self.slot(p) for p in funcao.parametros)
+        locais = set(parametros)
+        locais.update(self.slot(n) for n in self._escritos(funcao, funcao.corpo))
+        locais = tuple(sorted(locais))
+        corpo = self.compilar_bloco(funcao.corpo)
+        retorno = self.compilar_expressao(funcao.retorno)
+
+        def chamar():
+            frame = [g[i] for i in locais]
+            for i in parametros:
+                if g[i] is INDEFINIDO:
+                    g[i] = None
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Executando função: %s", nome_funcao)
+            try:
+                corpo()
+                return retorno()
+            finally:
+                for i, valor in zip(locais, frame):
+                    g[i] = valor
+        perfilador = self.interp.perfilador
+        if perfilador is not None:
+            return perfilador.envolver(f"funcao {nome_funcao}", chamar)
+        return chamar
+
+    def compilar_modulo(self, funcoes, nome_modulo=None):
+        """Compila todas as funções de um módulo em uma única chamada."""
+        return self._memo(funcoes, self._gerar_modulo, nome_modulo)
+
+    def _gerar_modulo(self, funcoes, nome_modulo):
+        chamadas = tuple(self.compilar_funcao(f) for f in funcoes)
+
+        def modulo():
+            for chamar in chamadas:
+                chamar()
+        perfilador = self.interp.perfilador
+        if perfilador is not None and nome_modulo is not None:
+            return perfilador.envolver(f"modulo {nome_modulo}", modulo)
+        return modulo
+
+    # ---------------------------------------------------------
+    #  COMANDOS
+    # ---------------------------------------------------------
+    def compilar_comando(self, comando):
+        executar = self._gerar_comando(comando)
+        perfilador = self.interp.perfilador
+        if executar is None or perfilador is None or not perfilador.linhas or comando.linha is None:
+            return executar
+        return perfilador.envolver(f"linha {comando.linha} ({comando.rotulo})", executar)
+
+    def _gerar_comando(self, comando):
+        # O tipo do nó escolhe o gerador; comandos sem gerador (ex.: EXECUTAR fora do
+        # EXECUCAO) são ignorados, como sempre foram
+        gerar = _GERADORES_COMANDO.get(type(comando))
+        return gerar(self, comando) if gerar is not None else None
+
+    def _comando_executar_modulo(self, comando):
+        interp = self.interp
+        nome_modulo = comando.nome
+        return lambda: interp.executar_modulo(nome_modulo)
+
+    def _comando_escreva_acesso(self, comando):
+        avaliar = self._valor_expressao(comando.acesso)
+        escrever = self.interp.saida.escrever
+        return lambda: escrever(avaliar())
+
+    def _comando_chamada(self, comando):
+        # O valor retornado pela lib é descartado
+        return self.compilar_expressao(comando.chamada)
+
+    def _comando_interpretado(self, comando):
+        # Comandos de importe e de arquivo continuam implementados no interpretador
+        executar = getattr(self.interp, _METODOS_INTERPRETADOR[type(comando)])
+        return lambda: executar(comando)
+
+    def _comando_atribuicao(self, comando):
+        g = self.interp.globais
+        i = self.slot(comando.variavel)
+        valor = self.compilar_expressao(comando.valor)
+
+        def atribuir():
+            g[i] = valor()
+        return atribuir
+
+    def _comando_pergunte(self, comando):
+        interp = self.interp
+        g = interp.globais
+        texto = comando.texto
+        i = self.slot(comando.variavel)
+        saida = interp.saida
+        # Variável declarada inteiro/decimal converte a resposta pelo tipo declarado
+        converter = _CONVERSOES.get(self.tabela.tipo(comando.variavel) if self.tabela is not None else None)
+
+        def pergunte():
+            # O que já foi escrito precisa aparecer antes da pergunta
+            saida.descarregar()
+            resposta = input(f"{texto} ")
+            # Variável inexistente descarta a resposta; sem tipo declarado, inteiro tenta manter o tipo
+            atual = g[i]
+            if atual is INDEFINIDO:
+                return
+            if converter is not None:
+                try:
+                    g[i] = converter(resposta)
+                except ValueError:
+                    g[i] = resposta
+            elif isinstance(atual, int):
+                try:
+                    g[i] = int(resposta)
+                except ValueError:
+                    g[i] = resposta
+            else:
+                g[i] = resposta
+        return pergunte
+
+    def _comando_escreva(self, comando):
+        renderizar = self.compilar_template(comando.texto)
+        escrever = self.interp.saida.escrever
+        return lambda: escrever(renderizar())
+
+    def _comando_se(self, comando):
+        condicao = self.compilar_expressao(comando.condicao)
+        bloco_se = self.compilar_bloco(comando.bloco_se)
+        bloco_senao = self.compilar_bloco(comando.bloco_senao or [])
+
+        def se():
+            if condicao():
+                bloco_se()
+            else:
+                bloco_senao()
+        return se
+
+    def _comando_enquanto(self, comando):
+        condicao = self.compilar_expressao(comando.condicao)
+        bloco = self.compilar_bloco(comando.bloco)
+
+        def enquanto():
+            while condicao():
+                bloco()
+        return enquanto
+
+    def _comando_repita(self, comando):
+        condicao = self.compilar_expressao(comando.condicao)
+        bloco = self.compilar_bloco(comando.bloco)
+
+        def repita():
+            while True:
+                bloco()
+                if condicao():
+                    break
+        return repita
+
+    def _comando_para(self, comando):
+        g = self.interp.globais
+        var_name = comando.variavel
+        i = self.slot(var_name)
+        inicio = self.compilar_expressao(comando.inicio)
+        fim = self.compilar_expressao(comando.fim)
+        passo = self.compilar_expressao(comando.passo) if comando.passo else None
+        escritos = self._escritos(comando, comando.bloco)
+        # Expressões do corpo que não dependem de nada escrito no laço são
+        # calculadas na primeira vez que aparecem e reaproveitadas até o fim do laço
+        laco_externo = self._laco
+        celulas = []
+        self._laco = (escritos | {var_name}, self._chama_libs(comando, comando.bloco), celulas)
+        try:
+            bloco = self.compilar_bloco(comando.bloco)
+        finally:
+            self._laco = laco_externo
+        celulas = tuple(celulas)
+        # Se o corpo não escreve a variável do laço, o laço pode usar range nativo
+        contagem_nativa = var_name not in escritos
+
+        def contar(start_val, end_val, step_val):
+            if (contagem_nativa and type(start_val) is int and type(end_val) is int
+                    and type(step_val) is int and step_val != 0):
+                if step_val > 0:
+                    intervalo = range(start_val, end_val + 1, step_val)
+                else:
+                    intervalo = range(start_val, end_val - 1, step_val)
+                for valor in intervalo:
+                    g[i] = valor
+                    bloco()
+                # Ao sair, a variável fica com o primeiro valor fora do intervalo, como no laço genérico
+                g[i] = start_val + len(intervalo) * step_val
+                return
+            g[i] = start_val
+            if step_val > 0:
+                while g[i] <= end_val:
+                    bloco()
+                    g[i] += step_val
+            else:
+                while g[i] >= end_val:
+                    bloco()
+                    g[i] += step_val
+
+        if not celulas:
+            def para():
+                contar(inicio(), fim(), passo() if passo is not None else 1)
+            return para
+
+        def para():
+            start_val = inicio()
+            end_val = fim()
+            step_val = passo() if passo is not None else 1
+            # As células são do nó PARA, não da execução: um EXECUTAR MODULO recursivo no corpo
+            # roda o mesmo laço e as reinicia, então os valores desta execução voltam no fim
+            salvos = [celula[0] for celula in celulas]
+            for celula in celulas:
+                celula[0] = _VAZIO
+            try:
+                contar(start_val, end_val, step_val)
+            finally:
+                for celula, valor in zip(celulas, salvos):
+                    celula[0] = valor
+        return para
+
+    # ---------------------------------------------------------
+    #  TEMPLATES DO ESCREVA
+    # ---------------------------------------------------------
+    def compilar_template(self, texto):
+        """Divide o texto do escreva em trechos literais e placeholders já compilados."""
+        partes = PADRAO_PLACEHOLDER.split(texto)
+        # Posições pares são literais, ímpares são o conteúdo de um {placeholder}
+        formato = "".join(
+            parte.replace("{", "{{").replace("}", "}}") if i % 2 == 0 else "{}"
+            for i, parte in enumerate(partes)
+        )
+        valores = []
+        for placeholder in partes[1::2]:
+            no = placeholder_para_no(placeholder)
+            if isinstance(no, str):
+                valores.append(self._valor_placeholder(no))
+            else:
+                valores.append(self._valor_expressao(no))
+        valores = tuple(valores)
+        if not valores:
+            constante = formato.format()
+            return lambda: constante
+        if len(valores) == 1:
+            unico = valores[0]
+            return lambda: formato.format(unico())
+        return lambda: formato.format(*[v() for v in valores])
+
+    def _valor_placeholder(self, nome):
+        # {variavel} simples: ausente ou sem valor aparece como "null"
+        g = self.interp.globais
+        i = self.slot(nome)
+
+        def valor():
+            v = g[i]
+            return "null" if v is None or v is INDEFINIDO else v
+        return valor
+
+    def _valor_expressao(self, expr):
+        # Expressão escrita ({lista[i]}, {grupo[i].campo}, {lib.f()}): valor ausente também é "null"
+        avaliar = self.compilar_expressao(expr)
+
+        def valor():
+            v = avaliar()
+            return "null" if v is None else v
+        return valor
+
+    # ---------------------------------------------------------
+    #  EXPRESSÕES
+    # ---------------------------------------------------------
+    def compilar_expressao(self, expr):
+        """Compila uma expressão em uma função sem argumentos que devolve o seu valor."""
+        if self._laco is not None and isinstance(expr, No) and self._invariante(expr):
+            return self._expressao_invariante(expr)
+        if isinstance(expr, (int, float)):
+            return lambda: expr
+        if isinstance(expr, str):
+            return self._expressao_variavel(expr)
+        if isinstance(expr, Texto):
+            texto = expr.valor
+            return lambda: texto
+        if isinstance(expr, Binaria):
+            return self._expressao_binaria(expr)
+        if isinstance(expr, ChamadaModulo):
+            return self._expressao_chamada_modulo(expr)
+        if isinstance(expr, AcessoLista):
+            return self._expressao_acesso_lista(expr)
+        if isinstance(expr, AcessoGrupo):
+            return self._expressao_acesso_grupo(expr)
+
+        def invalida():
+            raise ValueError(f"Expressão inválida: {expr}")
+        return invalida
+
+    def _invariante(self, expr):
+        # Invariante no laço: só lê variáveis que o corpo não escreve e não chama libs
+        escritos, chama_libs, _ = self._laco
+        if isinstance(expr, (int, float)):
+            return True
+        if isinstance(expr, str):
+            return expr not in escritos
+        if isinstance(expr, Texto):
+            return True
+        if isinstance(expr, Binaria):
+            return (expr.operador in OPERADORES
+                    and self._invariante(expr.esquerda) and self._invariante(expr.direita))
+        # Acessos dependem do conteúdo da lista/grupo, que uma lib poderia alterar
+        if isinstance(expr, (AcessoLista, AcessoGrupo)) and not chama_libs:
+            return expr.nome not in escritos and self._invariante(expr.indice)
+        return False
+
+    def _expressao_invariante(self, expr):
+        celulas = self._laco[2]
+        laco = self._laco
+        self._laco = None
+        try:
+            calcular = self.compilar_expressao(expr)
+        finally:
+            self._laco = laco
+        celula = [_VAZIO]
+        celulas.append(celula)
+
+        def invariante():
+            valor = celula[0]
+            if valor is _VAZIO:
+                valor = celula[0] = calcular()
+            return valor
+        return invariante
+
+    def _expressao_variavel(self, nome):
+        g = self.interp.globais
+        i = self.slot(nome)
+        if nome in self.definidas:
+            return lambda: g[i]
+
+        def variavel():
+            # Identificadores não definidos valem o próprio nome (ex.: null)
+            v = g[i]
+            return nome if v is INDEFINIDO else v
+        return variavel
+
+    def _compilar_indice(self, indice_ast):
+        # Índices literais são resolvidos agora; os demais viram expressões
+        if isinstance(indice_ast, str) and indice_ast.isdigit():
+            indice_ast = int(indice_ast)
+        if isinstance(indice_ast, (No, str)):
+            return self.compilar_expressao(indice_ast)
+        return lambda: indice_ast
+
+    def _expressao_chamada_modulo(self, chamada):
+        g = self.interp.globais
+        nome_modulo = chamada.modulo
+        i = self.slot(nome_modulo)
+        nome_funcao = chamada.funcao
+        argumentos = tuple(self.compilar_expressao(a) for a in chamada.argumentos)
+
+        perfilador = self.interp.perfilador
+        chave = f"lib {nome_modulo}.{nome_funcao}"
+        # Módulo já resolvido -> função (já envolvida pelo perfilador), refeito se o slot mudar
+        resolvido = [None, None]
+
+        def chamada_modulo():
+            args_val = [a() for a in argumentos]
+            modulo = g[i]
+            if modulo is not resolvido[0]:
+                if modulo is INDEFINIDO:
+                    raise ValueError(f"Módulo '{nome_modulo}' não foi importado ou não está no contexto.")
+                func = getattr(modulo, nome_funcao, None)
+                if func is None:
+                    raise ValueError(f"Função '{nome_funcao}' não encontrada no módulo '{nome_modulo}'.")
+                if perfilador is not None:
+                    func = perfilador.envolver(chave, func)
+                resolvido[0], resolvido[1] = modulo, func
+            return resolvido[1](*args_val)
+        return chamada_modulo
+
+    def _expressao_acesso_lista(self, acesso):
+        g = self.interp.globais
+        nome_lista = acesso.nome
+        i = self.slot(nome_lista)
+        indice = self._compilar_indice(acesso.indice)
+
+        def acesso_lista():
+            indice_val = indice()
+            if not isinstance(indice_val, int):
+                raise ValueError(f"Índice '{indice_val}' não é inteiro para a lista '{nome_lista}'.")
+            lista = g[i]
+            if not isinstance(lista, list):
+                raise ValueError(f"'{nome_lista}' não é uma lista válida.")
+            if indice_val < 0 or indice_val >= len(lista):
+                raise IndexError(f"Índice '{indice_val}' fora do intervalo para a lista '{nome_lista}'.")
+            return lista[indice_val]
+        return acesso_lista
+
+    def _expressao_acesso_grupo(self, acesso):
+        g = self.interp.globais
+        nome_grupo = acesso.nome
+        i = self.slot(nome_grupo)
+        campo = acesso.campo
+        indice = self._compilar_indice(acesso.indice)
+        # Última coluna resolvida: o campo é fixo, então só muda se o grupo da variável mudar
+        resolvido = [None, None]
+
+        def acesso_grupo():
+            indice_val = indice()
+            if not isinstance(indice_val, int):
+                raise ValueError(f"Índice '{indice_val}' não é inteiro para o grupo '{nome_grupo}'.")
+            grupo = g[i]
+            if grupo is resolvido[0]:
+                coluna = resolvido[1]
+            else:
+                if not isinstance(grupo, Grupo):
+                    raise ValueError(f"'{nome_grupo}' não é um grupo válido.")
+                coluna = grupo.coluna(campo)
+                if coluna is not None:
+                    resolvido[0] = grupo
+                    resolvido[1] = coluna
+            if indice_val < 0 or indice_val >= grupo.tamanho:
+                raise IndexError(f"Índice '{indice_val}' fora do intervalo para o grupo '{nome_grupo}'.")
+            if coluna is None:
+                raise ValueError(f"Campo '{campo}' não encontrado no grupo '{nome_grupo}'.")
+            return coluna[indice_val]
+        return acesso_grupo
+
+    def _expressao_binaria(self, expr):
+        op = expr.operador
+        funcao_op = OPERADORES.get(op)
+        esquerda = self.compilar_expressao(expr.esquerda)
+        direita = self.compilar_expressao(expr.direita)
+        if funcao_op is None:
+            def operador_invalido():
+                esquerda()
+                direita()
+                raise ValueError(f"Operador não suportado: {op}")
+            return operador_invalido
+        # Operandos que nunca são texto (literais, comparações, nomes com tipo provado pela
+        # inferência) dispensam a conversão de "123" para 123
+        tipos = self.tipos
+        esquerda_numerica = tipo_numerico(expr.esquerda, tipos, self._tipos_expressao) is not None
+        direita_numerica = tipo_numerico(expr.direita, tipos, self._tipos_expressao) is not None
+        if esquerda_numerica and direita_numerica:
+            return self._binaria_slots(expr, funcao_op, esquerda, direita) or (lambda: funcao_op(esquerda(), direita()))
+        if direita_numerica:
+            if isinstance(expr.direita, (int, float)):
+                constante = expr.direita
+
+                def binaria_constante():
+                    left_val = esquerda()
+                    if type(left_val) is str and left_val.isdigit():
+                        left_val = int(left_val)
+                    return funcao_op(left_val, constante)
+                return binaria_constante
+
+            def binaria_direita_numerica():
+                left_val = esquerda()
+                if type(left_val) is str and left_val.isdigit():
+                    left_val = int(left_val)
+                return funcao_op(left_val, direita())
+            return binaria_direita_numerica
+        if esquerda_numerica:
+            def binaria_esquerda_numerica():
+                left_val = esquerda()
+                right_val = direita()
+                if type(right_val) is str and right_val.isdigit():
+                    right_val = int(right_val)
+                return funcao_op(left_val, right_val)
+            return binaria_esquerda_numerica
+
+        def binaria():
+            left_val = esquerda()
+            right_val = direita()
+            if type(left_val) is str and left_val.isdigit():
+                left_val = int(left_val)
+            if type(right_val) is str and right_val.isdigit():
+                right_val = int(right_val)
+            return funcao_op(left_val, right_val)
+        return binaria
+
+    def _binaria_slots(self, expr, funcao_op, esquerda, direita):
+        # Operação numérica entre variáveis e constantes: lê os slots direto, sem chamar as
+        # closures dos operandos. Um slot ainda INDEFINIDO faz a operação falhar com TypeError,
+        # e aí vale o caminho com as closures (que leem o nome); == e != não falham, então só
+        # usam leitura direta com nomes que sempre têm valor.
+        slots = []
+        for operando in (expr.esquerda, expr.direita):
+            if isinstance(operando, str):
+                if expr.operador in ("==", "!=") and operando not in self.definidas:
+                    return None
+                slots.append(self.slot(operando))
+            elif isinstance(operando, (int, float)):
+                slots.append(None)
+            else:
+                return None
+        g = self.interp.globais
+        a, b = slots
+        if a is not None and b is not None:
+            return _binaria_slots(funcao_op, g, a, b, esquerda, direita)
+        if a is not None:
+            return _binaria_slot_constante(funcao_op, g, a, expr.direita, esquerda)
+        if b is not None:
+            return _binaria_constante_slot(funcao_op, g, expr.esquerda, b, direita)
+        return None
+
+
+# Operações numéricas com leitura direta dos slots (ver Compilador._binaria_slots); ficam fora
+# do compilador para que cada closure guarde só as células de que precisa
+def _binaria_slots(funcao_op, g, a, b, esquerda, direita):
+    def binaria_slots():
+        try:
+            return funcao_op(g[a], g[b])
+        except TypeError:
+            return funcao_op(esquerda(), direita())
+    return binaria_slots
+
+
+def _binaria_slot_constante(funcao_op, g, a, constante, esquerda):
+    def binaria_slot_constante():
+        try:
+            return funcao_op(g[a], constante)
+        except TypeError:
+            return funcao_op(esquerda(), constante)
+    return binaria_slot_constante
+
+
+def _binaria_constante_slot(funcao_op, g, constante, b, direita):
+    def binaria_constante_slot():
+        try:
+            return funcao_op(constante, g[b])
+        except TypeError:
+            return funcao_op(constante, direita())
+    return binaria_constante_slot
+
+
+def _nada():
+    pass
+
+
+# Marca de célula ainda não calculada nas expressões invariantes de um laço
+_VAZIO = object()
+
+
+# Gerador de cada tipo de comando
+_GERADORES_COMANDO = {
+    Atribuir: Compilador._comando_atribuicao,
+    Escreva: Compilador._comando_escreva,
+    Pergunte: Compilador._comando_pergunte,
+    Se: Compilador._comando_se,
+    Enquanto: Compilador._comando_enquanto,
+    Para: Compilador._comando_para,
+    Repita: Compilador._comando_repita,
+    ExecutarModulo: Compilador._comando_executar_modulo,
+    EscrevaAcesso: Compilador._comando_escreva_acesso,
+    ComandoChamada: Compilador._comando_chamada,
+    Importe: Compilador._comando_interpretado,
+    ArquivoInicio: Compilador._comando_interpretado,
+    ArquivoEscreva: Compilador._comando_interpretado,
+    ArquivoLeia: Compilador._comando_interpretado,
+}
+# Conversão da resposta do pergunte pelo tipo declarado da variável
+_CONVERSOES = {"inteiro": int, "decimal": float}
+
+_METODOS_INTERPRETADOR = {
+    Importe: "interpretar_importe",
+    ArquivoInicio: "interpretar_arquivo_inicio",
+    ArquivoEscreva: "interpretar_arquivo_escreva",
+    ArquivoLeia: "interpretar_arquivo_leia",
+}
+
+
+def contem_chave(no, chave):
+    """Indica se algum nó dentro de 'no' tem a chave, por exemplo "pergunte"."""
+    if isinstance(no, No):
+        return no.chave == chave or any(contem_chave(f, chave) for f in no.filhos())
+    if isinstance(no, dict):
+        if chave in no:
+            return True
+        return any(contem_chave(v, chave) for v in no.values())
+    if isinstance(no, list):
+        return any(contem_chave(v, chave) for v in no)
+    return False
+
+
+def contem_chamada_modulo(no):
+    """Indica se há alguma chamada a módulo Python (lib) dentro do nó, direta ou por EXECUTAR MODULO."""
+    return contem_chave(no, "chamada_modulo") or contem_chave(no, "executar_modulo")
+
+
+def nomes_escritos(comandos):
+    """Retorna os nomes que um bloco pode escrever (atribuições, pergunte, PARA, importe)."""
+    nomes = set()
+    for comando in comandos or []:
+        if isinstance(comando, (Atribuir, Pergunte)):
+            nomes.add(comando.variavel)
+        elif isinstance(comando, Importe):
+            nomes.add(comando.nome)
+        elif isinstance(comando, Se):
+            nomes |= nomes_escritos(comando.bloco_se)
+            nomes |= nomes_escritos(comando.bloco_senao)
+        elif isinstance(comando, Para):
+            nomes.add(comando.variavel)
+            nomes |= nomes_escritos(comando.bloco)
+        elif isinstance(comando, (Enquanto, Repita)):
+            nomes |= nomes_escritos(comando.bloco)
+    return nomes
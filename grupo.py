@@ -0,0 +1,115 @@
+from array import array
+
+
+def coluna_tipada(valores):
+    """Guarda uma coluna em array quando todos os valores são inteiros ou todos decimais."""
+    if valores and all(type(v) is int for v in valores):
+        try:
+            return array("q", valores)
+        except OverflowError:
+            return list(valores)
+    if valores and all(type(v) is float for v in valores):
+        return array("d", valores)
+    return list(valores)
+
+
+# Classe Grupo: tabela armazenada por colunas, com mapa campo -> coluna pré-calculado
+# e índices hash opcionais por campo para buscas por valor sem varrer a tabela.
+class Grupo:
+    __slots__ = ("campos", "colunas", "tamanho", "_coluna_por_campo", "_indices")
+
+    def __init__(self, campos, colunas, tamanho):
+        self.campos = list(campos)
+        self.colunas = list(colunas)
+        self.tamanho = tamanho
+        self._coluna_por_campo = dict(zip(self.campos, self.colunas))
+        self._indices = {}
+
+    @classmethod
+    def de_linhas(cls, campos, dados):
+        """Cria o grupo a partir de registros (lista de linhas), como vêm do parser."""
+        total = len(campos)
+        # Registros incompletos são completados com None para manter as colunas alinhadas
+        linhas = [r if len(r) == total else (list(r) + [None] * total)[:total] for r in dados]
+        colunas = [coluna_tipada(list(c)) for c in zip(*linhas)] if linhas else [[] for _ in campos]
+        return cls(campos, colunas, len(linhas))
+
+    @classmethod
+    def de_colunas(cls, campos, colunas):
+        """Cria o grupo direto das colunas (listas ou arrays), sem passar por linhas."""
+        colunas = list(colunas)
+        if len(colunas) != len(campos):
+            raise ValueError("O número de colunas deve ser igual ao número de campos.")
+        tamanhos = {len(c) for c in colunas}
+        if len(tamanhos) > 1:
+            raise ValueError("Todas as colunas do grupo devem ter o mesmo tamanho.")
+        return cls(campos, colunas, tamanhos.pop() if tamanhos else 0)
+
+    @classmethod
+    def de_dict(cls, valores):
+        """Cria o grupo a partir do formato da AST: {"campos": [...], "dados": [[...], ...]}."""
+        return cls.de_linhas(valores.get("campos", []), valores.get("dados", []))
+
+    def para_dict(self):
+        """Converte de volta para o formato da AST."""
+        return {"campos": list(self.campos), "dados": [self.linha(i) for i in range(self.tamanho)]}
+
+    def __len__(self):
+        return self.tamanho
+
+    def __repr__(self):
+        return repr(self.para_dict())
+
+    def coluna(self, campo):
+        """Retorna a coluna do campo ou None se o campo não existir."""
+        return self._coluna_por_campo.get(campo)
+
+    def linha(self, indice):
+        return [coluna[indice] for coluna in self.colunas]
+
+    def valor(self, indice, campo):
+        coluna = self._coluna_por_campo.get(campo)
+        if coluna is None:
+            raise ValueError(f"Campo '{campo}' não encontrado no grupo.")
+        return coluna[indice]
+
+    # ---------------------------------------------------------
+    #  ÍNDICES
+    # ---------------------------------------------------------
+    def criar_indice(self, campo):
+        """Cria (ou recria) um índice hash valor -> linhas para o campo."""
+        coluna = self.coluna(campo)
+        if coluna is None:
+            raise ValueError(f"Campo '{campo}' não encontrado no grupo.")
+        indice = {}
+        for linha, valor in enumerate(coluna):
+            indice.setdefault(valor, []).append(linha)
+        self._indices[campo] = indice
+        return indice
+
+    def tem_indice(self, campo):
+        return campo in self._indices
+
+    def buscar(self, campo, valor):
+        """Retorna as linhas em que o campo tem o valor (usa o índice, se existir)."""
+        indice = self._indices.get(campo)
+        if indice is not None:
+            return list(indice.get(valor, ()))
+        coluna = self.coluna(campo)
+        if coluna is None:
+            raise ValueError(f"Campo '{campo}' não encontrado no grupo.")
+        return [linha for linha, v in enumerate(coluna) if v == valor]
+
+    def buscar_primeiro(self, campo, valor):
+        """Retorna a primeira linha em que o campo tem o valor, ou -1."""
+        indice = self._indices.get(campo)
+        if indice is not None:
+            linhas = indice.get(valor)
+            return linhas[0] if linhas else -1
+        coluna = self.coluna(campo)
+        if coluna is None:
+            raise ValueError(f"Campo '{campo}' não encontrado no grupo.")
+        try:
+            return coluna.index(valor)
+        except (ValueError, TypeError):
+            return -1
@@ -48,23 +48,39 @@ if ($path -notmatch [regex]::Escape($installDir)) {
 $batFilePath = Join-Path $installDir "zin.bat"
 Set-Content -Path $batFilePath -Value @"
 @echo off
+setlocal
 set ZIN_DIR=$installDir
-if "%1"=="-run" (
-    python "%ZIN_DIR%\interpretador.py" %2
-) else if "%1"=="-version" (
+set COMANDO=%1
+set ARQUIVO=%2
+rem Junta todos os argumentos depois do comando (%* ignora o shift)
+set ARGS=
+shift
+:argumentos
+if "%~1"=="" goto executar
+set ARGS=%ARGS% %1
+shift
+goto argumentos
+:executar
+if "%COMANDO%"=="-run" (
+    python "%ZIN_DIR%\interpretador.py" %ARGS%
+) else if "%COMANDO%"=="-lote" (
+    python "%ZIN_DIR%\interpretador.py" --lote %ARGS%
+) else if "%COMANDO%"=="-bench" (
+    python "%ZIN_DIR%\benchmark.py" %ARGS%
+) else if "%COMANDO%"=="-version" (
     echo Zin Interpreter v1.0
-) else if "%1"=="-create" (
-    echo INICIO PROGAMA %2. > %2
-    echo IMPLEMENTACAO PROGAMA %2. >> %2
-    echo PRINCIPAL. >> %2
-    echo FIM PRINCIPAL. >> %2
-    echo EXECUCAO PROGAMA %2. >> %2
-    echo EXECUTAR PRINCIPAL. >> %2
-    echo FIM PROGAMA %2. >> %2
-    echo Arquivo %2 criado com sucesso.
+) else if "%COMANDO%"=="-create" (
+    echo INICIO PROGAMA %ARQUIVO%. > %ARQUIVO%
+    echo IMPLEMENTACAO PROGAMA %ARQUIVO%. >> %ARQUIVO%
+    echo PRINCIPAL. >> %ARQUIVO%
+    echo FIM PRINCIPAL. >> %ARQUIVO%
+    echo EXECUCAO PROGAMA %ARQUIVO%. >> %ARQUIVO%
+    echo EXECUTAR PRINCIPAL. >> %ARQUIVO%
+    echo FIM PROGAMA %ARQUIVO%. >> %ARQUIVO%
+    echo Arquivo %ARQUIVO% criado com sucesso.
 ) else (
     echo Comando não reconhecido.
-    echo Use: zin -run [arquivo.zin], zin -version ou zin -create [arquivo.zin]
+    echo Use: zin -run [arquivo.zin], zin -lote [arquivos ou pastas], zin -bench, zin -version ou zin -create [arquivo.zin]
 )
 "@
 
@@ -38,7 +38,13 @@ ZIN_DIR="/usr/local/bin/zin"
 
 case "$1" in
     -run)
-        python3 "$ZIN_DIR/interpretador.py" "$2"
+        python3 "$ZIN_DIR/interpretador.py" "${@:2}"
+        ;;
+    -lote)
+        python3 "$ZIN_DIR/interpretador.py" --lote "${@:2}"
+        ;;
+    -bench)
+        python3 "$ZIN_DIR/benchmark.py" "${@:2}"
         ;;
     -version)
         echo "Zin Interpreter v0.0.1"
@@ -65,7 +71,9 @@ EOT
     *)
         echo "Comando não reconhecido."
         echo "Use:"
-        echo "  zin -run [arquivo.zin]    Para executar um programa."
+        echo "  zin -run [arquivo.zin] [-v|-vv]  Para executar um programa (-v mostra diagnósticos)."
+        echo "  zin -lote [arquivos|diretórios] [--processos N]  Para executar vários programas de uma vez."
+        echo "  zin -bench [cargas] [--comparar base.json]  Para medir o desempenho do interpretador."
         echo "  zin -version             Para ver a versão atual."
         echo "  zin -create [arquivo.zin] Para criar um arquivo base."
         ;;
@@ -1,403 +1,388 @@
-import json
 import os
 import sys
-import re
+import types
+import pickle
 import logging
+import argparse
+from concurrent.futures import ProcessPoolExecutor
 
-# Configurando o logging para exibir mensagens de debug e níveis superiores
-logging.basicConfig(level=logging.DEBUG, format='%(levelname)s: %(message)s')
+# Logger do módulo; a configuração (nível e handlers) fica a cargo de quem usa o Zin
+logger = logging.getLogger("zin.interpretador")
 
 # Adiciona o diretório atual no path para poder importar os módulos do lexer e parser
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from lexer_gerador import Lexer
 from parser_gerador import Parser
+from compilador import Compilador, INDEFINIDO
+from semantica import analisar
+from ast_nos import Importe
+from cache_ast import CacheAST
+from saida import Saida, DESCARGA_BUFFER
+from grupo import Grupo
+from perfilador import Perfilador, NIVEL_LINHAS, NIVEL_FUNCOES
+
+# Tamanho dos blocos usados por ARQUIVO-LEIA para copiar o arquivo para a saída
+TAMANHO_BLOCO_LEITURA = 64 * 1024
+
+
+def configurar_log(nivel=logging.WARNING):
+    """Define o nível dos diagnósticos do Zin (lexer, parser, compilador e interpretador)."""
+    logger_zin = logging.getLogger("zin")
+    logger_zin.setLevel(nivel)
+    if not logger_zin.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter('%(levelname)s: %(message)s'))
+        logger_zin.addHandler(handler)
+
+
+def nivel_por_verbosidade(verbosidade):
+    """Converte a contagem de -v da linha de comando em um nível do logging."""
+    if verbosidade <= 0:
+        return logging.WARNING
+    if verbosidade == 1:
+        return logging.INFO
+    return logging.DEBUG
 
 # Classe Interpretador que executa a AST gerada pelo parser
 class Interpretador:
-    def __init__(self, arquivo_zin):
+    def __init__(self, arquivo_zin, cache=True, saida=None, paralelo=False, perfilador=None):
         # Inicializa com o caminho do arquivo Zin, contexto (variáveis), módulos e pilha de contextos para funções
         self.arquivo_zin = arquivo_zin
-        self.contexto = {}
+        # cache pode ser True (diretório padrão), False/None (desligado) ou uma instância de CacheAST
+        self.cache = CacheAST() if cache is True else (cache or None)
+        # Saída do programa: uma instância de Saida ou um destino (arquivo, StringIO, função); padrão stdout
+        self.saida = saida if isinstance(saida, Saida) else Saida(saida)
+        # Valores das variáveis, indexados pelos slots que o compilador atribui a cada nome
+        self.globais = []
         self.modulos = {}
-        self.pilha_contexto = []
+        # Perfilador opcional; precisa existir antes da compilação, que insere as medições
+        self.perfilador = perfilador
+        self.compilador = Compilador(self)
+        # Execução paralela dos módulos do EXECUCAO: False (desligada), True (um processo
+        # por núcleo) ou o número de processos do pool
+        self.paralelo = paralelo
+        self._pool = None
+        # Tabela de símbolos da AST atual, como (ast, tabela); calculada na primeira consulta
+        self._tabela = None
+
+    @property
+    def tabela(self):
+        """Tabela de símbolos (semantica.TabelaSimbolos) da AST atual, calculada uma vez por AST."""
+        if self._tabela is None or self._tabela[0] is not self.ast:
+            self._tabela = (self.ast, analisar(self.ast))
+        return self._tabela[1]
+
+    @property
+    def contexto(self):
+        """Visão (somente leitura) das variáveis definidas, no formato nome -> valor."""
+        return {nome: self.globais[i] for nome, i in self.compilador.nomes.items()
+                if self.globais[i] is not INDEFINIDO}
+
+    def definir_variavel(self, nome, valor):
+        self.globais[self.compilador.slot(nome)] = valor
+
+    def obter_variavel(self, nome, padrao=None):
+        valor = self.globais[self.compilador.slot(nome)]
+        return padrao if valor is INDEFINIDO else valor
 
     def processar_arquivo(self):
-        """Gera (se necessário) a AST em JSON e carrega para self.ast."""
+        """Carrega a AST do cache (ou gera, se necessário) em self.ast."""
         if not os.path.exists(self.arquivo_zin):
-            logging.error("Arquivo {} não encontrado.".format(self.arquivo_zin))
+            logger.error("Arquivo %s não encontrado.", self.arquivo_zin)
             raise FileNotFoundError(f"Arquivo {self.arquivo_zin} não encontrado.")
-        nome_programa = os.path.splitext(os.path.basename(self.arquivo_zin))[0]
-        arquivo_json = f"{nome_programa}.json"
-        if not os.path.exists(arquivo_json):
-            logging.info("Gerando AST...")
-            with open(self.arquivo_zin, "r", encoding="utf-8") as arquivo:
-                codigo = arquivo.read()
+        with open(self.arquivo_zin, "rb") as arquivo:
+            codigo = arquivo.read()
+        self.carregar_codigo(codigo)
+
+    def carregar_codigo(self, codigo):
+        """Gera (ou busca no cache) a AST do código-fonte em bytes e guarda em self.ast."""
+        ast = self.cache.carregar(codigo) if self.cache else None
+        if ast is None:
+            logger.info("Gerando AST...")
             lexer = Lexer()
             lexer.build()
-            tokens = lexer.tokenize(codigo)
-            parser = Parser(tokens)
+            # Normaliza as quebras de linha como a leitura em modo texto fazia
+            texto = codigo.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n")
+            # O parser consome os tokens conforme o lexer os produz
+            parser = Parser(lexer.gerar_tokens(texto))
             ast = parser.parse()
-            with open(arquivo_json, "w", encoding="utf-8") as arquivo_json_out:
-                json.dump(ast, arquivo_json_out, indent=4, ensure_ascii=False)
-            logging.info(f"AST salva no arquivo: {arquivo_json}")
-        with open(arquivo_json, "r", encoding="utf-8") as arquivo_json_in:
-            self.ast = json.load(arquivo_json_in)
+            if self.cache:
+                caminho = self.cache.salvar(codigo, ast)
+                logger.info("AST salva no cache: %s", caminho)
+        self.ast = ast
+
+    def reiniciar(self):
+        """Descarta os valores de todas as variáveis, mantendo o código já compilado."""
+        # Alterado no lugar: as closures compiladas guardam a referência desta lista
+        self.globais[:] = [INDEFINIDO] * len(self.globais)
 
     def executar(self):
         """Ponto de entrada da execução do programa."""
         if "programa" not in self.ast:
-            logging.error("AST inválida: não tem chave 'programa'.")
+            logger.error("AST inválida: não tem chave 'programa'.")
             raise ValueError("AST inválida: não tem chave 'programa'.")
         programa = self.ast["programa"]
-        logging.info(f"Executando programa: {programa['nome']}")
+        logger.info("Executando programa: %s", programa["nome"])
         for var_info in programa["variaveis"]:
-            var_nome = var_info["nome"]
-            var_tipo = var_info["tipo"]
+            var_nome = var_info.nome
+            var_tipo = var_info.tipo
             if var_tipo == "lista":
                 lista_python = []
-                for item in var_info.get("valores", []):
+                for item in var_info.valores or []:
                     if isinstance(item, str) and item.isdigit():
                         lista_python.append(int(item))
                     else:
                         lista_python.append(item)
-                self.contexto[var_nome] = lista_python
+                self.definir_variavel(var_nome, lista_python)
             elif var_tipo == "grupo":
-                self.contexto[var_nome] = var_info.get("valores", {})
+                self.definir_variavel(var_nome, Grupo.de_dict(var_info.valores or {}))
             else:
-                self.contexto[var_nome] = None
+                self.definir_variavel(var_nome, None)
+            self.compilador.marcar_definida(var_nome)
         implementacao = programa.get("implementacao", {})
         self.modulos = implementacao.get("modulos", {})
         if "importes" in programa:
             for imp_item in programa["importes"]:
                 self.interpretar_importe(imp_item)
-        if "execucao" in programa:
-            for modulo in programa["execucao"]["modulos"]:
-                if modulo.lower() == "principal":
-                    principal = implementacao["principal"]
-                    self.executar_principal(principal)
-                elif modulo in self.modulos:
-                    self.executar_modulo(modulo)
-                else:
-                    logging.error(f"Módulo '{modulo}' não encontrado na AST.")
+                self.compilador.marcar_definida(imp_item.nome)
+        # Compila os blocos antes de executar para que a execução não dependa da AST; o que o
+        # compilador precisa saber de cada corpo (nomes escritos, chamadas a libs) vem da tabela
+        self.compilador.tabela = self.tabela
+        principal = self.compilador.compilar_bloco(implementacao.get("principal", []))
+        if self.perfilador is not None:
+            principal = self.perfilador.envolver("PRINCIPAL", principal)
+        for nome_modulo, funcoes in self.modulos.items():
+            self.compilador.compilar_modulo(funcoes, nome_modulo)
+        try:
+            if "execucao" in programa:
+                for lote in self._lotes_execucao(programa["execucao"]["modulos"]):
+                    if len(lote) > 1:
+                        self._executar_lote(lote)
+                        continue
+                    modulo = lote[0]
+                    if modulo.lower() == "principal":
+                        principal()
+                    elif modulo in self.modulos:
+                        self.executar_modulo(modulo)
+                    else:
+                        logger.error("Módulo '%s' não encontrado na AST.", modulo)
+        finally:
+            # Garante que a saída bufferizada chegue ao destino mesmo em caso de erro
+            self.saida.descarregar()
+            if self._pool is not None:
+                self._pool.shutdown(cancel_futures=True)
+                self._pool = None
+
+    # ---------------------------------------------------------
+    #  EXECUÇÃO PARALELA DOS MÓDULOS
+    # ---------------------------------------------------------
+    def _lotes_execucao(self, modulos):
+        """Agrupa a lista do EXECUCAO: módulos consecutivos formam um lote no modo paralelo."""
+        lote = []
+        for modulo in modulos:
+            if self.paralelo and modulo.lower() != "principal" and modulo in self.modulos:
+                lote.append(modulo)
+                continue
+            if lote:
+                yield lote
+                lote = []
+            yield [modulo]
+        if lote:
+            yield lote
+
+    def _motivo_serial(self, lote):
+        """Retorna por que o lote não pode rodar em paralelo, ou None se pode."""
+        # As escritas das funções são desfeitas no retorno, então os módulos não deixam
+        # variáveis uns para os outros; o que pode ser compartilhado são os arquivos
+        tabela = self.tabela
+        for nome_modulo in lote:
+            for alcancado in tabela.alcance(nome_modulo):
+                resumo = tabela.modulos[alcancado]
+                if resumo.pergunte:
+                    return f"o módulo '{alcancado}' usa pergunte"
+                if resumo.arquivos:
+                    return f"o módulo '{alcancado}' usa arquivos"
+        return None
+
+    def _estado_para_processo(self):
+        """Cópia serializável das variáveis; libs importadas viajam só pelo nome."""
+        valores, importes = {}, []
+        for nome, i in self.compilador.nomes.items():
+            valor = self.globais[i]
+            if valor is INDEFINIDO:
+                continue
+            if isinstance(valor, types.ModuleType):
+                importes.append(nome)
+            else:
+                valores[nome] = valor
+        return {"valores": valores, "importes": importes, "definidas": sorted(self.compilador.definidas)}
+
+    def _restaurar_estado(self, estado):
+        for nome in estado["importes"]:
+            self.interpretar_importe(Importe(nome))
+        for nome, valor in estado["valores"].items():
+            self.definir_variavel(nome, valor)
+        for nome in estado["definidas"]:
+            self.compilador.marcar_definida(nome)
+
+    def _executar_lote(self, lote):
+        """Executa módulos independentes no pool; a saída segue a ordem do EXECUCAO."""
+        motivo = self._motivo_serial(lote)
+        estado = None
+        if motivo is None:
+            try:
+                estado = pickle.dumps(self._estado_para_processo(), protocol=pickle.HIGHEST_PROTOCOL)
+            except Exception as e:
+                motivo = f"estado não pode ser copiado para outro processo ({e})"
+        if motivo is not None:
+            logger.info("Módulos %s executados em série: %s.", ", ".join(lote), motivo)
+            for nome_modulo in lote:
+                self.executar_modulo(nome_modulo)
+            return
+        if self._pool is None:
+            processos = None if self.paralelo is True else self.paralelo
+            # Os módulos vão para cada processo uma vez; a cada módulo só seguem o estado e o nome
+            self._pool = ProcessPoolExecutor(max_workers=processos, initializer=_iniciar_processo,
+                                             initargs=(self.arquivo_zin, self.modulos))
+        logger.info("Executando em paralelo: %s", ", ".join(lote))
+        futuros = [self._pool.submit(_executar_modulo_isolado, estado, nome)
+                   for nome in lote]
+        # Cada módulo escreve em um buffer próprio; os buffers entram na saída na ordem do lote
+        for futuro in futuros:
+            self.saida.escrever_bruto(futuro.result())
 
     def executar_principal(self, comandos):
         """Executa os comandos de um bloco (por exemplo, o bloco principal)."""
-        for comando in comandos:
-            if "atribuir" in comando:
-                self.interpretar_atribuicao(comando)
-            elif "escreva" in comando:
-                self.interpretar_escreva(comando)
-            elif "pergunte" in comando:
-                self.interpretar_pergunte(comando)
-            elif comando.get("tipo") == "SE":
-                self.interpretar_se(comando)
-            elif comando.get("tipo") == "ENQUANTO":
-                self.interpretar_enquanto(comando)
-            elif comando.get("tipo") == "PARA":
-                self.interpretar_para(comando)
-            elif comando.get("tipo") == "REPITA":
-                self.interpretar_repita(comando)
-            elif "executar_modulo" in comando:
-                self.executar_modulo(comando["executar_modulo"])
-            elif "acesso_lista" in comando:
-                valor = self.avaliar_expressao(comando)
-                logging.info(valor)
-            elif "acesso_grupo" in comando:
-                valor = self.avaliar_expressao(comando)
-                logging.info(valor)
-            elif "importe" in comando:
-                self.interpretar_importe(comando)
-            elif "arquivo_inicio" in comando:
-                self.interpretar_arquivo_inicio(comando)
-            elif "arquivo_escreva" in comando:
-                self.interpretar_arquivo_escreva(comando)
-            elif "arquivo_leia" in comando:
-                self.interpretar_arquivo_leia(comando)
-
-    def interpretar_para(self, comando):
-        var_name = comando["var"]
-        start_ast = comando["start"]
-        end_ast = comando["end"]
-        step_ast = comando["step"]
-        bloco = comando["bloco"]
-        start_val = self.avaliar_expressao(start_ast)
-        end_val = self.avaliar_expressao(end_ast)
-        step_val = self.avaliar_expressao(step_ast) if step_ast else 1
-        self.contexto[var_name] = start_val
-        if step_val > 0:
-            while self.contexto[var_name] <= end_val:
-                self.executar_principal(bloco)
-                self.contexto[var_name] += step_val
-        else:
-            while self.contexto[var_name] >= end_val:
-                self.executar_principal(bloco)
-                self.contexto[var_name] += step_val
-
-    def interpretar_repita(self, comando):
-        bloco = comando["bloco"]
-        condicao_ast = comando["condicao"]
-        while True:
-            self.executar_principal(bloco)
-            valor_condicao = self.avaliar_condicao(condicao_ast)
-            if valor_condicao:
-                break
-
-    def interpretar_atribuicao(self, comando):
-        var_nome = comando["atribuir"]["variavel"]
-        expr_ast = comando["atribuir"]["valor"]
-        valor_calculado = self.avaliar_expressao(expr_ast)
-        self.contexto[var_nome] = valor_calculado
-
-    def interpretar_escreva(self, comando):
-        texto = comando["escreva"]
-        for variavel, valor in self.contexto.items():
-            if valor is None:
-                valor = "null"
-            texto = texto.replace(f"{{{variavel}}}", str(valor))
-        padrao = r"\{([^{}]+)\}"
-        matches = re.findall(padrao, texto)
-        for m in matches:
-            if "." in m or "[" in m:
-                valor_dinamico = self.avaliar_placeholder_dinamico(m)
-                placeholder_str = f"{{{m}}}"
-                texto = texto.replace(placeholder_str, str(valor_dinamico))
-            else:
-                placeholder_str = f"{{{m}}}"
-                texto = texto.replace(placeholder_str, str(self.contexto.get(m, "null")))
-        logging.info(texto)
+        self.compilador.compilar_bloco(comandos)()
 
     # NOVOS COMANDOS DE ARQUIVO
     def interpretar_arquivo_inicio(self, comando):
-        info = comando["arquivo_inicio"]
-        nome = info["nome"].strip('"')
-        extensao = info["extensao"].strip('"')
+        nome = comando.nome.strip('"')
+        extensao = comando.extensao.strip('"')
         full_filename = nome + extensao
         try:
             with open(full_filename, "w", encoding="utf-8") as f:
                 pass
-            logging.info(f"Arquivo '{full_filename}' criado com sucesso.")
+            logger.info("Arquivo '%s' criado com sucesso.", full_filename)
         except Exception as e:
-            logging.error(f"Erro ao criar o arquivo '{full_filename}': {e}")
+            logger.error("Erro ao criar o arquivo '%s': %s", full_filename, e)
             raise
 
     def interpretar_arquivo_escreva(self, comando):
-        info = comando["arquivo_escreva"]
-        conteudo = info["conteudo"].strip('"')
-        nome = info["nome"].strip('"')
+        conteudo = comando.conteudo.strip('"')
+        nome = comando.nome.strip('"')
         try:
             with open(nome, "w", encoding="utf-8") as f:
                 f.write(conteudo)
-            logging.info(f"Conteúdo escrito no arquivo '{nome}'.")
+            logger.info("Conteúdo escrito no arquivo '%s'.", nome)
         except Exception as e:
-            logging.error(f"Erro ao escrever no arquivo '{nome}': {e}")
+            logger.error("Erro ao escrever no arquivo '%s': %s", nome, e)
             raise
 
     def interpretar_arquivo_leia(self, comando):
-        info = comando["arquivo_leia"]
-        nome = info["nome"].strip('"')
+        nome = comando.nome.strip('"')
+        escrever = self.saida.escrever_bruto
         try:
+            # Copia em blocos para a saída, sem carregar o arquivo inteiro na memória
             with open(nome, "r", encoding="utf-8") as f:
-                conteudo = f.read()
-            logging.info(f"Conteúdo do arquivo '{nome}':\n{conteudo}")
+                for bloco in iter(lambda: f.read(TAMANHO_BLOCO_LEITURA), ""):
+                    escrever(bloco)
+            escrever("\n")
+            logger.info("Conteúdo do arquivo '%s' enviado para a saída.", nome)
         except Exception as e:
-            logging.error(f"Erro ao ler o arquivo '{nome}': {e}")
+            logger.error("Erro ao ler o arquivo '%s': %s", nome, e)
             raise
 
-    def avaliar_placeholder_dinamico(self, expressao_str):
-        if "." in expressao_str:
-            parte_lista, campo = expressao_str.split(".", 1)
-            nome_lista, indice_str = self.extrair_lista(parte_lista)
-            indice_ast = self._build_ast_for_index(indice_str)
-            ast_grupo = {"acesso_grupo": {"nome": nome_lista, "indice": indice_ast, "campo": campo}}
-            return self.avaliar_expressao(ast_grupo)
-        else:
-            nome_lista, indice_str = self.extrair_lista(expressao_str)
-            indice_ast = self._build_ast_for_index(indice_str)
-            ast_lista = {"acesso_lista": {"nome": nome_lista, "indice": indice_ast}}
-            return self.avaliar_expressao(ast_lista)
-
-    def _build_ast_for_index(self, indice_str):
-        if indice_str.isdigit():
-            return int(indice_str)
-        else:
-            return indice_str
-
-    def extrair_lista(self, texto):
-        if "[" not in texto or "]" not in texto:
-            return (texto, "0")
-        nome, resto = texto.split("[", 1)
-        indice_str = resto.split("]", 1)[0]
-        return (nome, indice_str)
-
-    def interpretar_pergunte(self, comando):
-        texto = comando["pergunte"]["texto"]
-        variavel = comando["pergunte"]["variavel"]
-        resposta = input(f"{texto} ")
-        if variavel in self.contexto:
-            if isinstance(self.contexto[variavel], int):
-                try:
-                    self.contexto[variavel] = int(resposta)
-                except ValueError:
-                    self.contexto[variavel] = resposta
-            else:
-                self.contexto[variavel] = resposta
-
-    def interpretar_se(self, comando):
-        condicao = comando["condicao"]
-        bloco_se = comando["bloco_se"]
-        bloco_senao = comando.get("bloco_senao", [])
-        resultado = self.avaliar_condicao(condicao)
-        if resultado:
-            self.executar_principal(bloco_se)
-        else:
-            self.executar_principal(bloco_senao)
-
-    def avaliar_condicao(self, condicao_ast):
-        val = self.avaliar_expressao(condicao_ast)
-        return bool(val)
-
-    def interpretar_enquanto(self, comando):
-        condicao = comando["condicao"]
-        bloco = comando["bloco"]
-        while True:
-            teste = self.avaliar_condicao(condicao)
-            if not teste:
-                break
-            self.executar_principal(bloco)
-
     def interpretar_importe(self, comando):
-        nome_modulo = comando["importe"]
+        nome_modulo = comando.nome
         try:
             modulo = __import__(f"libs.{nome_modulo}", fromlist=["*"])
-            self.contexto[nome_modulo] = modulo
-            logging.info(f"Módulo '{nome_modulo}' importado com sucesso.")
+            self.definir_variavel(nome_modulo, modulo)
+            logger.info("Módulo '%s' importado com sucesso.", nome_modulo)
         except ImportError:
-            logging.error(f"Erro ao importar o módulo '{nome_modulo}'. Verifique se existe em 'libs'.")
+            logger.error("Erro ao importar o módulo '%s'. Verifique se existe em 'libs'.", nome_modulo)
             raise ImportError(f"Erro ao importar o módulo '{nome_modulo}'. Verifique se existe em 'libs'.")
 
     def executar_modulo(self, nome_modulo):
         if nome_modulo not in self.modulos:
             raise ValueError(f"Módulo '{nome_modulo}' não encontrado na AST.")
-        funcoes = self.modulos[nome_modulo]
-        for func in funcoes:
-            self.executar_funcao(func)
+        self.compilador.compilar_modulo(self.modulos[nome_modulo], nome_modulo)()
 
     def executar_funcao(self, funcao):
-        nome_funcao = funcao["nome"]
-        parametros = funcao["parametros"]
-        corpo = funcao["corpo"]
-        retorno_ast = funcao["retorno"]
-        contexto_local = dict(self.contexto)
-        self.pilha_contexto.append(self.contexto)
-        self.contexto = contexto_local
-        for p in parametros:
-            if p not in self.contexto:
-                self.contexto[p] = None
-        logging.info(f"Executando função: {nome_funcao}")
-        self.executar_principal(corpo)
-        resultado = self.avaliar_expressao(retorno_ast)
-        self.contexto = self.pilha_contexto.pop()
-        return resultado
+        return self.compilador.compilar_funcao(funcao)()
 
     def avaliar_expressao(self, expr):
-        if isinstance(expr, (int, float)):
-            return expr
-        if isinstance(expr, str):
-            return self.contexto.get(expr, expr)
-        if isinstance(expr, dict):
-            if "chamada_modulo" in expr:
-                return self.executar_chamada_modulo(expr["chamada_modulo"])
-            if "acesso_lista" in expr:
-                return self.avaliar_acesso_lista(expr["acesso_lista"])
-            if "acesso_grupo" in expr:
-                return self.avaliar_acesso_grupo(expr["acesso_grupo"])
-            if "left" in expr and "operator" in expr and "right" in expr:
-                left_val = self.avaliar_expressao(expr["left"])
-                right_val = self.avaliar_expressao(expr["right"])
-                op = expr["operator"]
-                if isinstance(left_val, str) and left_val.isdigit():
-                    left_val = int(left_val)
-                if isinstance(right_val, str) and right_val.isdigit():
-                    right_val = int(right_val)
-                if op == "+":  return left_val + right_val
-                if op == "-":  return left_val - right_val
-                if op == "*":  return left_val * right_val
-                if op == "/":  return left_val // right_val
-                if op == "==": return left_val == right_val
-                if op == "!=": return left_val != right_val
-                if op == ">":  return left_val > right_val
-                if op == "<":  return left_val < right_val
-                if op == ">=": return left_val >= right_val
-                if op == "<=": return left_val <= right_val
-                raise ValueError(f"Operador não suportado: {op}")
-        raise ValueError(f"Expressão inválida: {expr}")
-
-    def executar_chamada_modulo(self, info):
-        nome_modulo = info["modulo"]
-        nome_funcao = info["funcao"]
-        args_ast = info["argumentos"]
-        args_val = [self.avaliar_expressao(a) for a in args_ast]
-        if nome_modulo not in self.contexto:
-            raise ValueError(f"Módulo '{nome_modulo}' não foi importado ou não está no contexto.")
-        modulo_obj = self.contexto[nome_modulo]
-        if not hasattr(modulo_obj, nome_funcao):
-            raise ValueError(f"Função '{nome_funcao}' não encontrada no módulo '{nome_modulo}'.")
-        func = getattr(modulo_obj, nome_funcao)
-        resultado = func(*args_val)
-        return resultado
-
-    def avaliar_acesso_lista(self, acesso):
-        nome_lista = acesso["nome"]
-        indice_ast = acesso["indice"]
-        if isinstance(indice_ast, dict):
-            indice_val = self.avaliar_expressao(indice_ast)
-        elif isinstance(indice_ast, str) and indice_ast.isdigit():
-            indice_val = int(indice_ast)
-        elif isinstance(indice_ast, str):
-            indice_val = self.avaliar_expressao(indice_ast)
-        else:
-            indice_val = indice_ast
-        if not isinstance(indice_val, int):
-            raise ValueError(f"Índice '{indice_val}' não é inteiro para a lista '{nome_lista}'.")
-        if nome_lista not in self.contexto or not isinstance(self.contexto[nome_lista], list):
-            raise ValueError(f"'{nome_lista}' não é uma lista válida.")
-        lista = self.contexto[nome_lista]
-        if indice_val < 0 or indice_val >= len(lista):
-            raise IndexError(f"Índice '{indice_val}' fora do intervalo para a lista '{nome_lista}'.")
-        return lista[indice_val]
-
-    def avaliar_acesso_grupo(self, acesso):
-        nome_grupo = acesso["nome"]
-        indice_ast = acesso["indice"]
-        campo = acesso["campo"]
-        if isinstance(indice_ast, dict):
-            indice_val = self.avaliar_expressao(indice_ast)
-        elif isinstance(indice_ast, str) and indice_ast.isdigit():
-            indice_val = int(indice_ast)
-        elif isinstance(indice_ast, str):
-            indice_val = self.avaliar_expressao(indice_ast)
-        else:
-            indice_val = indice_ast
-        if not isinstance(indice_val, int):
-            raise ValueError(f"Índice '{indice_val}' não é inteiro para o grupo '{nome_grupo}'.")
-        if nome_grupo not in self.contexto or not isinstance(self.contexto[nome_grupo], dict):
-            raise ValueError(f"'{nome_grupo}' não é um grupo válido.")
-        grupo = self.contexto[nome_grupo]
-        campos = grupo.get("campos", [])
-        dados = grupo.get("dados", [])
-        if indice_val < 0 or indice_val >= len(dados):
-            raise IndexError(f"Índice '{indice_val}' fora do intervalo para o grupo '{nome_grupo}'.")
-        if campo not in campos:
-            raise ValueError(f"Campo '{campo}' não encontrado no grupo '{nome_grupo}'.")
-        campo_index = campos.index(campo)
-        return dados[indice_val][campo_index]
+        return self.compilador.compilar_expressao(expr)()
 
-if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        logging.error("Uso: python interpretador.py <arquivo_zin>")
-        sys.exit(1)
-    arquivo_zin = sys.argv[1]
-    interpretador = Interpretador(arquivo_zin)
+_programa_processo = None
+
+
+def _iniciar_processo(arquivo_zin, modulos):
+    global _programa_processo
+    _programa_processo = (arquivo_zin, modulos)
+
+
+def _executar_modulo_isolado(estado, nome_modulo):
+    """Roda um módulo em um processo do pool, sobre uma cópia do estado, e devolve a saída."""
+    arquivo_zin, modulos = _programa_processo
+    partes = []
+    interpretador = Interpretador(arquivo_zin, cache=False, saida=Saida(partes.append, descarga=DESCARGA_BUFFER))
+    interpretador.modulos = modulos
+    interpretador._restaurar_estado(pickle.loads(estado))
+    interpretador.executar_modulo(nome_modulo)
+    interpretador.saida.descarregar()
+    return "".join(partes)
+
+
+def main(argv=None):
+    parser_args = argparse.ArgumentParser(prog="zin", description="Interpretador da linguagem Zin.")
+    parser_args.add_argument("arquivo_zin", nargs="*",
+                             help="arquivo .zin a executar (no modo --lote: arquivos, diretórios ou padrões glob)")
+    parser_args.add_argument("-v", "--verbose", action="count", default=0,
+                             help="mostra diagnósticos (-v: info, -vv: debug)")
+    parser_args.add_argument("-p", "--paralelo", action="store_true",
+                             help="executa módulos independentes do EXECUCAO em paralelo")
+    parser_args.add_argument("--lote", action="store_true",
+                             help="executa vários arquivos no mesmo processo e mostra o tempo de cada um")
+    parser_args.add_argument("--processos", type=int, metavar="N",
+                             help="número de processos do modo paralelo ou do lote")
+    parser_args.add_argument("--servidor", action="store_true",
+                             help="atende pedidos JSON (um por linha) na entrada padrão ou em --socket")
+    parser_args.add_argument("--socket", metavar="CAMINHO", help="socket Unix do modo --servidor")
+    parser_args.add_argument("--perfil", action="store_true",
+                             help="mede tempo e chamadas por linha, função, módulo e lib (tabela na saída de erro)")
+    parser_args.add_argument("--perfil-nivel", choices=(NIVEL_LINHAS, NIVEL_FUNCOES), default=NIVEL_LINHAS,
+                             help="detalhe do perfil: linhas (padrão) ou só funções/módulos/libs, com menor custo")
+    parser_args.add_argument("--perfil-pilhas", metavar="ARQUIVO",
+                             help="grava o perfil no formato collapsed stack (flamegraph)")
+    args = parser_args.parse_args(argv)
+    configurar_log(nivel_por_verbosidade(args.verbose))
+    if args.servidor:
+        from servidor import main_servidor
+        return main_servidor(args.socket)
+    if not args.arquivo_zin:
+        parser_args.error("informe o arquivo .zin a executar")
+    if args.lote:
+        from lote import main_lote
+        return main_lote(args.arquivo_zin, processos=args.processos or 1)
+    if len(args.arquivo_zin) > 1:
+        parser_args.error("para executar vários arquivos use --lote")
+    paralelo = args.processos if args.paralelo and args.processos else args.paralelo
+    perfilador = None
+    if args.perfil or args.perfil_pilhas:
+        perfilador = Perfilador(args.perfil_nivel)
+    interpretador = Interpretador(args.arquivo_zin[0], paralelo=paralelo, perfilador=perfilador)
     interpretador.processar_arquivo()
-    interpretador.executar()
+    try:
+        interpretador.executar()
+    finally:
+        if perfilador is not None:
+            if args.perfil:
+                print(perfilador.tabela(), file=sys.stderr)
+            if args.perfil_pilhas:
+                perfilador.salvar_pilhas(args.perfil_pilhas)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,12 @@
 import ply.lex as lex
+import importlib.util
 import logging
+import os
 
-# Configurando o logging para exibir mensagens de debug e superiores
-logging.basicConfig(level=logging.DEBUG, format='%(levelname)s: %(message)s')
+from cache_ast import diretorio_cache_padrao, versao_gramatica
+
+# Logger do módulo; a configuração (nível e handlers) fica a cargo de quem usa o Zin
+logger = logging.getLogger("zin.lexer")
 
 # Definindo a classe Lexer que será responsável por transformar o código fonte em tokens
 class Lexer:
@@ -56,25 +60,10 @@ class Lexer:
             # Simplesmente pulamos o comentário (não retornamos token nenhum)
             pass
 
-        # Regra para identificar identificadores (nomes, variáveis, funções, etc.)
-        def t_IDENTIFIER(self, t):
-            r'[a-zA-Z_][a-zA-Z_0-9]*'
-            # Se o valor do identificador estiver na lista de keywords, trocamos o tipo para KEYWORD
-            if t.value in self.keywords:
-                t.type = 'KEYWORD'
-            # Se estiver na lista de tipos, definimos como TYPE
-            elif t.value in self.types:
-                t.type = 'TYPE'
-            return t
+        # Os comandos ARQUIVO-* precisam vir antes de t_IDENTIFIER: o PLY testa as regras
+        # em forma de função na ordem em que são definidas.
 
-        # Regra para tratar quebras de linha e atualizar o número da linha no lexer
-        def t_newline(self, t):
-            r'\n+'
-            # Incrementamos o contador de linhas conforme a quantidade de quebras encontradas
-            t.lexer.lineno += len(t.value)
-
-
-            # Regra para identificar o comando ARQUIVO-INICIO
+        # Regra para identificar o comando ARQUIVO-INICIO
         def t_ARQUIVO_INICIO(self, t):
             r'ARQUIVO\-INICIO'
             # Loga o reconhecimento deste token (opcional)
@@ -91,24 +80,84 @@ class Lexer:
             r'ARQUIVO\-LEIA'
             return t
 
+        # Regra para identificar identificadores (nomes, variáveis, funções, etc.)
+        def t_IDENTIFIER(self, t):
+            r'[a-zA-Z_][a-zA-Z_0-9]*'
+            # Se o valor do identificador estiver na lista de keywords, trocamos o tipo para KEYWORD
+            if t.value in self.keywords:
+                t.type = 'KEYWORD'
+            # Se estiver na lista de tipos, definimos como TYPE
+            elif t.value in self.types:
+                t.type = 'TYPE'
+            return t
+
+        # Regra para tratar quebras de linha e atualizar o número da linha no lexer
+        def t_newline(self, t):
+            r'\n+'
+            # Incrementamos o contador de linhas conforme a quantidade de quebras encontradas
+            t.lexer.lineno += len(t.value)
+
 
         # Regra para lidar com erros léxicos (caracteres não reconhecidos)
         def t_error(self, t):
             # Montamos uma mensagem de erro com detalhes do token inválido
             error_message = f"Token inválido '{t.value[0]}' na linha {t.lineno}, posição {t.lexpos}."
             # Logamos o erro
-            logging.error(error_message)
+            logger.error(error_message)
             # Levantamos uma exceção para sinalizar o erro
             raise SyntaxError(error_message)
             # Esta linha não será executada, mas serve para indicar que o token inválido seria pulado
             t.lexer.skip(1)
 
+        # Lexer PLY já construído, compartilhado por todas as instâncias do processo
+        _lexer_base = None
+
         # Método para construir o lexer utilizando o módulo ply.lex
         def build(self, **kwargs):
-            # Aqui usamos a função lex.lex para construir o lexer a partir do nosso módulo
-            self.lexer = lex.lex(module=self, **kwargs)
+            if kwargs:
+                # Opções específicas (debug, reflags...) constroem um lexer exclusivo, como antes
+                self.lexer = lex.lex(module=self, **kwargs)
+            else:
+                # Caso comum: a construção acontece uma vez e cada instância recebe um clone
+                if Lexer._lexer_base is None:
+                    Lexer._lexer_base = self._construir_base()
+                self.lexer = Lexer._lexer_base.clone()
             # Logamos que o lexer foi construído com sucesso
-            logging.info("Lexer built com sucesso.")
+            logger.debug("Lexer built com sucesso.")
+
+        def _construir_base(self):
+            # Em modo optimize o PLY lê as tabelas (lextab) geradas em uma execução anterior,
+            # guardadas no diretório de cache e versionadas junto com a gramática
+            pasta = os.path.join(diretorio_cache_padrao(), "lextab")
+            nome_tabela = f"zin_lextab_{versao_gramatica()}"
+            caminho = os.path.join(pasta, nome_tabela + ".py")
+            if os.path.exists(caminho):
+                try:
+                    spec = importlib.util.spec_from_file_location(nome_tabela, caminho)
+                    tabela = importlib.util.module_from_spec(spec)
+                    spec.loader.exec_module(tabela)
+                    return lex.lex(module=self, optimize=1, lextab=tabela)
+                except Exception as e:
+                    # Tabela incompleta ou corrompida: reconstrói e grava de novo
+                    logger.warning("Tabela do lexer inválida em '%s', reconstruindo: %s", caminho, e)
+                    try:
+                        os.unlink(caminho)
+                    except OSError:
+                        pass
+            try:
+                os.makedirs(pasta, exist_ok=True)
+            except OSError as e:
+                logger.warning("Não foi possível criar o diretório '%s': %s", pasta, e)
+                return lex.lex(module=self)
+            return lex.lex(module=self, optimize=1, lextab=nome_tabela, outputdir=pasta)
+
+        # Método para gerar os tokens sob demanda, sem materializar a lista inteira.
+        # Erros léxicos aparecem como SyntaxError no momento em que o token é pedido.
+        # linha_inicial permite tokenizar um trecho do arquivo com as linhas corretas.
+        def gerar_tokens(self, data, linha_inicial=1):
+            self.lexer.lineno = linha_inicial
+            self.lexer.input(data)
+            return iter(self.lexer.token, None)
 
         # Método para tokenizar um código fonte (transformar o código em uma lista de tokens)
         def tokenize(self, data):
@@ -118,14 +167,15 @@ class Lexer:
                 # Coleta todos os tokens gerados e os armazena em uma lista
                 tokens_list = list(iter(self.lexer.token, None))
                 # Loga quantos tokens foram gerados
-                logging.info(f"Tokenização concluída. Número de tokens: {len(tokens_list)}")
+                logger.info("Tokenização concluída. Número de tokens: %d", len(tokens_list))
                 return tokens_list
             except SyntaxError as e:
                 # Caso ocorra um erro de sintaxe, logamos o erro e retornamos uma lista vazia
-                logging.error(f"Erro durante a tokenização: {e}")
+                logger.error("Erro durante a tokenização: %s", e)
                 return []
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.DEBUG, format='%(levelname)s: %(message)s')
     # Código de teste corrigido
     code = """
     INICIO PROGAMA TESTE_ERRO.
@@ -14,3 +14,86 @@ def escrever_arquivo(caminho, conteudo):
         return f"Arquivo '{caminho}' salvo com sucesso."
     except Exception as e:
         return f"Erro ao escrever no arquivo: {str(e)}"
+
+
+# ---------------------------------------------------------
+#  ARQUIVOS ABERTOS (HANDLES)
+# ---------------------------------------------------------
+# Abrir uma vez e ler/escrever linha a linha mantém o uso de memória constante,
+# mesmo para arquivos muito grandes, e não reabre o arquivo a cada escrita.
+
+TAMANHO_BUFFER = 1024 * 1024
+
+_MODOS = {
+    "r": "r", "leitura": "r",
+    "w": "w", "escrita": "w",
+    "a": "a", "anexar": "a",
+}
+
+
+class ArquivoZin:
+    __slots__ = ("caminho", "modo", "_arquivo", "_proxima")
+
+    def __init__(self, caminho, modo):
+        self.caminho = caminho
+        self.modo = modo
+        self._arquivo = open(caminho, modo, encoding="utf-8", buffering=TAMANHO_BUFFER)
+        # Linha lida antecipadamente por fim(), entregue na próxima ler_linha()
+        self._proxima = None
+
+    def __repr__(self):
+        estado = "fechado" if self._arquivo.closed else self.modo
+        return f"<arquivo '{self.caminho}' ({estado})>"
+
+    def ler_linha(self):
+        if self._proxima is not None:
+            linha, self._proxima = self._proxima, None
+        else:
+            linha = self._arquivo.readline()
+        if not linha:
+            return None
+        return linha[:-1] if linha.endswith("\n") else linha
+
+    def fim(self):
+        if self._proxima is None:
+            self._proxima = self._arquivo.readline()
+        return not self._proxima
+
+    def escrever(self, texto):
+        self._arquivo.write(texto)
+
+    def fechar(self):
+        self._arquivo.close()
+
+
+def _handle(arquivo):
+    if not isinstance(arquivo, ArquivoZin):
+        raise ValueError("O argumento deve ser um arquivo aberto com zin_file.abrir.")
+    return arquivo
+
+def abrir(caminho, modo="r"):
+    """Abre um arquivo e retorna o handle. Modos: "r" (leitura), "w" (escrita) ou "a" (anexar)."""
+    modo_python = _MODOS.get(modo)
+    if modo_python is None:
+        raise ValueError(f"Modo de abertura inválido: {modo}")
+    return ArquivoZin(caminho, modo_python)
+
+def ler_linha(arquivo):
+    """Lê a próxima linha (sem a quebra de linha) ou retorna null no fim do arquivo."""
+    return _handle(arquivo).ler_linha()
+
+def fim(arquivo):
+    """Retorna 1 se não há mais linhas para ler, 0 caso contrário."""
+    return 1 if _handle(arquivo).fim() else 0
+
+def escrever(arquivo, texto):
+    """Escreve o texto no arquivo, sem quebra de linha (a gravação é bufferizada)."""
+    _handle(arquivo).escrever(str(texto))
+
+def escrever_linha(arquivo, texto):
+    """Escreve o texto seguido de quebra de linha."""
+    _handle(arquivo).escrever(f"{texto}\n")
+
+def fechar(arquivo):
+    """Grava o que estiver pendente e fecha o arquivo."""
+    _handle(arquivo).fechar()
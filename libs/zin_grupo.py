@@ -0,0 +1,191 @@
+import csv
+import json
+from array import array
+from itertools import islice
+from operator import itemgetter
+
+from grupo import Grupo, coluna_tipada
+
+# Quantidade de registros lidos por vez pelos carregadores de arquivo
+TAMANHO_LOTE = 10000
+
+
+def _grupo(grupo):
+    if not isinstance(grupo, Grupo):
+        raise ValueError("O primeiro argumento deve ser uma variável do tipo grupo.")
+    return grupo
+
+def indexar(grupo, campo):
+    """Cria um índice hash no campo; buscas por valor nesse campo deixam de varrer o grupo."""
+    return len(_grupo(grupo).criar_indice(campo))
+
+def buscar(grupo, campo, valor):
+    """Retorna a primeira linha do grupo em que 'campo' vale 'valor', ou -1."""
+    return _grupo(grupo).buscar_primeiro(campo, valor)
+
+def buscar_todos(grupo, campo, valor):
+    """Retorna a lista de linhas do grupo em que 'campo' vale 'valor'."""
+    return _grupo(grupo).buscar(campo, valor)
+
+def tamanho(grupo):
+    """Retorna o número de linhas do grupo."""
+    return len(_grupo(grupo))
+
+
+# ---------------------------------------------------------
+#  CARGA DE ARQUIVOS
+# ---------------------------------------------------------
+# Os carregadores leem o arquivo em lotes e vão acrescentando cada lote direto nas
+# colunas do grupo; a tabela não passa pelo lexer/parser nem vira uma lista de linhas.
+
+def _booleano(valor):
+    if isinstance(valor, str):
+        return 1 if valor.strip().lower() in ("1", "true", "verdadeiro", "sim") else 0
+    return 1 if valor else 0
+
+_CONVERSORES = {"inteiro": int, "decimal": float, "texto": str, "booleano": _booleano}
+_TIPO_ARRAY = {"inteiro": "q", "decimal": "d", "booleano": "q"}
+
+
+def _nomes(valor):
+    # Aceita uma lista Zin ou um texto separado por vírgulas; vazio significa "todos"
+    if not valor:
+        return None
+    if isinstance(valor, str):
+        return [parte.strip() for parte in valor.split(",")]
+    return [str(v) for v in valor]
+
+
+def _inferir(valores):
+    """Tipa uma coluna de texto pelas células preenchidas: inteiro se todas forem inteiras,
+    decimal se forem números. Células vazias viram null."""
+    vazias = "" in valores
+    if vazias:
+        valores = [None if valor == "" else valor for valor in valores]
+    for funcao in (int, float):
+        try:
+            if vazias:
+                return coluna_tipada([None if valor is None else funcao(valor) for valor in valores])
+            return coluna_tipada(list(map(funcao, valores)))
+        except (ValueError, TypeError):
+            pass
+    return list(valores)
+
+
+class _Colunas:
+    """Acumula os lotes lidos em colunas já tipadas."""
+
+    def __init__(self, campos, tipos):
+        if tipos and len(tipos) != len(campos):
+            raise ValueError("Informe um tipo para cada campo selecionado.")
+        self.campos = campos
+        self.tipos = tipos or [None] * len(campos)
+        for tipo in self.tipos:
+            if tipo is not None and tipo not in _CONVERSORES:
+                raise ValueError(f"Tipo inválido: {tipo}")
+        self.colunas = [array(_TIPO_ARRAY[t]) if t in _TIPO_ARRAY else [] for t in self.tipos]
+
+    def _converter(self, k, valores):
+        tipo = self.tipos[k]
+        funcao = _CONVERSORES[tipo]
+        # Célula vazia ou campo ausente é null em qualquer tipo: str(None) e _booleano("")
+        # não falham, então o lote só vai direto para o conversor se não tiver nenhum
+        if None not in valores and "" not in valores:
+            try:
+                return list(map(funcao, valores))
+            except (ValueError, TypeError):
+                pass
+        # Caminho lento só para lotes com células vazias ou valores inválidos
+        convertidos = []
+        for valor in valores:
+            if valor is None or valor == "":
+                convertidos.append(None)
+                continue
+            try:
+                convertidos.append(funcao(valor))
+            except (ValueError, TypeError):
+                raise ValueError(f"Valor '{valor}' inválido para o tipo {tipo} no campo '{self.campos[k]}'.")
+        return convertidos
+
+    def adicionar(self, colunas_lote):
+        for k, valores in enumerate(colunas_lote):
+            if self.tipos[k] is not None:
+                valores = self._converter(k, valores)
+            coluna = self.colunas[k]
+            if isinstance(coluna, array) and None in valores:
+                # Célula vazia em coluna numérica: a coluna passa a aceitar null
+                coluna = self.colunas[k] = list(coluna)
+            coluna.extend(valores)
+
+    def grupo(self, inferir):
+        colunas = [
+            (_inferir(c) if inferir else coluna_tipada(c)) if tipo is None else c
+            for c, tipo in zip(self.colunas, self.tipos)
+        ]
+        return Grupo.de_colunas(self.campos, colunas)
+
+
+def _carregar(linhas, campos, tipos, inferir):
+    # linhas: iterador de registros já reduzidos aos campos selecionados, na ordem de 'campos'
+    colunas = _Colunas(campos, tipos)
+    while True:
+        lote = list(islice(linhas, TAMANHO_LOTE))
+        if not lote:
+            break
+        colunas.adicionar(list(zip(*lote)))
+    return colunas.grupo(inferir)
+
+
+def carregar_csv(caminho, campos="", tipos="", separador=","):
+    """Carrega um CSV com cabeçalho em um grupo.
+
+    'campos' escolhe as colunas (texto separado por vírgulas ou lista; vazio = todas) e
+    'tipos' define o tipo de cada uma (inteiro, decimal, texto, booleano). Colunas sem
+    tipo declarado viram inteiro ou decimal quando todos os valores preenchidos forem
+    numéricos; células vazias ficam null.
+    """
+    campos, tipos = _nomes(campos), _nomes(tipos)
+    with open(caminho, "r", encoding="utf-8", newline="") as arquivo:
+        leitor = csv.reader(arquivo, delimiter=separador)
+        cabecalho = next(leitor, [])
+        campos = campos or cabecalho
+        if not campos:
+            return Grupo.de_colunas([], [])
+        posicoes = []
+        for campo in campos:
+            if campo not in cabecalho:
+                raise ValueError(f"Campo '{campo}' não encontrado no cabeçalho de '{caminho}'.")
+            posicoes.append(cabecalho.index(campo))
+        largura = max(posicoes) + 1
+        selecionar = itemgetter(*posicoes) if len(posicoes) > 1 else (lambda r, i=posicoes[0]: (r[i],))
+
+        def registros():
+            for registro in leitor:
+                if not registro:
+                    continue
+                if len(registro) < largura:
+                    registro = registro + [""] * (largura - len(registro))
+                yield selecionar(registro)
+
+        return _carregar(registros(), campos, tipos, inferir=True)
+
+
+def carregar_jsonl(caminho, campos="", tipos=""):
+    """Carrega um arquivo JSON Lines (um objeto por linha) em um grupo.
+
+    Sem 'campos', usa as chaves do primeiro objeto. Campos ausentes em um objeto ficam null.
+    """
+    campos, tipos = _nomes(campos), _nomes(tipos)
+    with open(caminho, "r", encoding="utf-8") as arquivo:
+        objetos = (json.loads(linha) for linha in arquivo if linha.strip())
+        primeiro = next(objetos, None)
+        if primeiro is None:
+            return Grupo.de_colunas(campos or [], [[] for _ in campos or []])
+        campos = campos or list(primeiro)
+
+        def registros():
+            yield tuple(primeiro.get(c) for c in campos)
+            for objeto in objetos:
+                yield tuple(objeto.get(c) for c in campos)
+
+        return _carregar(registros(), campos, tipos, inferir=False)
@@ -0,0 +1,99 @@
+import operator
+from itertools import compress, repeat
+
+# Operações em massa sobre listas. Os laços acontecem dentro de funções nativas do
+# Python (map, sum, sorted...), sem passar pelo interpretador elemento a elemento.
+
+_ARITMETICOS = {
+    "+": operator.add,
+    "-": operator.sub,
+    "*": operator.mul,
+    "/": operator.floordiv,  # mesma divisão inteira do operador "/" de Zin
+}
+
+_COMPARACOES = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    ">": operator.gt,
+    "<": operator.lt,
+    ">=": operator.ge,
+    "<=": operator.le,
+}
+
+
+def _lista(valor):
+    if not isinstance(valor, list):
+        raise ValueError("O argumento deve ser uma variável do tipo lista.")
+    return valor
+
+def _operador(tabela, simbolo):
+    funcao = tabela.get(simbolo)
+    if funcao is None:
+        raise ValueError(f"Operador não suportado: {simbolo}")
+    return funcao
+
+def _aplicar(funcao, lista, valor):
+    # Lista com lista opera elemento a elemento; lista com escalar repete o escalar
+    lista = _lista(lista)
+    if isinstance(valor, list):
+        if len(valor) != len(lista):
+            raise ValueError("As listas devem ter o mesmo tamanho.")
+        return list(map(funcao, lista, valor))
+    return list(map(funcao, lista, repeat(valor, len(lista))))
+
+def tamanho(lista):
+    """Retorna o número de elementos da lista."""
+    return len(_lista(lista))
+
+def soma(lista):
+    """Retorna a soma dos elementos."""
+    return sum(_lista(lista))
+
+def minimo(lista):
+    """Retorna o menor elemento."""
+    return min(_lista(lista))
+
+def maximo(lista):
+    """Retorna o maior elemento."""
+    return max(_lista(lista))
+
+def media(lista):
+    """Retorna a média dos elementos."""
+    lista = _lista(lista)
+    if not lista:
+        raise ValueError("Não é possível calcular a média de uma lista vazia.")
+    return sum(lista) / len(lista)
+
+def ordenar(lista, decrescente=0):
+    """Retorna uma nova lista ordenada (decrescente=1 inverte a ordem)."""
+    return sorted(_lista(lista), reverse=bool(decrescente))
+
+def fatia(lista, inicio, fim):
+    """Retorna os elementos de 'inicio' até 'fim' (exclusivo)."""
+    return _lista(lista)[inicio:fim]
+
+def mapear(lista, operador, valor):
+    """Aplica 'operador' (+, -, *, /) entre cada elemento e 'valor' (escalar ou lista)."""
+    return _aplicar(_operador(_ARITMETICOS, operador), lista, valor)
+
+def filtrar(lista, operador, valor):
+    """Mantém os elementos para os quais 'elemento operador valor' é verdadeiro."""
+    lista = _lista(lista)
+    funcao = _operador(_COMPARACOES, operador)
+    return list(compress(lista, map(funcao, lista, repeat(valor, len(lista)))))
+
+def somar(lista, valor):
+    """Soma elemento a elemento com um escalar ou outra lista."""
+    return _aplicar(operator.add, lista, valor)
+
+def subtrair(lista, valor):
+    """Subtrai elemento a elemento um escalar ou outra lista."""
+    return _aplicar(operator.sub, lista, valor)
+
+def multiplicar(lista, valor):
+    """Multiplica elemento a elemento por um escalar ou outra lista."""
+    return _aplicar(operator.mul, lista, valor)
+
+def dividir(lista, valor):
+    """Divide (divisão inteira) elemento a elemento por um escalar ou outra lista."""
+    return _aplicar(operator.floordiv, lista, valor)
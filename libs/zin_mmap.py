@@ -0,0 +1,103 @@
+import mmap
+from array import array
+from bisect import bisect_right
+
+# Acesso somente leitura a arquivos grandes via mmap: o sistema operacional carrega
+# as páginas sob demanda e o conteúdo nunca é copiado inteiro para uma string Python.
+# Linhas e registros são numerados a partir de 0, como as listas de Zin.
+
+
+class MapaZin:
+    __slots__ = ("caminho", "_arquivo", "_mapa", "_inicios")
+
+    def __init__(self, caminho):
+        self.caminho = caminho
+        self._arquivo = open(caminho, "rb")
+        try:
+            self._mapa = mmap.mmap(self._arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Arquivo vazio não pode ser mapeado
+            self._mapa = b""
+        # Posição inicial de cada linha, calculada só quando alguém pede uma linha
+        self._inicios = None
+
+    def __repr__(self):
+        return f"<mapa '{self.caminho}' ({len(self._mapa)} bytes)>"
+
+    def inicios(self):
+        if self._inicios is None:
+            mapa = self._mapa
+            total = len(mapa)
+            inicios = array("q")
+            posicao = 0
+            while posicao < total:
+                inicios.append(posicao)
+                fim = mapa.find(b"\n", posicao)
+                if fim < 0:
+                    break
+                posicao = fim + 1
+            self._inicios = inicios
+        return self._inicios
+
+    def linha(self, indice):
+        inicios = self.inicios()
+        if indice < 0 or indice >= len(inicios):
+            raise IndexError(f"Linha {indice} fora do arquivo '{self.caminho}'.")
+        inicio = inicios[indice]
+        fim = inicios[indice + 1] if indice + 1 < len(inicios) else len(self._mapa)
+        return self._mapa[inicio:fim].rstrip(b"\r\n").decode("utf-8")
+
+    def linha_da_posicao(self, posicao):
+        return bisect_right(self.inicios(), posicao) - 1
+
+    def fechar(self):
+        if isinstance(self._mapa, mmap.mmap):
+            self._mapa.close()
+        self._arquivo.close()
+
+
+def _mapa(valor):
+    if not isinstance(valor, MapaZin):
+        raise ValueError("O argumento deve ser um arquivo mapeado com zin_mmap.mapear.")
+    return valor
+
+def mapear(caminho):
+    """Mapeia o arquivo na memória (somente leitura) e retorna o mapa."""
+    return MapaZin(caminho)
+
+def tamanho(mapa):
+    """Retorna o tamanho do arquivo em bytes."""
+    return len(_mapa(mapa)._mapa)
+
+def contar_linhas(mapa):
+    """Retorna o número de linhas do arquivo."""
+    return len(_mapa(mapa).inicios())
+
+def linha(mapa, indice):
+    """Retorna a linha 'indice' (sem a quebra de linha)."""
+    return _mapa(mapa).linha(indice)
+
+def registro(mapa, indice, tamanho_registro):
+    """Retorna o registro 'indice' de um arquivo de registros de tamanho fixo (em bytes)."""
+    dados = _mapa(mapa)._mapa
+    inicio = indice * tamanho_registro
+    if indice < 0 or inicio >= len(dados):
+        raise IndexError(f"Registro {indice} fora do arquivo '{mapa.caminho}'.")
+    return dados[inicio:inicio + tamanho_registro].decode("utf-8")
+
+def buscar(mapa, texto, inicio=0):
+    """Retorna a posição (em bytes) da próxima ocorrência do texto, ou -1."""
+    return _mapa(mapa)._mapa.find(str(texto).encode("utf-8"), inicio)
+
+def buscar_linha(mapa, texto, linha_inicial=0):
+    """Retorna o número da primeira linha a partir de 'linha_inicial' que contém o texto, ou -1."""
+    mapa = _mapa(mapa)
+    inicios = mapa.inicios()
+    if linha_inicial >= len(inicios):
+        return -1
+    posicao = mapa._mapa.find(str(texto).encode("utf-8"), inicios[max(linha_inicial, 0)])
+    return -1 if posicao < 0 else mapa.linha_da_posicao(posicao)
+
+def fechar(mapa):
+    """Libera o mapeamento e fecha o arquivo."""
+    _mapa(mapa).fechar()
@@ -2,6 +2,7 @@ import sys
 import json
 from lexer_gerador import Lexer
 from parser_gerador import Parser
+from semantica import analisar
 
 
 class Linter:
@@ -9,6 +10,8 @@ class Linter:
         self.file_path = file_path
         self.tokens = []
         self.ast = None
+        # Tabela de símbolos da análise semântica (semantica.TabelaSimbolos)
+        self.tabela = None
         self.errors = []
 
     def lint(self):
@@ -66,61 +69,12 @@ class Linter:
 
     def _semantic_analysis(self):
         """
-        Realiza verificações semânticas no AST.
+        Realiza as verificações semânticas no AST, em uma única passada (ver semantica.py).
         """
-        declared_variables = set()
-        variable_types = {}
-
-        def check_declarations(node):
-            if isinstance(node, dict):
-                if "atribuir" in node:
-                    var_name = node["atribuir"]["variavel"]
-                    value = node["atribuir"]["valor"]
-
-                    if var_name not in declared_variables:
-                        self.errors.append(f"Erro Semântico: Variável '{var_name}' usada antes de ser declarada.")
-
-                    if isinstance(value, dict) and "chamada_modulo" in value:
-                       
-                        pass
-                    elif isinstance(value, int):
-                        variable_types[var_name] = "inteiro"
-                    elif isinstance(value, str):
-                        variable_types[var_name] = "texto"
-
-                if "variaveis" in node:
-                    for var in node["variaveis"]:
-                        declared_variables.add(var["nome"])
-                        variable_types[var["nome"]] = var["tipo"]
-
-            elif isinstance(node, list):
-                for subnode in node:
-                    check_declarations(subnode)
-
-        check_declarations(self.ast["programa"])
-
-        def check_types(node):
-            if isinstance(node, dict):
-                if "atribuir" in node:
-                    var_name = node["atribuir"]["variavel"]
-                    value = node["atribuir"]["valor"]
-
-                    if var_name in variable_types:
-                        expected_type = variable_types[var_name]
-                        if isinstance(value, int) and expected_type != "inteiro":
-                            self.errors.append(
-                                f"Erro Semântico: Tipo incompatível para '{var_name}'. Esperado: {expected_type}, encontrado: inteiro."
-                            )
-                        elif isinstance(value, str) and expected_type != "texto":
-                            self.errors.append(
-                                f"Erro Semântico: Tipo incompatível para '{var_name}'. Esperado: {expected_type}, encontrado: texto."
-                            )
-
-            elif isinstance(node, list):
-                for subnode in node:
-                    check_types(subnode)
-
-        check_types(self.ast["programa"])
+        self.tabela = analisar(self.ast)
+        for linha, mensagem in self.tabela.erros:
+            sufixo = f" (linha {linha})" if linha is not None else ""
+            self.errors.append(f"Erro Semântico: {mensagem}{sufixo}")
 
     def report(self):
         """
@@ -137,8 +91,13 @@ class Linter:
 if __name__ == "__main__":
     if len(sys.argv) < 2:
         print("Uso: python linter.py <arquivo.zin>")
+        print("     python linter.py --servidor   (lint incremental para editores, JSON por linha)")
         sys.exit(1)
 
+    if sys.argv[1] == "--servidor":
+        from linter_incremental import main_servidor_lint
+        sys.exit(main_servidor_lint())
+
     file_path = sys.argv[1]
     if not file_path.endswith(".zin"):
         print("Erro: O arquivo deve ter a extensão .zin.")
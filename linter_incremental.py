@@ -0,0 +1,410 @@
+import re
+import sys
+import json
+import time
+import logging
+
+from lexer_gerador import Lexer
+from parser_gerador import Parser
+from ast_nos import percorrer, Comando, Funcao
+from semantica import AnalisadorSemantico
+
+logger = logging.getLogger("zin.linter")
+
+# Um programa Zin é dividido em blocos de nível superior, cada um começando em uma linha
+# com a palavra-chave correspondente. Cada bloco é tokenizado e analisado sozinho, com as
+# linhas do arquivo; uma edição só reanalisa os blocos que ela toca, e os demais apenas
+# têm as linhas deslocadas.
+_ABERTURAS = {"INICIO": "inicio", "IMPLEMENTACAO": "implementacao", "MODULO": "modulo", "EXECUCAO": "execucao"}
+_PRIMEIRA_PALAVRA = re.compile(r"\s*([A-Z]+)\b")
+
+# Ordem dos blocos no programa (módulos podem se repetir)
+_ORDEM = {"inicio": 0, "implementacao": 1, "modulo": 2, "execucao": 3}
+
+
+def _tipo_abertura(linha):
+    encontrado = _PRIMEIRA_PALAVRA.match(linha)
+    return _ABERTURAS.get(encontrado.group(1)) if encontrado else None
+
+
+def segmentar(linhas, inicio=0, fim=None):
+    """Divide linhas[inicio:fim] em blocos; retorna [(tipo, primeira linha, linha após a última)]."""
+    fim = len(linhas) if fim is None else fim
+    blocos = []
+    tipo, comeco = None, inicio
+    for i in range(inicio, fim):
+        novo = _tipo_abertura(linhas[i])
+        if novo is None:
+            continue
+        if i > comeco:
+            blocos.append((tipo, comeco, i))
+        tipo, comeco = novo, i
+    if fim > comeco or not blocos:
+        blocos.append((tipo, comeco, fim))
+    # Linhas antes da primeira abertura (comentários, linhas vazias) ficam com o bloco seguinte
+    if len(blocos) > 1 and blocos[0][0] is None:
+        _, primeira, _ = blocos.pop(0)
+        tipo, _, fim_bloco = blocos[0]
+        blocos[0] = (tipo, primeira, fim_bloco)
+    return blocos
+
+
+class Bloco:
+    """Trecho de nível superior do programa, com o resultado da última análise."""
+    __slots__ = ("tipo", "inicio", "fim", "texto", "nome_programa", "resultado", "diagnosticos", "pendente",
+                 "semantica")
+
+    def __init__(self, tipo, inicio, fim, texto):
+        self.tipo = tipo
+        self.inicio = inicio  # índice (0) da primeira linha
+        self.fim = fim        # índice da linha seguinte à última
+        self.texto = texto
+        self.nome_programa = None
+        self.resultado = None
+        self.diagnosticos = []
+        # Deslocamento ainda não aplicado às linhas dos nós (ver aplicar_deslocamento)
+        self.pendente = 0
+        # Última análise semântica: (contexto, erros, chamadas a libs, importes), ver _semantica
+        self.semantica = None
+
+    def deslocar(self, delta):
+        """Move o bloco delta linhas sem reanalisar; as linhas dos nós são ajustadas depois."""
+        if not delta:
+            return
+        self.inicio += delta
+        self.fim += delta
+        if self.diagnosticos:
+            # As mensagens citam a linha dos tokens: blocos com erro são analisados de novo
+            self.diagnosticos = []
+            self.resultado = None
+            self.pendente = 0
+            self.semantica = None
+            return
+        self.pendente += delta
+        if self.semantica is not None:
+            contexto, erros, chamadas, importados = self.semantica
+            self.semantica = (contexto, [(linha + delta, mensagem) for linha, mensagem in erros],
+                              [(modulo, linha and linha + delta) for modulo, linha in chamadas], importados)
+
+    def aplicar_deslocamento(self):
+        """Ajusta a linha dos nós do bloco; feito só quando a AST é pedida."""
+        if not self.pendente:
+            return
+        for no in percorrer(self.resultado):
+            if isinstance(no, (Comando, Funcao)) and no.linha is not None:
+                no.linha += self.pendente
+        self.pendente = 0
+
+
+# Classe LinterIncremental: mantém a análise de um arquivo entre edições
+class LinterIncremental:
+    def __init__(self, caminho="<editor>", texto=""):
+        self.caminho = caminho
+        self.linhas = []
+        self.blocos = []
+        self._ast = None
+        # Declarações, importes e módulos da última análise semântica (ver _semantica)
+        self._contexto = None
+        self.diagnosticos = []
+        # Quantos blocos a última atualização precisou tokenizar e analisar de novo
+        self.reanalisados = 0
+        self.atualizar(texto)
+
+    @property
+    def ast(self):
+        """AST do programa montada com os blocos válidos, com as linhas atualizadas."""
+        for bloco in self.blocos:
+            bloco.aplicar_deslocamento()
+        return self._ast
+
+    # ---------------------------------------------------------
+    #  ENTRADA DE TEXTO
+    # ---------------------------------------------------------
+    def atualizar(self, texto):
+        """Troca o texto inteiro; blocos com o mesmo conteúdo de antes são reaproveitados."""
+        anteriores = {}
+        for bloco in self.blocos:
+            anteriores.setdefault((bloco.tipo, bloco.texto), []).append(bloco)
+        self.linhas = texto.split("\n")
+        self.blocos = self._criar_blocos(segmentar(self.linhas), anteriores)
+        return self._concluir()
+
+    def editar(self, linha, remover, texto):
+        """Substitui 'remover' linhas a partir de 'linha' (1 = primeira) pelas linhas de 'texto'."""
+        inicio = max(0, min(linha - 1, len(self.linhas)))
+        fim = min(inicio + max(remover, 0), len(self.linhas))
+        novas = texto.split("\n") if texto else []
+        self.linhas[inicio:fim] = novas
+        delta = len(novas) - (fim - inicio)
+        # Blocos tocados pela edição: do que contém a primeira linha alterada até o que contém a última
+        # (uma inserção logo após um bloco também o toca: pode estendê-lo)
+        primeiro = next((i for i, b in enumerate(self.blocos) if b.fim >= inicio), len(self.blocos) - 1)
+        ultimo = next((i for i, b in enumerate(self.blocos) if b.fim > fim), len(self.blocos) - 1)
+        primeiro = max(0, min(primeiro, ultimo))
+        # Se a edição apagou a linha de abertura, o início da região passa a pertencer ao bloco anterior
+        while primeiro > 0 and _tipo_abertura(self.linhas[self.blocos[primeiro].inicio]) is None:
+            primeiro -= 1
+        while True:
+            afetados = self.blocos[primeiro:ultimo + 1]
+            regiao_inicio = afetados[0].inicio if afetados else 0
+            regiao_fim = (afetados[-1].fim if afetados else 0) + delta
+            segmentos = segmentar(self.linhas, regiao_inicio, regiao_fim)
+            # Linhas sem abertura no começo do arquivo ficam com o bloco seguinte, que entra na região
+            if segmentos[0][0] is None and len(segmentos) == 1 and ultimo + 1 < len(self.blocos):
+                ultimo += 1
+                continue
+            break
+        anteriores = {}
+        for bloco in afetados:
+            anteriores.setdefault((bloco.tipo, bloco.texto), []).append(bloco)
+        novos = self._criar_blocos(segmentos, anteriores)
+        for bloco in self.blocos[ultimo + 1:]:
+            bloco.deslocar(delta)
+        self.blocos[primeiro:ultimo + 1] = novos
+        return self._concluir()
+
+    def _criar_blocos(self, segmentos, anteriores):
+        blocos = []
+        for tipo, comeco, final in segmentos:
+            texto = "\n".join(self.linhas[comeco:final])
+            reaproveitaveis = anteriores.get((tipo, texto))
+            if reaproveitaveis:
+                bloco = reaproveitaveis.pop(0)
+                bloco.deslocar(comeco - bloco.inicio)
+            else:
+                bloco = Bloco(tipo, comeco, final, texto)
+            blocos.append(bloco)
+        return blocos
+
+    # ---------------------------------------------------------
+    #  ANÁLISE
+    # ---------------------------------------------------------
+    def _analisar(self, bloco, nome_programa):
+        bloco.nome_programa = nome_programa
+        bloco.resultado = None
+        bloco.diagnosticos = []
+        bloco.pendente = 0
+        bloco.semantica = None
+        lexer = Lexer()
+        lexer.build()
+        try:
+            tokens = list(lexer.gerar_tokens(bloco.texto, linha_inicial=bloco.inicio + 1))
+        except SyntaxError as e:
+            bloco.diagnosticos.append((lexer.lexer.lineno, f"Erro Léxico: {e}"))
+            return
+        parser = Parser(tokens)
+        programa = parser.ast["programa"]
+        programa["nome"] = nome_programa
+        try:
+            parser.advance()
+            if bloco.tipo == "implementacao":
+                parser.parse_principal()
+                bloco.resultado = programa["implementacao"]
+            elif bloco.tipo == "modulo":
+                parser.parse_modulo()
+                bloco.resultado = programa["implementacao"]["modulos"]
+            elif bloco.tipo == "execucao":
+                # O que vem depois da lista de EXECUTAR (FIM PROGAMA) é ignorado, como no parser
+                parser.parse_execucao()
+                bloco.resultado = programa["execucao"]["modulos"]
+            else:
+                parser.parse_inicio()
+                bloco.resultado = programa
+            if bloco.tipo != "execucao" and parser.current_token is not None:
+                raise SyntaxError(f"Token inesperado: {parser.current_token}")
+        except SyntaxError as e:
+            bloco.resultado = None
+            token = parser.current_token
+            linha = token.lineno if token is not None else bloco.fim
+            bloco.diagnosticos.append((linha, f"Erro Sintático: {e}"))
+
+    def _concluir(self):
+        inicio = time.perf_counter()
+        self.reanalisados = 0
+        nome_programa = None
+        for bloco in self.blocos:
+            if bloco.tipo in (None, "inicio"):
+                if bloco.resultado is None and not bloco.diagnosticos:
+                    self._analisar(bloco, None)
+                    self.reanalisados += 1
+                if bloco.resultado is not None:
+                    nome_programa = bloco.resultado["nome"]
+                break
+        for bloco in self.blocos:
+            if bloco.tipo in (None, "inicio"):
+                continue
+            # IMPLEMENTACAO e EXECUCAO conferem o nome do programa: se ele mudou, reanalisa
+            precisa_nome = bloco.tipo in ("implementacao", "execucao")
+            if ((bloco.resultado is None and not bloco.diagnosticos)
+                    or (precisa_nome and bloco.nome_programa != nome_programa)):
+                self._analisar(bloco, nome_programa)
+                self.reanalisados += 1
+        self._ast = self._montar_ast(nome_programa)
+        self.diagnosticos = self._diagnosticos()
+        logger.debug("Lint incremental de %s: %d blocos reanalisados em %.2f ms", self.caminho,
+                     self.reanalisados, (time.perf_counter() - inicio) * 1000)
+        return self.diagnosticos
+
+    def _montar_ast(self, nome_programa):
+        programa = {"nome": nome_programa, "variaveis": [], "implementacao": {}, "execucao": {"modulos": []}}
+        implementacao = programa["implementacao"]
+        for bloco in self.blocos:
+            resultado = bloco.resultado
+            if resultado is None:
+                continue
+            if bloco.tipo in (None, "inicio"):
+                programa["variaveis"] = resultado["variaveis"]
+                if "importes" in resultado:
+                    programa["importes"] = resultado["importes"]
+            elif bloco.tipo == "implementacao":
+                implementacao["principal"] = resultado["principal"]
+                implementacao["execucoes_apos_principal"] = resultado["execucoes_apos_principal"]
+            elif bloco.tipo == "modulo":
+                implementacao.setdefault("modulos", {}).update(resultado)
+            elif bloco.tipo == "execucao":
+                programa["execucao"]["modulos"] = resultado
+        return {"programa": programa}
+
+    def _diagnosticos(self):
+        diagnosticos = []
+        for bloco in self.blocos:
+            diagnosticos.extend(bloco.diagnosticos)
+        # Ordem dos blocos: INICIO, IMPLEMENTACAO, MODULO..., EXECUCAO
+        anterior = -1
+        presentes = set()
+        for bloco in self.blocos:
+            tipo = bloco.tipo or "inicio"
+            presentes.add(tipo)
+            ordem = _ORDEM[tipo]
+            if ordem < anterior or (ordem == anterior and tipo != "modulo"):
+                diagnosticos.append((bloco.inicio + 1, f"Erro Sintático: Bloco {tipo.upper()} fora de ordem."))
+            anterior = max(anterior, ordem)
+        for tipo in ("implementacao", "execucao"):
+            if tipo not in presentes:
+                diagnosticos.append((len(self.linhas), f"Erro Sintático: Bloco {tipo.upper()} ausente."))
+        if not diagnosticos:
+            diagnosticos.extend(self._semantica())
+        return [{"linha": linha, "mensagem": mensagem} for linha, mensagem in diagnosticos]
+
+    def _semantica(self):
+        """Análise semântica bloco a bloco; só refaz os blocos novos, ou todos se o contexto mudou."""
+        # O contexto é o que um bloco enxerga dos outros: declarações, importes e nomes dos módulos
+        cabecalho = next((b.resultado for b in self.blocos if b.tipo in (None, "inicio")), None) or {}
+        variaveis = cabecalho.get("variaveis", [])
+        importes = cabecalho.get("importes", [])
+        nomes_modulos = [nome for b in self.blocos if b.tipo == "modulo" for nome in b.resultado]
+        contexto = (tuple((v.nome, v.tipo) for v in variaveis), tuple(i.nome for i in importes),
+                    tuple(nomes_modulos))
+        if contexto != self._contexto:
+            self._contexto = contexto
+        contexto = self._contexto
+        erros, final = [], AnalisadorSemantico()
+        for bloco in self.blocos:
+            if bloco.semantica is None or bloco.semantica[0] is not contexto:
+                bloco.semantica = (contexto, *self._analisar_semantica(bloco, variaveis, importes, nomes_modulos))
+            _, erros_bloco, chamadas, importados = bloco.semantica
+            erros.extend(erros_bloco)
+            final.chamadas_libs.extend(chamadas)
+            final.importados |= importados
+        # Uma lib pode ser importada em um bloco e usada em outro: a conferência é feita no fim
+        final.concluir()
+        erros.extend((linha, f"Erro Semântico: {mensagem}") for linha, mensagem in final.tabela.erros)
+        return erros
+
+    def _analisar_semantica(self, bloco, variaveis, importes, nomes_modulos):
+        # As mensagens citam a linha dos nós, então o deslocamento pendente é aplicado antes
+        bloco.aplicar_deslocamento()
+        analisador = AnalisadorSemantico()
+        analisador.preparar(variaveis, importes, nomes_modulos)
+        if bloco.tipo not in (None, "inicio"):
+            # Declarações repetidas são erro do bloco INICIO, não dos demais
+            analisador.tabela.erros.clear()
+        if bloco.tipo == "implementacao":
+            analisador.visitar_principal(bloco.resultado)
+        elif bloco.tipo == "modulo":
+            for nome, funcoes in bloco.resultado.items():
+                analisador.visitar_modulo(nome, funcoes)
+        elif bloco.tipo == "execucao":
+            analisador.visitar_execucao(bloco.resultado)
+        erros = [(linha or bloco.inicio + 1, f"Erro Semântico: {mensagem}")
+                 for linha, mensagem in analisador.tabela.erros]
+        return erros, analisador.chamadas_libs, analisador.importados
+
+
+# ---------------------------------------------------------
+#  SERVIDOR DE LINT
+# ---------------------------------------------------------
+# Protocolo: uma mensagem JSON por linha, como no servidor de execução (servidor.py).
+#
+#   {"id": 1, "comando": "abrir", "arquivo": "prog.zin"}                  (lê do disco)
+#   {"id": 2, "comando": "abrir", "arquivo": "prog.zin", "texto": "..."}  (texto do editor)
+#   {"id": 3, "comando": "editar", "arquivo": "prog.zin", "linha": 10, "remover": 1, "texto": "..."}
+#   {"id": 4, "comando": "fechar", "arquivo": "prog.zin"}
+#   {"id": 5, "comando": "encerrar"}
+#
+# "abrir" e "editar" respondem {"id", "tipo": "diagnosticos", "arquivo", "diagnosticos":
+# [{"linha", "mensagem"}], "reanalisados", "ms"}; erros de pedido, {"id", "tipo": "erro", "erro"}.
+class ServidorLint:
+    def __init__(self):
+        self.documentos = {}
+        self.encerrado = False
+
+    def atender_pedido(self, pedido):
+        """Processa um pedido já decodificado e retorna a resposta."""
+        id_pedido = pedido.get("id")
+        comando = pedido.get("comando")
+        arquivo = pedido.get("arquivo")
+        inicio = time.perf_counter()
+        if comando == "abrir":
+            texto = pedido.get("texto")
+            if texto is None:
+                with open(arquivo, "r", encoding="utf-8") as f:
+                    texto = f.read()
+            documento = self.documentos.get(arquivo)
+            if documento is None:
+                documento = self.documentos[arquivo] = LinterIncremental(arquivo, texto)
+            else:
+                documento.atualizar(texto)
+        elif comando == "editar":
+            documento = self.documentos.get(arquivo)
+            if documento is None:
+                raise ValueError(f"Arquivo '{arquivo}' não foi aberto.")
+            documento.editar(int(pedido["linha"]), int(pedido.get("remover", 0)), pedido.get("texto", ""))
+        elif comando == "fechar":
+            self.documentos.pop(arquivo, None)
+            return {"id": id_pedido, "tipo": "fim", "ok": True}
+        elif comando == "encerrar":
+            self.encerrado = True
+            return {"id": id_pedido, "tipo": "fim", "ok": True}
+        else:
+            raise ValueError(f"Comando desconhecido: {comando}")
+        return {"id": id_pedido, "tipo": "diagnosticos", "arquivo": arquivo,
+                "diagnosticos": documento.diagnosticos, "reanalisados": documento.reanalisados,
+                "ms": round((time.perf_counter() - inicio) * 1000, 3)}
+
+    def atender(self, entrada, saida):
+        """Lê pedidos (um JSON por linha) de 'entrada' e responde em 'saida' até o fim ou 'encerrar'."""
+        for linha in entrada:
+            if not linha.strip():
+                continue
+            pedido = None
+            try:
+                pedido = json.loads(linha)
+                if not isinstance(pedido, dict):
+                    raise ValueError("O pedido deve ser um objeto JSON.")
+                resposta = self.atender_pedido(pedido)
+            except Exception as e:
+                id_pedido = pedido.get("id") if isinstance(pedido, dict) else None
+                resposta = {"id": id_pedido, "tipo": "erro", "erro": f"{type(e).__name__}: {e}"}
+            saida.write(json.dumps(resposta, ensure_ascii=False) + "\n")
+            saida.flush()
+            if self.encerrado:
+                break
+
+
+def main_servidor_lint():
+    """Ponto de entrada de "python linter.py --servidor"."""
+    # Os erros do lexer/parser já voltam como diagnósticos; não precisam ir para o stderr
+    logging.getLogger("zin").addHandler(logging.NullHandler())
+    ServidorLint().atender(sys.stdin, sys.stdout)
+    return 0
@@ -0,0 +1,112 @@
+import os
+import sys
+import glob
+import time
+import logging
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from lexer_gerador import Lexer
+from cache_ast import CacheAST
+from saida import Saida, DESCARGA_BUFFER
+from interpretador import Interpretador
+
+logger = logging.getLogger("zin.lote")
+
+# Resultado da execução de um arquivo do lote (erro é None quando deu tudo certo)
+ResultadoLote = namedtuple("ResultadoLote", ["arquivo", "segundos", "erro"])
+
+
+def expandir_entradas(entradas):
+    """Transforma arquivos, diretórios (busca *.zin recursiva) e padrões glob em uma lista de arquivos."""
+    arquivos = []
+    vistos = set()
+    for entrada in entradas:
+        if os.path.isdir(entrada):
+            encontrados = sorted(glob.glob(os.path.join(entrada, "**", "*.zin"), recursive=True))
+        elif glob.has_magic(entrada):
+            encontrados = sorted(glob.glob(entrada, recursive=True))
+        else:
+            encontrados = [entrada]
+        for arquivo in encontrados:
+            if arquivo not in vistos:
+                vistos.add(arquivo)
+                arquivos.append(arquivo)
+    return arquivos
+
+
+def executar_arquivo(arquivo, cache=True, saida=None):
+    """Executa um arquivo com estado novo e mede o tempo; erros viram parte do resultado."""
+    inicio = time.perf_counter()
+    erro = None
+    try:
+        interpretador = Interpretador(arquivo, cache=cache, saida=saida)
+        interpretador.processar_arquivo()
+        interpretador.executar()
+    except Exception as e:
+        logger.info("Erro ao executar '%s': %s", arquivo, e)
+        erro = f"{type(e).__name__}: {e}"
+    return ResultadoLote(arquivo, time.perf_counter() - inicio, erro)
+
+
+# Estado de cada processo do pool: o cache é criado uma vez e reaproveitado entre arquivos
+_cache_processo = None
+
+
+def _aquecer():
+    global _cache_processo
+    _cache_processo = CacheAST()
+    # Constrói o lexer base do processo antes do primeiro arquivo
+    Lexer().build()
+
+
+def _executar_capturando(arquivo):
+    partes = []
+    resultado = executar_arquivo(arquivo, cache=_cache_processo, saida=Saida(partes.append, descarga=DESCARGA_BUFFER))
+    return resultado, "".join(partes)
+
+
+def executar_lote(arquivos, processos=1, cache=True, saida=None):
+    """Executa vários arquivos em um único processo (ou em um pool de processos aquecidos).
+
+    Cada arquivo roda com variáveis novas; lexer, cache de AST e libs importadas são
+    compartilhados. A saída dos programas sai na ordem da lista de arquivos.
+    """
+    saida = saida if isinstance(saida, Saida) else Saida(saida)
+    resultados = []
+    if processos <= 1 or len(arquivos) <= 1:
+        cache = CacheAST() if cache is True else (cache or None)
+        for arquivo in arquivos:
+            resultados.append(executar_arquivo(arquivo, cache=cache, saida=saida))
+        return resultados
+    with ProcessPoolExecutor(max_workers=processos, initializer=_aquecer) as pool:
+        for resultado, texto in pool.map(_executar_capturando, arquivos):
+            saida.escrever_bruto(texto)
+            resultados.append(resultado)
+    saida.descarregar()
+    return resultados
+
+
+def formatar_resumo(resultados):
+    """Tabela com o tempo e a situação de cada arquivo, seguida do total."""
+    largura = max([len("arquivo")] + [len(r.arquivo) for r in resultados])
+    linhas = [f"{'arquivo':<{largura}}  {'tempo (ms)':>10}  situação"]
+    for r in resultados:
+        situacao = "ok" if r.erro is None else f"erro: {r.erro}"
+        linhas.append(f"{r.arquivo:<{largura}}  {r.segundos * 1000:>10.1f}  {situacao}")
+    com_erro = sum(1 for r in resultados if r.erro is not None)
+    total = sum(r.segundos for r in resultados)
+    linhas.append(f"{len(resultados)} arquivo(s), {len(resultados) - com_erro} ok, "
+                  f"{com_erro} com erro, total {total * 1000:.1f} ms")
+    return "\n".join(linhas)
+
+
+def main_lote(entradas, processos=1):
+    """Ponto de entrada do modo --lote da linha de comando; retorna o código de saída."""
+    arquivos = expandir_entradas(entradas)
+    if not arquivos:
+        print("Nenhum arquivo .zin encontrado.", file=sys.stderr)
+        return 1
+    resultados = executar_lote(arquivos, processos=processos)
+    print(formatar_resumo(resultados), file=sys.stderr)
+    return 1 if any(r.erro is not None for r in resultados) else 0
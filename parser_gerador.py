@@ -1,17 +1,24 @@
 import json
+from collections import deque
 from lexer_gerador import Lexer
+from ast_nos import (PRECEDENCIA, Texto, ChamadaModulo, AcessoModulo, ChamadaFuncao, AcessoLista,
+                     binaria, Comando, Atribuir, Escreva, Pergunte, Se, Enquanto, Para, Repita,
+                     ExecutarModulo, Executar, Importe, ComandoChamada, ArquivoInicio, ArquivoEscreva,
+                     ArquivoLeia, Funcao, Declaracao, ast_para_json)
 import logging
 
-# Configurando o logging para exibir mensagens de debug e níveis superiores
-logging.basicConfig(level=logging.DEBUG, format='%(levelname)s: %(message)s')
+# Logger do módulo; a configuração (nível e handlers) fica a cargo de quem usa o Zin
+logger = logging.getLogger("zin.parser")
 
 # Classe Parser responsável por transformar a lista de tokens na AST (árvore de sintaxe abstrata)
 class Parser:
     def __init__(self, tokens):
-        # Inicializamos com a lista de tokens recebida e configuramos atributos básicos
-        self.tokens = tokens
+        # Os tokens podem vir em uma lista ou em um fluxo (ex.: Lexer.gerar_tokens);
+        # são consumidos um a um, com um pequeno buffer de lookahead
+        self.tokens = iter(tokens)
+        self._lookahead = deque()
         self.current_token = None  # Token atualmente sendo processado
-        self.index = -1            # Índice atual na lista de tokens
+        self.index = -1            # Posição do token atual no fluxo
         # Estrutura básica da AST a ser construída, contendo o programa, variáveis, implementação e execução
         self.ast = {
             "programa": {
@@ -25,31 +32,31 @@ class Parser:
         }
 
     def advance(self):
-        # Avança para o próximo token da lista
+        # Avança para o próximo token (do lookahead, se já tiver sido lido)
         self.index += 1
-        if self.index < len(self.tokens):
-            self.current_token = self.tokens[self.index]
+        if self._lookahead:
+            self.current_token = self._lookahead.popleft()
         else:
-            self.current_token = None
+            self.current_token = next(self.tokens, None)
 
     def expect(self, token_type, value=None):
         # Verifica se o token atual tem o tipo (e valor, se especificado) esperado
         if self.current_token is None:
-            logging.error("Token inesperado: fim do arquivo")
+            logger.error("Token inesperado: fim do arquivo")
             raise SyntaxError("Token inesperado: fim do arquivo")
         if self.current_token.type != token_type or (value and self.current_token.value != value):
-            logging.error("Token inesperado: {}".format(self.current_token))
+            logger.error("Token inesperado: %s", self.current_token)
             raise SyntaxError(f"Token inesperado: {self.current_token}")
         self.advance()
 
     def parse(self):
         # Método principal que inicia o parsing e retorna a AST construída
-        logging.info("Iniciando o parsing...")
+        logger.info("Iniciando o parsing...")
         self.advance()  # Avança para o primeiro token
         self.parse_inicio()            # Processa o bloco de início do programa
         self.parse_implementacao()     # Processa a implementação (corpo do programa, funções, módulos, etc.)
         self.parse_execucao()          # Processa o bloco de execução (ordem dos módulos a serem executados)
-        logging.info("Parsing concluído.")
+        logger.info("Parsing concluído.")
         return self.ast
 
     # ---------------------------------------------------------
@@ -57,7 +64,7 @@ class Parser:
     # ---------------------------------------------------------
     def parse_inicio(self):
         # Processa o cabeçalho do programa
-        logging.info("Parse do bloco INICIO iniciado.")
+        logger.debug("Parse do bloco INICIO iniciado.")
         self.expect("KEYWORD", "INICIO")
         self.expect("KEYWORD", "PROGAMA")
         # O nome do programa é o próximo token (um identificador)
@@ -89,7 +96,7 @@ class Parser:
                 valores = self.parse_lista()
             else:
                 valores = []
-            self.ast["programa"]["variaveis"].append({"nome": nome, "tipo": tipo, "valores": valores})
+            self.ast["programa"]["variaveis"].append(Declaracao(nome, tipo, valores))
         # Se for um grupo, tenta ler os campos e os registros
         elif tipo == "grupo":
             if self.current_token and self.current_token.value == "=":
@@ -97,16 +104,23 @@ class Parser:
                 valores = self.parse_grupo()
             else:
                 valores = {"campos": [], "dados": []}
-            self.ast["programa"]["variaveis"].append({"nome": nome, "tipo": tipo, "valores": valores})
+            self.ast["programa"]["variaveis"].append(Declaracao(nome, tipo, valores))
         else:
             # Outros tipos são declarados sem valor inicial
-            self.ast["programa"]["variaveis"].append({"nome": nome, "tipo": tipo})
+            self.ast["programa"]["variaveis"].append(Declaracao(nome, tipo))
 
     # ---------------------------------------------------------
     #  BLOCO: IMPLEMENTACAO
     # ---------------------------------------------------------
     def parse_implementacao(self):
-        logging.info("Parse do bloco IMPLEMENTACAO iniciado.")
+        self.parse_principal()
+        # Processa os módulos definidos
+        while self.current_token and self.current_token.value == "MODULO":
+            self.parse_modulo()
+
+    def parse_principal(self):
+        # Cabeçalho IMPLEMENTACAO, bloco PRINCIPAL e comandos soltos até o primeiro módulo
+        logger.debug("Parse do bloco IMPLEMENTACAO iniciado.")
         self.expect("KEYWORD", "IMPLEMENTACAO")
         self.expect("KEYWORD", "PROGAMA")
         self.expect("IDENTIFIER", self.ast["programa"]["nome"])
@@ -129,12 +143,8 @@ class Parser:
             execucoes_apos_principal.append(self.parse_statement())
         self.ast["programa"]["implementacao"]["execucoes_apos_principal"] = execucoes_apos_principal
 
-        # Processa os módulos definidos
-        while self.current_token and self.current_token.value == "MODULO":
-            self.parse_modulo()
-
     def parse_modulo(self):
-        logging.info("Parse do módulo iniciado.")
+        logger.debug("Parse do módulo iniciado.")
         self.expect("KEYWORD", "MODULO")
         nome_modulo = self.current_token.value
         self.expect("IDENTIFIER")
@@ -144,7 +154,7 @@ class Parser:
             if self.current_token.value == "funcao":
                 funcoes.append(self.parse_funcao())
             else:
-                logging.error("Comando inesperado no módulo: {}".format(self.current_token))
+                logger.error("Comando inesperado no módulo: %s", self.current_token)
                 raise SyntaxError(f"Comando inesperado no módulo: {self.current_token}")
         self.expect("KEYWORD", "FIM")
         self.expect("KEYWORD", "MODULO")
@@ -152,7 +162,8 @@ class Parser:
         self.ast["programa"]["implementacao"].setdefault("modulos", {})[nome_modulo] = funcoes
 
     def parse_funcao(self):
-        logging.info("Parse de função iniciado.")
+        logger.debug("Parse de função iniciado.")
+        linha = self.current_token.lineno
         self.expect("KEYWORD", "funcao")
         nome_funcao = self.current_token.value
         self.expect("IDENTIFIER")
@@ -170,7 +181,7 @@ class Parser:
         self.expect("KEYWORD", "retorne")
         retorno = self.parse_expression()
         self.expect("SYMBOL", ".")
-        return {"nome": nome_funcao, "parametros": parametros, "corpo": corpo, "retorno": retorno}
+        return Funcao(nome_funcao, parametros, corpo, retorno, linha)
 
     def parse_lista(self):
         self.expect("SYMBOL", "[")
@@ -182,7 +193,7 @@ class Parser:
                 if self.current_token and self.current_token.value == ",":
                     self.expect("SYMBOL", ",")
             else:
-                logging.error("Valor inválido na lista: {}".format(self.current_token))
+                logger.error("Valor inválido na lista: %s", self.current_token)
                 raise SyntaxError(f"Valor inválido na lista: {self.current_token}")
         self.expect("SYMBOL", "]")
         return valores
@@ -199,7 +210,7 @@ class Parser:
                 if self.current_token and self.current_token.value == ",":
                     self.expect("SYMBOL", ",")
             else:
-                logging.error("Campo inválido no cabeçalho do grupo: {}".format(self.current_token))
+                logger.error("Campo inválido no cabeçalho do grupo: %s", self.current_token)
                 raise SyntaxError(f"Campo inválido no cabeçalho do grupo: {self.current_token}")
         self.expect("SYMBOL", "]")
         dados = []
@@ -216,7 +227,7 @@ class Parser:
                         if self.current_token and self.current_token.value == ",":
                             self.expect("SYMBOL", ",")
                     else:
-                        logging.error("Valor inválido no registro do grupo: {}".format(self.current_token))
+                        logger.error("Valor inválido no registro do grupo: %s", self.current_token)
                         raise SyntaxError(f"Valor inválido no registro do grupo: {self.current_token}")
                 self.expect("SYMBOL", "]")
                 dados.append(registro)
@@ -229,6 +240,14 @@ class Parser:
     #  PARSE DE STATEMENTS
     # ---------------------------------------------------------
     def parse_statement(self):
+        # Guarda a linha de origem do comando (usada pelo perfilador e nas mensagens)
+        linha = self.current_token.lineno if self.current_token else None
+        comando = self._parse_statement()
+        if isinstance(comando, Comando):
+            comando.linha = linha
+        return comando
+
+    def _parse_statement(self):
         # Primeiro, verifica se o token atual é um comando de arquivo
         if self.current_token and self.current_token.type in ("ARQUIVO_INICIO", "ARQUIVO_ESCREVA", "ARQUIVO_LEIA"):
             if self.current_token.type == "ARQUIVO_INICIO":
@@ -245,9 +264,17 @@ class Parser:
                 self.expect("ASSIGN")
                 valor = self.parse_expression()
                 self.expect("SYMBOL", ".")
-                return {"atribuir": {"variavel": nome_ident, "valor": valor}}
+                return Atribuir(nome_ident, valor)
+            elif self.current_token and self.current_token.type == "SYMBOL" and self.current_token.value == ".":
+                # Chamada de módulo como comando, com o resultado descartado: modulo.funcao(args).
+                self.expect("SYMBOL", ".")
+                nome_funcao = self.current_token.value
+                self.expect("IDENTIFIER")
+                args = self.parse_function_args()
+                self.expect("SYMBOL", ".")
+                return ComandoChamada(ChamadaModulo(nome_ident, nome_funcao, args))
             else:
-                logging.error("Era esperado '=' após '{}', mas veio: {}".format(nome_ident, self.current_token))
+                logger.error("Era esperado '=' após '%s', mas veio: %s", nome_ident, self.current_token)
                 raise SyntaxError(f"Era esperado '=' após '{nome_ident}', mas veio: {self.current_token}")
         elif self.current_token and self.current_token.value == "escreva":
             self.expect("KEYWORD", "escreva")
@@ -256,7 +283,7 @@ class Parser:
             self.expect("STRING")
             self.expect("SYMBOL", ")")
             self.expect("SYMBOL", ".")
-            return {"escreva": texto.strip('"')}
+            return Escreva(texto.strip('"'))
         elif self.current_token and self.current_token.value == "importe":
             return self.parse_importe()
         elif self.current_token and self.current_token.value == "pergunte":
@@ -270,7 +297,7 @@ class Parser:
             self.expect("SYMBOL", "}")
             self.expect("SYMBOL", ")")
             self.expect("SYMBOL", ".")
-            return {"pergunte": {"texto": texto.strip('"'), "variavel": variavel}}
+            return Pergunte(texto.strip('"'), variavel)
         elif self.current_token and self.current_token.value == "SE":
             return self.parse_se()
         elif self.current_token and self.current_token.value == "ENQUANTO":
@@ -286,13 +313,13 @@ class Parser:
                 nome_modulo = self.current_token.value
                 self.expect("IDENTIFIER")
                 self.expect("SYMBOL", ".")
-                return {"executar_modulo": nome_modulo}
+                return ExecutarModulo(nome_modulo)
             else:
                 nome_qualquer = self.current_token.value
                 self.expect("IDENTIFIER")
                 self.expect("SYMBOL", ".")
-                return {"executar": nome_qualquer}
-        logging.error("Comando desconhecido ou inválido: {}".format(self.current_token))
+                return Executar(nome_qualquer)
+        logger.error("Comando desconhecido ou inválido: %s", self.current_token)
         raise SyntaxError(f"Comando desconhecido ou inválido: {self.current_token}")
 
     def parse_expression(self):
@@ -300,14 +327,14 @@ class Parser:
         return left_node
 
     def parse_para(self):
-        logging.info("Parse do laço PARA iniciado.")
+        logger.debug("Parse do laço PARA iniciado.")
         self.expect("KEYWORD", "PARA")
         var_name = None
         if self.current_token.type == "IDENTIFIER":
             var_name = self.current_token.value
             self.advance()
         else:
-            logging.error("Era esperado um identificador após 'PARA', mas veio: {}".format(self.current_token))
+            logger.error("Era esperado um identificador após 'PARA', mas veio: %s", self.current_token)
             raise SyntaxError(f"Era esperado um identificador após 'PARA', mas veio: {self.current_token}")
         self.expect("ASSIGN")
         start_expr = self.parse_expression()
@@ -325,25 +352,31 @@ class Parser:
         self.expect("KEYWORD", "FIM")
         self.expect("KEYWORD", "PARA")
         self.expect("SYMBOL", ".")
-        return {"tipo": "PARA", "var": var_name, "start": start_expr, "end": end_expr, "step": step_expr, "bloco": bloco_para}
+        return Para(var_name, start_expr, end_expr, step_expr, bloco_para)
 
     def _peek_next_value(self):
-        next_index = self.index + 1
-        if next_index < len(self.tokens):
-            return self.tokens[next_index].value
-        return None
-
-    def parse_binop(self):
+        if not self._lookahead:
+            token = next(self.tokens, None)
+            if token is None:
+                return None
+            self._lookahead.append(token)
+        return self._lookahead[0].value
+
+    def parse_binop(self, precedencia_minima=1):
+        # Precedence climbing: "*" e "/" ligam mais forte que "+" e "-", que ligam mais
+        # forte que as comparações; operadores do mesmo nível associam à esquerda.
+        # Subexpressões só com números já saem calculadas (ver ast_nos.binaria).
         node = self.parse_primary()
-        while self.current_token and self.current_token.type == "OPERATOR":
+        while (self.current_token and self.current_token.type == "OPERATOR"
+               and PRECEDENCIA.get(self.current_token.value, 0) >= precedencia_minima):
             op = self.current_token.value
             self.expect("OPERATOR")
-            right = self.parse_primary()
-            node = {"left": node, "operator": op, "right": right}
+            right = self.parse_binop(PRECEDENCIA[op] + 1)
+            node = binaria(op, node, right)
         return node
 
     def parse_repita(self):
-        logging.info("Parse do laço REPITA iniciado.")
+        logger.debug("Parse do laço REPITA iniciado.")
         self.expect("KEYWORD", "REPITA")
         self.expect("SYMBOL", ".")
         bloco_repita = []
@@ -356,17 +389,21 @@ class Parser:
             self.expect("SYMBOL", ")")
         else:
             cond_expr = self.parse_expression()
-        return {"tipo": "REPITA", "bloco": bloco_repita, "condicao": cond_expr}
+        return Repita(bloco_repita, cond_expr)
 
     def parse_primary(self):
         if not self.current_token:
-            logging.error("Fim inesperado na expressão.")
+            logger.error("Fim inesperado na expressão.")
             raise SyntaxError("Fim inesperado na expressão.")
         token = self.current_token
         if token.type == "NUMBER":
             value = token.value
             self.expect("NUMBER")
             return value
+        if token.type == "STRING":
+            # Literal de texto em expressões; identificadores continuam sendo strings simples
+            self.expect("STRING")
+            return Texto(token.value[1:-1])
         if token.type == "IDENTIFIER":
             ident1 = token.value
             self.expect("IDENTIFIER")
@@ -376,17 +413,17 @@ class Parser:
                 self.expect("IDENTIFIER")
                 if self.current_token and self.current_token.type == "SYMBOL" and self.current_token.value == "(":
                     args = self.parse_function_args()
-                    return {"chamada_modulo": {"modulo": ident1, "funcao": ident2, "argumentos": args}}
+                    return ChamadaModulo(ident1, ident2, args)
                 else:
-                    return {"acesso_modulo": {"modulo": ident1, "nome": ident2}}
+                    return AcessoModulo(ident1, ident2)
             elif self.current_token and self.current_token.type == "SYMBOL" and self.current_token.value == "(":
                 args = self.parse_function_args(func_name=ident1)
-                return {"func_call": {"nome": ident1, "args": args}}
+                return ChamadaFuncao(ident1, args)
             elif self.current_token and self.current_token.type == "SYMBOL" and self.current_token.value == "[":
                 self.expect("SYMBOL", "[")
                 index_expr = self.parse_expression()
                 self.expect("SYMBOL", "]")
-                return {"acesso_lista": {"nome": ident1, "indice": index_expr}}
+                return AcessoLista(ident1, index_expr)
             else:
                 return ident1
         if token.type == "SYMBOL" and token.value == "(":
@@ -394,7 +431,7 @@ class Parser:
             expr = self.parse_expression()
             self.expect("SYMBOL", ")")
             return expr
-        logging.error("Expressão inválida em parse_primary: {}".format(token))
+        logger.error("Expressão inválida em parse_primary: %s", token)
         raise SyntaxError(f"Expressão inválida em parse_primary: {token}")
 
     def parse_function_args(self, func_name=None):
@@ -408,7 +445,7 @@ class Parser:
         return args
 
     def parse_se(self):
-        logging.info("Parse da estrutura condicional SE iniciado.")
+        logger.debug("Parse da estrutura condicional SE iniciado.")
         self.expect("KEYWORD", "SE")
         condicao = self.parse_expression()
         self.expect("KEYWORD", "ENTAO")
@@ -426,10 +463,10 @@ class Parser:
         self.expect("KEYWORD", "FIM")
         self.expect("KEYWORD", "SE")
         self.expect("SYMBOL", ".")
-        return {"tipo": "SE", "condicao": condicao, "bloco_se": bloco_se, "bloco_senao": bloco_senao}
+        return Se(condicao, bloco_se, bloco_senao)
 
     def parse_enquanto(self):
-        logging.info("Parse da estrutura ENQUANTO iniciado.")
+        logger.debug("Parse da estrutura ENQUANTO iniciado.")
         self.expect("KEYWORD", "ENQUANTO")
         condicao = self.parse_expression()
         self.expect("KEYWORD", "FACA")
@@ -440,10 +477,10 @@ class Parser:
         self.expect("KEYWORD", "FIM")
         self.expect("KEYWORD", "ENQUANTO")
         self.expect("SYMBOL", ".")
-        return {"tipo": "ENQUANTO", "condicao": condicao, "bloco": bloco_enquanto}
+        return Enquanto(condicao, bloco_enquanto)
 
     def parse_execucao(self):
-        logging.info("Parse do bloco EXECUCAO iniciado.")
+        logger.debug("Parse do bloco EXECUCAO iniciado.")
         self.expect("KEYWORD", "EXECUCAO")
         self.expect("KEYWORD", "PROGAMA")
         self.expect("IDENTIFIER", self.ast["programa"]["nome"])
@@ -459,15 +496,15 @@ class Parser:
                 self.expect("IDENTIFIER")
                 self.expect("SYMBOL", ".")
                 self.ast["programa"]["execucao"]["modulos"].append(modulo)
-        logging.debug("Bloco EXECUCAO processado.")
+        logger.debug("Bloco EXECUCAO processado.")
 
     def parse_importe(self):
-        logging.info("Parse de importe iniciado.")
+        logger.debug("Parse de importe iniciado.")
         self.expect("KEYWORD", "importe")
         nome_modulo = self.current_token.value
         self.expect("IDENTIFIER")
         self.expect("SYMBOL", ".")
-        return {"importe": nome_modulo}
+        return Importe(nome_modulo)
 
     # Métodos para os novos comandos de arquivo
     def parse_arquivo_inicio(self):
@@ -476,7 +513,7 @@ class Parser:
         Exemplo de sintaxe:
             ARQUIVO-INICIO("arquivo",.txt).
         """
-        logging.info("Parse de comando ARQUIVO-INICIO iniciado.")
+        logger.debug("Parse de comando ARQUIVO-INICIO iniciado.")
         self.expect("ARQUIVO_INICIO")
         self.expect("SYMBOL", "(")
         file_name = self.current_token.value
@@ -491,11 +528,11 @@ class Parser:
             ext = self.current_token.value
             self.expect("STRING")
         else:
-            logging.error("Formato inválido para extensão no comando ARQUIVO-INICIO.")
+            logger.error("Formato inválido para extensão no comando ARQUIVO-INICIO.")
             raise SyntaxError("Formato inválido para extensão no comando ARQUIVO-INICIO.")
         self.expect("SYMBOL", ")")
         self.expect("SYMBOL", ".")
-        return {"arquivo_inicio": {"nome": file_name, "extensao": ext}}
+        return ArquivoInicio(file_name, ext)
 
     def parse_arquivo_escreva(self):
         """
@@ -503,7 +540,7 @@ class Parser:
         Exemplo de sintaxe:
             ARQUIVO-ESCREVA("conteúdo a escrever", "arquivo.txt").
         """
-        logging.info("Parse de comando ARQUIVO-ESCREVA iniciado.")
+        logger.debug("Parse de comando ARQUIVO-ESCREVA iniciado.")
         self.expect("ARQUIVO_ESCREVA")
         self.expect("SYMBOL", "(")
         conteudo = self.current_token.value
@@ -521,7 +558,7 @@ class Parser:
                 self.expect("IDENTIFIER")
         self.expect("SYMBOL", ")")
         self.expect("SYMBOL", ".")
-        return {"arquivo_escreva": {"conteudo": conteudo, "nome": file_name}}
+        return ArquivoEscreva(conteudo, file_name)
 
     def parse_arquivo_leia(self):
         """
@@ -529,7 +566,7 @@ class Parser:
         Exemplo de sintaxe:
             ARQUIVO-LEIA("arquivo.txt").
         """
-        logging.info("Parse de comando ARQUIVO-LEIA iniciado.")
+        logger.debug("Parse de comando ARQUIVO-LEIA iniciado.")
         self.expect("ARQUIVO_LEIA")
         self.expect("SYMBOL", "(")
         if self.current_token.type == "STRING":
@@ -544,9 +581,10 @@ class Parser:
                 self.expect("IDENTIFIER")
         self.expect("SYMBOL", ")")
         self.expect("SYMBOL", ".")
-        return {"arquivo_leia": {"nome": file_name}}
+        return ArquivoLeia(file_name)
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.DEBUG, format='%(levelname)s: %(message)s')
     code = """
     INICIO PROGAMA TESTE_MODULOS.
     variavel nome tipo texto
@@ -602,4 +640,4 @@ if __name__ == "__main__":
     parser = Parser(tokens)
     ast = parser.parse()
     logging.info("AST gerada:")
-    logging.info(json.dumps(ast, indent=4, ensure_ascii=False))
+    logging.info(json.dumps(ast_para_json(ast), indent=4, ensure_ascii=False))
@@ -0,0 +1,94 @@
+import time
+
+# Nível de detalhe do perfilador
+NIVEL_LINHAS = "linhas"    # comandos por linha + funções, módulos e libs
+NIVEL_FUNCOES = "funcoes"  # só funções, módulos e libs (menor custo)
+
+
+# Classe Perfilador: coleta chamadas e tempos dos trechos instrumentados pelo compilador.
+# Cada trecho (linha, função, módulo, chamada de lib) entra e sai de uma pilha; o tempo
+# próprio é o total menos o tempo dos trechos filhos. Os caminhos completos da pilha
+# alimentam o formato "collapsed stack" usado pelos geradores de flamegraph.
+class Perfilador:
+    def __init__(self, nivel=NIVEL_LINHAS, relogio=time.perf_counter):
+        if nivel not in (NIVEL_LINHAS, NIVEL_FUNCOES):
+            raise ValueError(f"Nível de perfil inválido: {nivel}")
+        self.nivel = nivel
+        self.relogio = relogio
+        # chave -> [chamadas, tempo total, tempo próprio, vezes aberta agora]
+        # (a contagem de abertas evita somar duas vezes o tempo total em recursão)
+        self.estatisticas = {}
+        # caminho da pilha (tupla de chaves) -> tempo próprio
+        self.pilhas = {}
+        # Pilha atual: [caminho, tempo dos filhos, início]
+        self._pilha = []
+
+    @property
+    def linhas(self):
+        return self.nivel == NIVEL_LINHAS
+
+    def _item(self, chave):
+        item = self.estatisticas.get(chave)
+        if item is None:
+            item = self.estatisticas[chave] = [0, 0.0, 0.0, 0]
+        return item
+
+    def envolver(self, chave, funcao):
+        """Retorna uma versão de funcao(*args) que é medida com a chave."""
+        # Tudo o que depende só da chave é resolvido aqui, uma vez, e não a cada chamada
+        item = self._item(chave)
+        pilha, pilhas, relogio = self._pilha, self.pilhas, self.relogio
+        raiz = (chave,)
+
+        def medido(*args):
+            caminho = pilha[-1][0] + raiz if pilha else raiz
+            item[3] += 1
+            quadro = [caminho, 0.0, relogio()]
+            pilha.append(quadro)
+            try:
+                return funcao(*args)
+            finally:
+                total = relogio() - quadro[2]
+                pilha.pop()
+                proprio = total - quadro[1]
+                item[0] += 1
+                item[3] -= 1
+                if not item[3]:
+                    item[1] += total
+                item[2] += proprio
+                if pilha:
+                    pilha[-1][1] += total
+                pilhas[caminho] = pilhas.get(caminho, 0.0) + proprio
+        return medido
+
+    def medir(self, chave, funcao, *args):
+        """Chama funcao(*args) medindo o tempo com a chave."""
+        return self.envolver(chave, funcao)(*args)
+
+    # ---------------------------------------------------------
+    #  RELATÓRIOS
+    # ---------------------------------------------------------
+    def tabela(self, limite=None):
+        """Tabela ordenada pelo tempo próprio, do maior para o menor."""
+        itens = sorted(self.estatisticas.items(), key=lambda par: par[1][2], reverse=True)
+        if limite:
+            itens = itens[:limite]
+        tempo_total = sum(item[2] for item in self.estatisticas.values()) or 1.0
+        linhas = [f"{'chamadas':>10} {'total (ms)':>12} {'próprio (ms)':>13} {'%':>6}  trecho"]
+        for chave, (chamadas, total, proprio, _) in itens:
+            linhas.append(f"{chamadas:>10} {total * 1000:>12.3f} {proprio * 1000:>13.3f} "
+                          f"{proprio / tempo_total:>6.1%}  {chave}")
+        return "\n".join(linhas)
+
+    def pilhas_colapsadas(self):
+        """Linhas "a;b;c microssegundos", prontas para flamegraph.pl/speedscope."""
+        linhas = []
+        for caminho, proprio in sorted(self.pilhas.items()):
+            micros = int(round(proprio * 1_000_000))
+            if micros > 0:
+                linhas.append(";".join(chave.replace(";", ",") for chave in caminho) + f" {micros}")
+        return "\n".join(linhas) + ("\n" if linhas else "")
+
+    def salvar_pilhas(self, caminho):
+        with open(caminho, "w", encoding="utf-8") as arquivo:
+            arquivo.write(self.pilhas_colapsadas())
@@ -0,0 +1,59 @@
+import sys
+
+# Políticas de descarga do buffer
+DESCARGA_LINHA = "linha"    # descarrega a cada linha (terminal interativo)
+DESCARGA_BUFFER = "buffer"  # descarrega quando o buffer enche (pipes e arquivos)
+
+
+# Classe Saida: canal dedicado para a saída visível do programa Zin (escreva, ARQUIVO-LEIA...).
+# Mensagens de diagnóstico continuam no logging; aqui só passa o que o programa imprime.
+class Saida:
+    def __init__(self, destino=None, tamanho_buffer=64 * 1024, descarga=None):
+        # destino pode ser um objeto com write() (stdout, StringIO, arquivo) ou uma função que recebe o texto
+        self.destino = destino
+        self.tamanho_buffer = tamanho_buffer
+        # Sem política explícita: por linha em terminal, por buffer no resto
+        if descarga is None:
+            descarga = DESCARGA_LINHA if self._destino_interativo() else DESCARGA_BUFFER
+        if descarga not in (DESCARGA_LINHA, DESCARGA_BUFFER):
+            raise ValueError(f"Política de descarga inválida: {descarga}")
+        self.descarga = descarga
+        self._partes = []
+        self._tamanho = 0
+
+    def _destino_interativo(self):
+        destino = self.destino if self.destino is not None else sys.stdout
+        isatty = getattr(destino, "isatty", None)
+        try:
+            return bool(isatty and isatty())
+        except ValueError:
+            return False
+
+    def escrever(self, texto):
+        """Escreve uma linha (o texto seguido de quebra de linha)."""
+        self.escrever_bruto(f"{texto}\n")
+
+    def escrever_bruto(self, texto):
+        """Escreve o texto como está, sem acrescentar quebra de linha."""
+        self._partes.append(texto)
+        self._tamanho += len(texto)
+        if self.descarga == DESCARGA_LINHA or self._tamanho >= self.tamanho_buffer:
+            self.descarregar()
+
+    def descarregar(self):
+        """Envia o conteúdo acumulado para o destino."""
+        if not self._partes:
+            return
+        dados = "".join(self._partes)
+        self._partes = []
+        self._tamanho = 0
+        # stdout é resolvido na hora, para respeitar redirecionamentos feitos depois da criação
+        destino = self.destino if self.destino is not None else sys.stdout
+        escrever = getattr(destino, "write", None)
+        if escrever is None:
+            destino(dados)
+            return
+        escrever(dados)
+        flush = getattr(destino, "flush", None)
+        if flush is not None:
+            flush()
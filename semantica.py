@@ -0,0 +1,512 @@
+import logging
+
+from ast_nos import (Texto, Binaria, ChamadaModulo, AcessoModulo, ChamadaFuncao, AcessoLista, AcessoGrupo,
+                     COMPARACOES, OPERADORES, Atribuir, Escreva, Pergunte, Se, Enquanto, Para, Repita,
+                     ExecutarModulo, Executar, Importe, ComandoChamada, EscrevaAcesso, ArquivoInicio,
+                     ArquivoEscreva, ArquivoLeia, PADRAO_PLACEHOLDER, placeholder_para_no)
+
+logger = logging.getLogger("zin.semantica")
+
+# Tipo dos nomes trazidos por importe (libs Python)
+TIPO_MODULO = "modulo"
+# Libs cujas chamadas leem ou gravam arquivos
+LIBS_ARQUIVO = {"zin_file"}
+TIPOS_NUMERICOS = ("inteiro", "decimal")
+
+# Fonte de um valor que o programa não controla (resposta do pergunte, módulo importado)
+VALOR_EXTERNO = object()
+
+
+# Um nome visível em um escopo: tipo declarado (ou None), linha de origem e quantas
+# vezes é lido e escrito dentro do escopo.
+class Simbolo:
+    __slots__ = ("nome", "tipo", "linha", "declarado", "leituras", "escritas")
+
+    def __init__(self, nome, tipo=None, linha=None, declarado=False):
+        self.nome = nome
+        self.tipo = tipo
+        self.linha = linha
+        self.declarado = declarado
+        self.leituras = 0
+        self.escritas = 0
+
+    def __repr__(self):
+        return f"Simbolo({self.nome!r}, {self.tipo!r}, leituras={self.leituras}, escritas={self.escritas})"
+
+
+# Escopo: o do programa (declarações e importes), o do PRINCIPAL e um por função.
+# Em uma função (local=True) escrever um nome que não existe cria uma variável da função,
+# como acontece na execução, em que tudo o que a função escreve é desfeito no retorno.
+class Escopo:
+    __slots__ = ("nome", "pai", "simbolos", "local")
+
+    def __init__(self, nome, pai=None, local=False):
+        self.nome = nome
+        self.pai = pai
+        self.simbolos = {}
+        self.local = local
+
+    def declarar(self, nome, tipo=None, linha=None, declarado=False):
+        simbolo = self.simbolos.get(nome)
+        if simbolo is None:
+            simbolo = self.simbolos[nome] = Simbolo(nome, tipo, linha, declarado)
+        return simbolo
+
+    def resolver(self, nome):
+        """Procura o nome neste escopo e nos de fora; None se não existir."""
+        escopo = self
+        while escopo is not None:
+            simbolo = escopo.simbolos.get(nome)
+            if simbolo is not None:
+                return simbolo
+            escopo = escopo.pai
+        return None
+
+
+# Resumo de um módulo: que módulos executa e se usa pergunte ou arquivos. O que as funções
+# escrevem nas variáveis é desfeito no retorno; o estado que um módulo deixa é o dos arquivos.
+class ResumoModulo:
+    __slots__ = ("executa", "pergunte", "arquivos")
+
+    def __init__(self):
+        self.executa = set()
+        self.pergunte = False
+        self.arquivos = False
+
+
+# Classe TabelaSimbolos: resultado da análise semântica, consultado pelo linter,
+# pelo compilador (nomes escritos e chamadas a libs de cada laço/função) e pelo
+# interpretador (alcance dos módulos na execução paralela), sem percorrer a AST de novo.
+class TabelaSimbolos:
+    def __init__(self):
+        self.programa = Escopo("programa")
+        self.escopos = {"programa": self.programa}
+        self.modulos = {}
+        # nome -> o que é escrito nele (expressões ou VALOR_EXTERNO), base da inferência de tipos
+        self.fontes = {}
+        self._tipos = None
+        # Se algum comando do programa usa pergunte (lê da entrada padrão)
+        self.pergunte = False
+        # Erros encontrados: (linha ou None, mensagem)
+        self.erros = []
+        # id(nó) -> (nó, nomes escritos no corpo, se o corpo chama libs); o nó fica guardado
+        # para que o id não seja reutilizado enquanto a tabela existir
+        self._corpos = {}
+
+    def escopo(self, nome, pai=None, local=False):
+        escopo = self.escopos.get(nome)
+        if escopo is None:
+            escopo = self.escopos[nome] = Escopo(nome, pai or self.programa, local)
+        return escopo
+
+    def tipo(self, nome):
+        """Tipo declarado de uma variável do programa, ou None."""
+        simbolo = self.programa.simbolos.get(nome)
+        return simbolo.tipo if simbolo is not None else None
+
+    @property
+    def tipos(self):
+        """Tipos numéricos provados (nome -> "inteiro" ou "decimal"), calculados na primeira consulta."""
+        if self._tipos is None:
+            self._tipos = inferir_tipos(self)
+        return self._tipos
+
+    def declaradas(self):
+        """Nomes declarados ou importados no cabeçalho do programa."""
+        return [nome for nome, simbolo in self.programa.simbolos.items() if simbolo.declarado]
+
+    def _registrar_corpo(self, no, escritos, libs):
+        self._corpos[id(no)] = (no, frozenset(escritos), libs)
+
+    def _corpo(self, no):
+        item = self._corpos.get(id(no))
+        return item if item is not None and item[0] is no else None
+
+    def escritos(self, no):
+        """Nomes escritos no corpo de uma função ou laço (None se o nó não foi analisado)."""
+        item = self._corpo(no)
+        return item[1] if item is not None else None
+
+    def chama_libs(self, no):
+        """Indica se o corpo de uma função ou laço chama libs (None se o nó não foi analisado)."""
+        item = self._corpo(no)
+        return item[2] if item is not None else None
+
+    def alcance(self, nome_modulo, vistos=None):
+        """Módulos executados por um módulo, incluindo os chamados com EXECUTAR MODULO."""
+        vistos = set() if vistos is None else vistos
+        if nome_modulo in vistos or nome_modulo not in self.modulos:
+            return vistos
+        vistos.add(nome_modulo)
+        for outro in self.modulos[nome_modulo].executa:
+            self.alcance(outro, vistos)
+        return vistos
+
+
+# Classe AnalisadorSemantico: percorre a AST uma única vez montando a TabelaSimbolos.
+# Cada comando devolve os nomes que escreve e se chama libs, e os comandos compostos
+# guardam esse resumo do corpo na tabela. As chamadas a libs só são conferidas no fim
+# (concluir), porque um importe pode aparecer depois do uso no texto do programa.
+class AnalisadorSemantico:
+    def __init__(self, tabela=None):
+        self.tabela = tabela if tabela is not None else TabelaSimbolos()
+        self.importados = set()
+        self.chamadas_libs = []
+        self._nomes_modulos = set()
+        self._linha = None
+        self._modulo = None
+
+    def analisar(self, ast):
+        """Analisa o programa inteiro e retorna a tabela de símbolos."""
+        programa = ast["programa"]
+        implementacao = programa.get("implementacao", {})
+        modulos = implementacao.get("modulos", {})
+        self.preparar(programa.get("variaveis", []), programa.get("importes", []), modulos)
+        self.visitar_principal(implementacao)
+        for nome, funcoes in modulos.items():
+            self.visitar_modulo(nome, funcoes)
+        if "execucao" in programa:
+            self.visitar_execucao(programa["execucao"]["modulos"])
+        self.concluir()
+        logger.debug("Análise semântica: %d escopos, %d erros", len(self.tabela.escopos), len(self.tabela.erros))
+        return self.tabela
+
+    def _erro(self, mensagem, linha=None):
+        self.tabela.erros.append((self._linha if linha is None else linha, mensagem))
+
+    # ---------------------------------------------------------
+    #  PARTES DO PROGRAMA
+    # ---------------------------------------------------------
+    def preparar(self, variaveis, importes, nomes_modulos):
+        """Registra as declarações, os importes do cabeçalho e os nomes dos módulos."""
+        programa = self.tabela.programa
+        for var in variaveis:
+            if var.nome in programa.simbolos:
+                self._erro(f"Variável '{var.nome}' declarada mais de uma vez.")
+                continue
+            programa.declarar(var.nome, var.tipo, declarado=True)
+        for imp in importes:
+            programa.declarar(imp.nome, TIPO_MODULO, imp.linha, declarado=True)
+            self.importados.add(imp.nome)
+        self._nomes_modulos.update(nomes_modulos)
+
+    def visitar_principal(self, implementacao):
+        escopo = self.tabela.escopo("PRINCIPAL")
+        self._visitar_bloco(implementacao.get("principal", []), escopo)
+        self._visitar_bloco(implementacao.get("execucoes_apos_principal", []), escopo)
+
+    def visitar_modulo(self, nome, funcoes):
+        resumo = self.tabela.modulos[nome] = ResumoModulo()
+        self._modulo = resumo
+        try:
+            for funcao in funcoes:
+                escopo = self.tabela.escopo(f"{nome}.{funcao.nome}", local=True)
+                self._linha = funcao.linha
+                for parametro in funcao.parametros:
+                    escopo.declarar(parametro, linha=funcao.linha)
+                escritos, libs = self._visitar_bloco(funcao.corpo, escopo)
+                libs = self._visitar_expressao(funcao.retorno, escopo)[1] or libs
+                self.tabela._registrar_corpo(funcao, escritos, libs)
+        finally:
+            self._modulo = None
+
+    def visitar_execucao(self, modulos):
+        self._linha = None
+        for nome in modulos:
+            if nome.lower() != "principal" and nome not in self._nomes_modulos:
+                self._erro(f"Módulo '{nome}' não definido.")
+
+    def concluir(self):
+        """Confere as chamadas a libs contra todos os importes vistos."""
+        for modulo, linha in self.chamadas_libs:
+            if modulo not in self.importados:
+                self._erro(f"Módulo '{modulo}' usado sem importe.", linha)
+
+    # ---------------------------------------------------------
+    #  COMANDOS
+    # ---------------------------------------------------------
+    def _visitar_bloco(self, comandos, escopo):
+        """Visita os comandos; retorna (nomes escritos, se chama libs)."""
+        escritos, libs = set(), False
+        for comando in comandos or ():
+            visitar = _VISITANTES_COMANDO.get(type(comando))
+            if visitar is None:
+                continue
+            self._linha = comando.linha
+            comando_escritos, comando_libs = visitar(self, comando, escopo)
+            escritos |= comando_escritos
+            libs = libs or comando_libs
+        return escritos, libs
+
+    def _escrever(self, nome, escopo, fonte, tipo_valor=None):
+        self.tabela.fontes.setdefault(nome, []).append(fonte)
+        simbolo = escopo.resolver(nome)
+        if simbolo is None:
+            if not escopo.local:
+                self._erro(f"Variável '{nome}' usada antes de ser declarada.")
+            simbolo = escopo.declarar(nome, linha=self._linha)
+        simbolo.escritas += 1
+        if tipo_valor is not None and simbolo.tipo is not None and not compativel(simbolo.tipo, tipo_valor):
+            self._erro(f"Tipo incompatível para '{nome}'. Esperado: {simbolo.tipo}, encontrado: {tipo_valor}.")
+        return {nome}
+
+    def _comando_atribuir(self, comando, escopo):
+        tipo, libs = self._visitar_expressao(comando.valor, escopo)
+        return self._escrever(comando.variavel, escopo, comando.valor, tipo), libs
+
+    def _comando_escreva(self, comando, escopo):
+        self._visitar_template(comando.texto, escopo)
+        return set(), False
+
+    def _comando_pergunte(self, comando, escopo):
+        self._visitar_template(comando.texto, escopo)
+        self.tabela.pergunte = True
+        if self._modulo is not None:
+            self._modulo.pergunte = True
+        return self._escrever(comando.variavel, escopo, VALOR_EXTERNO), False
+
+    def _comando_se(self, comando, escopo):
+        libs = self._visitar_expressao(comando.condicao, escopo)[1]
+        escritos, libs_se = self._visitar_bloco(comando.bloco_se, escopo)
+        escritos_senao, libs_senao = self._visitar_bloco(comando.bloco_senao, escopo)
+        return escritos | escritos_senao, libs or libs_se or libs_senao
+
+    def _comando_enquanto(self, comando, escopo):
+        libs = self._visitar_expressao(comando.condicao, escopo)[1]
+        escritos, libs_corpo = self._visitar_bloco(comando.bloco, escopo)
+        self.tabela._registrar_corpo(comando, escritos, libs_corpo)
+        return escritos, libs or libs_corpo
+
+    def _comando_repita(self, comando, escopo):
+        escritos, libs_corpo = self._visitar_bloco(comando.bloco, escopo)
+        self._linha = comando.linha
+        libs = self._visitar_expressao(comando.condicao, escopo)[1]
+        self.tabela._registrar_corpo(comando, escritos, libs_corpo)
+        return escritos, libs or libs_corpo
+
+    def _comando_para(self, comando, escopo):
+        libs = False
+        for expr in (comando.inicio, comando.fim, comando.passo):
+            if expr is not None:
+                libs = self._visitar_expressao(expr, escopo)[1] or libs
+        # A variável do laço não precisa de declaração: o PARA a cria como inteiro
+        simbolo = escopo.resolver(comando.variavel) or escopo.declarar(comando.variavel, "inteiro", comando.linha)
+        simbolo.escritas += 1
+        # A variável recebe o início e depois é somada ao passo
+        fontes = self.tabela.fontes.setdefault(comando.variavel, [])
+        fontes.append(comando.inicio)
+        if comando.passo is not None:
+            fontes.append(comando.passo)
+        escritos, libs_corpo = self._visitar_bloco(comando.bloco, escopo)
+        self.tabela._registrar_corpo(comando, escritos, libs_corpo)
+        return escritos | {comando.variavel}, libs or libs_corpo
+
+    def _comando_executar_modulo(self, comando, escopo):
+        if comando.nome not in self._nomes_modulos:
+            self._erro(f"Módulo '{comando.nome}' não definido.")
+        if self._modulo is not None:
+            self._modulo.executa.add(comando.nome)
+        # O módulo executado pode chamar libs que alteram listas e grupos
+        return set(), True
+
+    def _comando_importe(self, comando, escopo):
+        self.tabela.programa.declarar(comando.nome, TIPO_MODULO, comando.linha).escritas += 1
+        self.tabela.fontes.setdefault(comando.nome, []).append(VALOR_EXTERNO)
+        self.importados.add(comando.nome)
+        return {comando.nome}, False
+
+    def _comando_expressao(self, comando, escopo):
+        no = comando.chamada if isinstance(comando, ComandoChamada) else comando.acesso
+        return set(), self._visitar_expressao(no, escopo)[1]
+
+    def _comando_arquivo(self, comando, escopo):
+        if isinstance(comando, ArquivoEscreva):
+            self._visitar_template(comando.conteudo, escopo)
+        if self._modulo is not None:
+            self._modulo.arquivos = True
+        return set(), False
+
+    def _comando_sem_nomes(self, comando, escopo):
+        return set(), False
+
+    # ---------------------------------------------------------
+    #  EXPRESSÕES
+    # ---------------------------------------------------------
+    def _visitar_template(self, texto, escopo):
+        if not isinstance(texto, str):
+            return
+        for placeholder in PADRAO_PLACEHOLDER.findall(texto):
+            self._visitar_expressao(placeholder_para_no(placeholder), escopo)
+
+    def _visitar_expressao(self, expr, escopo):
+        """Registra as leituras da expressão; retorna (tipo ou None, se chama libs)."""
+        if isinstance(expr, str):
+            return self._ler(expr, escopo), False
+        if isinstance(expr, Binaria):
+            tipo_esq, libs_esq = self._visitar_expressao(expr.esquerda, escopo)
+            tipo_dir, libs_dir = self._visitar_expressao(expr.direita, escopo)
+            return tipo_binaria(expr.operador, tipo_esq, tipo_dir), libs_esq or libs_dir
+        tipo = _TIPOS_LITERAIS.get(type(expr))
+        if tipo is not None:
+            return tipo, False
+        if isinstance(expr, ChamadaModulo):
+            self.chamadas_libs.append((expr.modulo, self._linha))
+            if self._modulo is not None and expr.modulo in LIBS_ARQUIVO:
+                self._modulo.arquivos = True
+            self._ler(expr.modulo, escopo)
+            for argumento in expr.argumentos:
+                self._visitar_expressao(argumento, escopo)
+            return None, True
+        if isinstance(expr, (AcessoLista, AcessoGrupo)):
+            self._ler(expr.nome, escopo)
+            return None, self._visitar_expressao(expr.indice, escopo)[1]
+        if isinstance(expr, ChamadaFuncao):
+            libs = False
+            for argumento in expr.argumentos:
+                libs = self._visitar_expressao(argumento, escopo)[1] or libs
+            return None, libs
+        if isinstance(expr, AcessoModulo):
+            self._ler(expr.modulo, escopo)
+        return None, False
+
+    def _ler(self, nome, escopo):
+        # Identificadores que não existem valem o próprio nome (ex.: null): não são erro
+        simbolo = escopo.resolver(nome)
+        if simbolo is None:
+            return None
+        simbolo.leituras += 1
+        return simbolo.tipo if simbolo.tipo != TIPO_MODULO else None
+
+
+_TIPOS_LITERAIS = {bool: "booleano", int: "inteiro", float: "decimal", Texto: "texto"}
+
+_VISITANTES_COMANDO = {
+    Atribuir: AnalisadorSemantico._comando_atribuir,
+    Escreva: AnalisadorSemantico._comando_escreva,
+    Pergunte: AnalisadorSemantico._comando_pergunte,
+    Se: AnalisadorSemantico._comando_se,
+    Enquanto: AnalisadorSemantico._comando_enquanto,
+    Repita: AnalisadorSemantico._comando_repita,
+    Para: AnalisadorSemantico._comando_para,
+    ExecutarModulo: AnalisadorSemantico._comando_executar_modulo,
+    Importe: AnalisadorSemantico._comando_importe,
+    ComandoChamada: AnalisadorSemantico._comando_expressao,
+    EscrevaAcesso: AnalisadorSemantico._comando_expressao,
+    ArquivoEscreva: AnalisadorSemantico._comando_arquivo,
+    ArquivoInicio: AnalisadorSemantico._comando_arquivo,
+    ArquivoLeia: AnalisadorSemantico._comando_arquivo,
+    Executar: AnalisadorSemantico._comando_sem_nomes,
+}
+
+
+def tipo_binaria(operador, tipo_esq, tipo_dir):
+    """Tipo do resultado de uma operação binária, quando dá para saber pelos operandos."""
+    if operador in COMPARACOES:
+        return "booleano"
+    if operador in OPERADORES and tipo_esq in TIPOS_NUMERICOS and tipo_dir in TIPOS_NUMERICOS:
+        return "decimal" if "decimal" in (tipo_esq, tipo_dir) else "inteiro"
+    return None
+
+
+def tipo_numerico(expr, tipos=None, memoria=None):
+    """Tipo da expressão ("inteiro" ou "decimal") se ela nunca produz texto, senão None.
+
+    Comparações valem como inteiro (bool); nomes usam os tipos provados em 'tipos'.
+    'memoria' (id(nó) -> (nó, tipo)) evita refazer as subexpressões consultadas de novo.
+    """
+    if isinstance(expr, str):
+        return tipos.get(expr) if tipos else None
+    if isinstance(expr, int):
+        return "inteiro"
+    if isinstance(expr, float):
+        return "decimal"
+    if not isinstance(expr, Binaria):
+        return None
+    if expr.operador in COMPARACOES:
+        return "inteiro"
+    if memoria is not None:
+        item = memoria.get(id(expr))
+        if item is not None and item[0] is expr:
+            return item[1]
+    tipo = None
+    if expr.operador in OPERADORES:
+        tipo_esq = tipo_numerico(expr.esquerda, tipos, memoria)
+        tipo_dir = tipo_numerico(expr.direita, tipos, memoria) if tipo_esq is not None else None
+        if tipo_dir is not None:
+            tipo = "decimal" if "decimal" in (tipo_esq, tipo_dir) else "inteiro"
+    # Só vale guardar nós com subexpressões: os demais são resolvidos na hora
+    if memoria is not None and (isinstance(expr.esquerda, Binaria) or isinstance(expr.direita, Binaria)):
+        memoria[id(expr)] = (expr, tipo)
+    return tipo
+
+
+def _nomes_lidos(expr, nomes):
+    # Só o que tipo_numerico consulta: nomes soltos e operandos de operações binárias
+    if isinstance(expr, str):
+        nomes.add(expr)
+    elif isinstance(expr, Binaria):
+        _nomes_lidos(expr.esquerda, nomes)
+        _nomes_lidos(expr.direita, nomes)
+    return nomes
+
+
+def inferir_tipos(tabela):
+    """Prova quais nomes só recebem números (ou None) e se são inteiros ou decimais.
+
+    O compilador usa o resultado para dispensar a conversão de texto de dígitos ("12" -> 12)
+    nas operações. Parte do palpite otimista de que todo nome escrito é inteiro e vai
+    subindo (inteiro -> decimal -> não numérico) até nenhuma escrita contradizer os tipos.
+    Nomes declarados com tipo não numérico (texto, lista, grupo, módulos) ficam de fora.
+    """
+    tipos = {}
+    for nome, simbolo in tabela.programa.simbolos.items():
+        if simbolo.tipo in TIPOS_NUMERICOS:
+            tipos[nome] = simbolo.tipo
+    for nome in tabela.fontes:
+        tipo_declarado = tabela.tipo(nome)
+        if tipo_declarado is None:
+            tipos[nome] = "inteiro"
+        elif tipo_declarado not in TIPOS_NUMERICOS:
+            tipos.pop(nome, None)
+    dependentes = {}
+    for nome, fontes in tabela.fontes.items():
+        if nome not in tipos:
+            continue
+        lidos = set()
+        for fonte in fontes:
+            if fonte is not VALOR_EXTERNO:
+                _nomes_lidos(fonte, lidos)
+        for lido in lidos:
+            dependentes.setdefault(lido, set()).add(nome)
+    pendentes = set(tabela.fontes)
+    while pendentes:
+        nome = pendentes.pop()
+        atual = tipos.get(nome)
+        if atual is None:
+            continue
+        novo = atual
+        for fonte in tabela.fontes[nome]:
+            tipo = None if fonte is VALOR_EXTERNO else tipo_numerico(fonte, tipos)
+            if tipo is None:
+                novo = None
+                break
+            if tipo == "decimal":
+                novo = "decimal"
+        if novo != atual:
+            if novo is None:
+                del tipos[nome]
+            else:
+                tipos[nome] = novo
+            pendentes |= dependentes.get(nome, set())
+    logger.debug("Inferência de tipos: %d nomes numéricos de %d escritos", len(tipos), len(tabela.fontes))
+    return tipos
+
+
+def compativel(tipo_declarado, tipo_valor):
+    """Indica se um valor do tipo pode ir para uma variável declarada com o tipo (inteiro cabe em decimal)."""
+    return tipo_valor == tipo_declarado or (tipo_declarado == "decimal" and tipo_valor == "inteiro")
+
+
+def analisar(ast):
+    """Analisa a AST em uma passada e retorna a TabelaSimbolos (erros em tabela.erros)."""
+    return AnalisadorSemantico().analisar(ast)
@@ -0,0 +1,229 @@
+import os
+import sys
+import json
+import time
+import hashlib
+import logging
+import socket
+import threading
+import socketserver
+from collections import OrderedDict, deque
+
+from cache_ast import CacheAST
+from saida import Saida, DESCARGA_BUFFER
+from interpretador import Interpretador
+
+logger = logging.getLogger("zin.servidor")
+
+# Protocolo: uma mensagem JSON por linha, nos dois sentidos.
+#
+# Pedidos:
+#   {"id": 1, "comando": "executar", "arquivo": "prog.zin"}
+#   {"id": 2, "comando": "executar", "codigo": "INICIO PROGAMA ..."}
+#   {"id": 3, "comando": "estatisticas"}
+#   {"id": 4, "comando": "limpar"}        (descarta os programas em memória)
+#   {"id": 5, "comando": "encerrar"}
+#
+# Respostas de "executar": zero ou mais {"id", "tipo": "saida", "texto"} com a saída do
+# programa, conforme ela é produzida, e por fim {"id", "tipo": "fim", "ok": true, "ms"}
+# ou {"id", "tipo": "erro", "erro"}. Os demais comandos respondem com uma única mensagem.
+
+# Tamanho dos blocos de saída enviados durante a execução
+TAMANHO_BLOCO_SAIDA = 8 * 1024
+
+
+class Estatisticas:
+    """Contadores e latências recentes das execuções do servidor."""
+
+    def __init__(self, janela=10000):
+        self.inicio = time.time()
+        self.pedidos = 0
+        self.execucoes = 0
+        self.erros = 0
+        self.acertos_cache = 0
+        self.faltas_cache = 0
+        self.tempo_total = 0.0
+        self.latencias = deque(maxlen=janela)
+
+    def registrar_execucao(self, segundos, ok):
+        self.execucoes += 1
+        if not ok:
+            self.erros += 1
+        self.tempo_total += segundos
+        self.latencias.append(segundos)
+
+    def resumo(self, programas):
+        atividade = time.time() - self.inicio
+        ordenadas = sorted(self.latencias)
+
+        def percentil(p):
+            if not ordenadas:
+                return 0.0
+            return round(ordenadas[int(p * (len(ordenadas) - 1))] * 1000, 3)
+
+        media = sum(ordenadas) / len(ordenadas) if ordenadas else 0.0
+        return {
+            "atividade_s": round(atividade, 3),
+            "pedidos": self.pedidos,
+            "execucoes": self.execucoes,
+            "erros": self.erros,
+            "cache": {"programas": programas, "acertos": self.acertos_cache, "faltas": self.faltas_cache},
+            "latencia_ms": {
+                "media": round(media * 1000, 3),
+                "p50": percentil(0.50),
+                "p95": percentil(0.95),
+                "p99": percentil(0.99),
+                "max": round(ordenadas[-1] * 1000, 3) if ordenadas else 0.0,
+            },
+            # Execuções por segundo desde o início e o máximo possível com as latências medidas
+            "vazao_por_s": round(self.execucoes / atividade, 3) if atividade > 0 else 0.0,
+            "capacidade_por_s": round(self.execucoes / self.tempo_total, 3) if self.tempo_total > 0 else 0.0,
+        }
+
+
+# Classe ServidorZin: mantém os programas já compilados em memória e executa cada pedido
+# com as variáveis zeradas, reaproveitando a AST e as closures geradas na primeira vez.
+class ServidorZin:
+    def __init__(self, cache=True, max_programas=128):
+        self.cache = CacheAST() if cache is True else (cache or None)
+        self.max_programas = max_programas
+        self._programas = OrderedDict()
+        # Programas compilados compartilham estado; uma execução por vez
+        self._trava = threading.Lock()
+        self.estatisticas = Estatisticas()
+        self.encerrado = False
+
+    def preparar(self, codigo, nome):
+        """Retorna o interpretador do código (bytes), criando e guardando se for novo."""
+        chave = hashlib.sha256(codigo).hexdigest()
+        interpretador = self._programas.get(chave)
+        if interpretador is not None:
+            self._programas.move_to_end(chave)
+            self.estatisticas.acertos_cache += 1
+        else:
+            self.estatisticas.faltas_cache += 1
+            interpretador = Interpretador(nome, cache=self.cache,
+                                          saida=Saida(None, tamanho_buffer=TAMANHO_BLOCO_SAIDA, descarga=DESCARGA_BUFFER))
+            interpretador.carregar_codigo(codigo)
+            # Guardado mesmo se for recusado abaixo, para não repetir lexer e parser a cada pedido
+            self._programas[chave] = interpretador
+            if len(self._programas) > self.max_programas:
+                self._programas.popitem(last=False)
+        # A entrada padrão é o canal do protocolo; pergunte não tem de onde ler
+        if interpretador.tabela.pergunte:
+            raise ValueError("Programas com pergunte não podem ser executados pelo servidor.")
+        return interpretador
+
+    def _executar(self, pedido, enviar):
+        id_pedido = pedido.get("id")
+        inicio = time.perf_counter()
+        if "codigo" in pedido:
+            codigo, nome = pedido["codigo"].encode("utf-8"), pedido.get("nome", "<codigo>")
+        elif "arquivo" in pedido:
+            nome = pedido["arquivo"]
+            with open(nome, "rb") as arquivo:
+                codigo = arquivo.read()
+        else:
+            raise ValueError("O pedido 'executar' precisa de 'arquivo' ou 'codigo'.")
+        with self._trava:
+            interpretador = self.preparar(codigo, nome)
+            interpretador.saida.destino = lambda texto: enviar({"id": id_pedido, "tipo": "saida", "texto": texto})
+            try:
+                interpretador.reiniciar()
+                interpretador.executar()
+            finally:
+                interpretador.saida.destino = None
+        return time.perf_counter() - inicio
+
+    def atender_pedido(self, pedido, enviar):
+        """Processa um pedido já decodificado, enviando as respostas com enviar(dict)."""
+        self.estatisticas.pedidos += 1
+        id_pedido = pedido.get("id")
+        comando = pedido.get("comando", "executar")
+        if comando == "executar":
+            inicio = time.perf_counter()
+            try:
+                segundos = self._executar(pedido, enviar)
+            except Exception as e:
+                self.estatisticas.registrar_execucao(time.perf_counter() - inicio, False)
+                logger.info("Erro no pedido %s: %s", id_pedido, e)
+                enviar({"id": id_pedido, "tipo": "erro", "erro": f"{type(e).__name__}: {e}"})
+                return
+            self.estatisticas.registrar_execucao(segundos, True)
+            enviar({"id": id_pedido, "tipo": "fim", "ok": True, "ms": round(segundos * 1000, 3)})
+        elif comando == "estatisticas":
+            enviar({"id": id_pedido, "tipo": "estatisticas", **self.estatisticas.resumo(len(self._programas))})
+        elif comando == "limpar":
+            with self._trava:
+                self._programas.clear()
+            enviar({"id": id_pedido, "tipo": "fim", "ok": True})
+        elif comando == "encerrar":
+            self.encerrado = True
+            enviar({"id": id_pedido, "tipo": "fim", "ok": True})
+        else:
+            enviar({"id": id_pedido, "tipo": "erro", "erro": f"Comando desconhecido: {comando}"})
+
+    def atender(self, entrada, saida):
+        """Lê pedidos (um JSON por linha) de 'entrada' e responde em 'saida' até o fim ou 'encerrar'."""
+        def enviar(mensagem):
+            saida.write(json.dumps(mensagem, ensure_ascii=False) + "\n")
+            saida.flush()
+
+        for linha in entrada:
+            if not linha.strip():
+                continue
+            try:
+                pedido = json.loads(linha)
+            except ValueError as e:
+                enviar({"id": None, "tipo": "erro", "erro": f"JSON inválido: {e}"})
+                continue
+            if not isinstance(pedido, dict):
+                enviar({"id": None, "tipo": "erro", "erro": "O pedido deve ser um objeto JSON."})
+                continue
+            self.atender_pedido(pedido, enviar)
+            if self.encerrado:
+                break
+
+    def servir_socket(self, caminho):
+        """Atende conexões em um socket Unix local; cada conexão fala o mesmo protocolo."""
+        if not hasattr(socket, "AF_UNIX"):
+            raise OSError("Sockets Unix não são suportados neste sistema.")
+        if os.path.exists(caminho):
+            os.unlink(caminho)
+        servidor_zin = self
+
+        class Conexao(socketserver.StreamRequestHandler):
+            def handle(self):
+                entrada = (linha.decode("utf-8") for linha in self.rfile)
+                servidor_zin.atender(entrada, _EscritorSocket(self.wfile))
+                if servidor_zin.encerrado:
+                    threading.Thread(target=self.server.shutdown, daemon=True).start()
+
+        with socketserver.ThreadingUnixStreamServer(caminho, Conexao) as servidor:
+            logger.info("Servidor Zin ouvindo em %s", caminho)
+            try:
+                servidor.serve_forever()
+            finally:
+                os.unlink(caminho)
+
+
+class _EscritorSocket:
+    # Adapta o wfile (bytes) do socket para a interface de texto usada por atender()
+    def __init__(self, wfile):
+        self.wfile = wfile
+
+    def write(self, texto):
+        self.wfile.write(texto.encode("utf-8"))
+
+    def flush(self):
+        self.wfile.flush()
+
+
+def main_servidor(caminho_socket=None):
+    """Ponto de entrada do modo --servidor da linha de comando."""
+    servidor = ServidorZin()
+    if caminho_socket:
+        servidor.servir_socket(caminho_socket)
+    else:
+        servidor.atender(sys.stdin, sys.stdout)
+    return 0